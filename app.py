@@ -1,10 +1,16 @@
+import logging
+import os
 import sys
+from PySide6.QtCore import QThreadPool
 from PySide6.QtWidgets import QApplication
 
-from core.db import init_db
+from core.db import init_db, close_pool, CheckpointScheduler
 from services.auth_service import init_default_admin
 from services.hall_service import init_default_halls
 from ui.main_window import MainWindow
+from ui.tasks import EventLoopMonitor
+
+log = logging.getLogger("eventease")
 
 
 def main() -> None:
@@ -13,7 +19,22 @@ def main() -> None:
     init_default_admin()
     init_default_halls()
 
+    checkpoints = CheckpointScheduler()
+    checkpoints.start()
+
     app = QApplication(sys.argv)
+    # task-urile din fundal inca pot folosi conexiuni din pool
+    app.aboutToQuit.connect(lambda: QThreadPool.globalInstance().waitForDone(5000))
+    app.aboutToQuit.connect(checkpoints.stop)
+    app.aboutToQuit.connect(close_pool)
+
+    # EVENTEASE_UI_MONITOR=1: la iesire scrie in log cat a stat blocat event loop-ul;
+    # fara variabila monitorul (si timer-ul lui) nu exista deloc
+    if os.environ.get("EVENTEASE_UI_MONITOR"):
+        logging.basicConfig(level=logging.INFO)
+        monitor = EventLoopMonitor(parent=app)
+        monitor.start()
+        app.aboutToQuit.connect(lambda: log.info("event loop: %s", monitor.stats()))
 
     window = MainWindow()
     #window.show()
@@ -0,0 +1,40 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import db  # noqa: E402
+
+
+def use_temp_database(copy_existing: bool = True) -> Path:
+    # benchmark-urile nu ating niciodata eventease.db din repo
+    tmp_dir = Path(tempfile.mkdtemp(prefix="eventease_bench_"))
+    path = tmp_dir / "eventease.db"
+    if copy_existing and db.DB_PATH.exists():
+        shutil.copy(db.DB_PATH, path)
+    db.DB_PATH = path
+    db.init_db()
+    return path
+
+
+def qt_app():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def print_table(headers, rows) -> None:
+    widths = [len(h) for h in headers]
+    for r in rows:
+        for i, v in enumerate(r):
+            widths[i] = max(widths[i], len(str(v)))
+    line = "  ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
+    print(line)
+    print("-" * len(line))
+    for r in rows:
+        print("  ".join(str(v).ljust(widths[i]) for i, v in enumerate(r)))
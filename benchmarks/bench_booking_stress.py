@@ -0,0 +1,120 @@
+"""Stres concurent pe booking_service.create_booking din mai multe procese.
+
+Rulare: python -m benchmarks.bench_booking_stress [--workers 8] [--seconds 5]
+        [--seats-per-booking 1-4] [--rows 26 --cols 80] [--profile balanced]
+"""
+import argparse
+import json
+import multiprocessing as mp
+import random
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks._util import use_temp_database, print_table
+from core import db
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def _worker(args):
+    db_path, profile, event_id, seat_ids, seats_min, seats_max, deadline, seed = args
+    db.DB_PATH = Path(db_path)
+    db.set_durability_profile(profile)
+    from services import booking_service
+
+    rnd = random.Random(seed)
+    latencies = []
+    stats = Counter()
+    while time.time() < deadline:
+        seats = rnd.sample(seat_ids, rnd.randint(seats_min, seats_max))
+        t0 = time.perf_counter()
+        try:
+            booking_service.create_booking(event_id, "Stress", "stress@eventease.local", seats)
+            stats["ok"] += 1
+        except ValueError:
+            stats["conflict"] += 1
+        except sqlite3.OperationalError as ex:
+            stats["locked" if "locked" in str(ex) or "busy" in str(ex) else "error"] += 1
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+    db.close_pool()
+    return latencies, dict(stats)
+
+
+def _violations(event_id: int) -> int:
+    with db.connection() as conn:
+        rows = conn.execute(
+            "SELECT seats_json FROM bookings WHERE event_id = ?;", (event_id,)
+        ).fetchall()
+    seen = Counter()
+    for (seats_json,) in rows:
+        for s in json.loads(seats_json):
+            seen[str(s).strip().upper()] += 1
+    return sum(1 for c in seen.values() if c > 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seats-per-booking", default="1-4")
+    parser.add_argument("--rows", type=int, default=26)
+    parser.add_argument("--cols", type=int, default=80)
+    parser.add_argument("--profile", default=db.DURABILITY_PROFILE, choices=list(db.DURABILITY_PROFILES))
+    args = parser.parse_args()
+
+    lo, _, hi = args.seats_per_booking.partition("-")
+    seats_min, seats_max = int(lo), int(hi or lo)
+
+    path = use_temp_database()
+    db.set_durability_profile(args.profile)
+    from services import event_service, hall_service
+    hall_service.create_hall("Stress", args.rows, args.cols)
+    hall = next(h for h in hall_service.get_all_halls() if h["name"] == "Stress")
+    event_service.create_event("Stress", "", "2030-01-01", "20:00", hall["id"])
+    # baza copiata are si evenimentele de exemplu; se ia cel creat aici
+    event_id = next(e["id"] for e in event_service.list_events() if e["title"] == "Stress")
+    seat_ids = [it["id"] for it in hall_service.get_hall(hall["id"])["layout"] if it.get("type") == "seat"]
+    db.close_pool()
+
+    deadline = time.time() + args.seconds
+    jobs = [
+        (str(path), args.profile, event_id, seat_ids, seats_min, seats_max, deadline, i)
+        for i in range(args.workers)
+    ]
+    start = time.perf_counter()
+    with mp.get_context("spawn").Pool(args.workers) as pool:
+        results = pool.map(_worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    latencies = [v for lat, _ in results for v in lat]
+    totals = Counter()
+    for _, st in results:
+        totals.update(st)
+
+    print(f"db: {path}  eveniment: {event_id}  locuri: {len(seat_ids)}  procese: {args.workers}  profil: {args.profile}")
+    print_table(
+        ["rezervari", "rez/s", "p50 ms", "p95 ms", "p99 ms", "conflicte", "locked", "alte erori", "duble"],
+        [(
+            totals["ok"],
+            f"{totals['ok'] / elapsed:.1f}",
+            f"{_percentile(latencies, 50):.1f}",
+            f"{_percentile(latencies, 95):.1f}",
+            f"{_percentile(latencies, 99):.1f}",
+            totals["conflict"],
+            totals["locked"],
+            totals["error"],
+            _violations(event_id),
+        )],
+    )
+
+
+if __name__ == "__main__":
+    main()
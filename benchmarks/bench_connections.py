@@ -0,0 +1,48 @@
+"""Conexiuni SQLite deschise la un refresh complet al panoului admin.
+
+Ambele variante ruleaza in acelasi proces, pe aceeasi baza: size=0 inseamna o
+conexiune noua deschisa si inchisa la fiecare apel de serviciu, adica drumul de
+dinainte de pool; cu pool-ul incalzit de primul refresh nu se mai deschide niciuna.
+
+Rulare: python -m benchmarks.bench_connections
+"""
+from benchmarks._util import use_temp_database, qt_app, print_table
+from core import db
+
+
+def _paint_all(model) -> None:
+    from PySide6.QtCore import Qt
+    for r in range(model.rowCount()):
+        for c in range(model.columnCount()):
+            idx = model.index(r, c)
+            model.data(idx, Qt.DisplayRole)
+            model.data(idx, Qt.UserRole)
+
+
+def _measure(view) -> int:
+    before = db.connections_opened()
+    # refresh_events incarca lista in fundal; se asteapta rezultatul inainte de numarare
+    view.refresh_events()
+    view.runner.wait()
+    _paint_all(view._source_model)
+    return db.connections_opened() - before
+
+
+def main() -> None:
+    use_temp_database()
+    qt_app()
+    from ui.admin.view import AdminEventsView
+
+    rows = []
+    for label, size in (("fara pool (size=0, conexiune per apel)", 0), (f"pool (size={db.POOL_SIZE})", db.POOL_SIZE)):
+        db.configure_pool(size=size)
+        view = AdminEventsView()
+        _measure(view)
+        opened = _measure(view)
+        rows.append((label, view._source_model.rowCount(), opened))
+
+    print_table(["configuratie", "evenimente", "conexiuni / refresh"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Throughput mixt citire/scriere pentru fiecare profil de durabilitate.
+
+Rulare: python -m benchmarks.bench_durability [--seconds 3] [--readers 4]
+"""
+import argparse
+import sqlite3
+import threading
+import time
+
+from benchmarks._util import use_temp_database, print_table
+from core import db
+
+
+def _run_profile(profile: str, seconds: float, readers: int):
+    use_temp_database(copy_existing=False)
+    db.set_durability_profile(profile)
+    db.configure_pool(size=readers + 1)
+
+    from services import auth_service, booking_service, event_service, hall_service
+    auth_service.init_default_admin()
+    hall_service.create_hall("Benchmark", 26, 100)
+    hall = next(h for h in hall_service.get_all_halls() if h["name"] == "Benchmark")
+    event_service.create_event("Benchmark", "", "2030-01-01", "20:00", hall["id"])
+    event_id = event_service.list_events()[-1]["id"]
+    seat_ids = [it["id"] for it in hall_service.get_hall(hall["id"])["layout"] if it.get("type") == "seat"]
+
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def reader():
+        n = 0
+        while not stop.is_set():
+            event_service.list_events()
+            booking_service.list_bookings_for_event(event_id)
+            n += 1
+        with lock:
+            counts["reads"] += n
+
+    def writer():
+        n = locked = 0
+        for sid in seat_ids:
+            if stop.is_set():
+                break
+            try:
+                booking_service.create_booking(event_id, "Bench", "bench@eventease.local", [sid])
+                n += 1
+            except sqlite3.OperationalError:
+                locked += 1
+        with lock:
+            counts["writes"] += n
+            counts["locked"] += locked
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    db.close_pool()
+    return (
+        profile,
+        f"{counts['reads'] / elapsed:.0f}",
+        f"{counts['writes'] / elapsed:.0f}",
+        counts["locked"],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    rows = [_run_profile(p, args.seconds, args.readers) for p in db.DURABILITY_PROFILES]
+    print_table(["profil", "citiri/s", "rezervari/s", "database is locked"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Timpul geometriei din layout_generator pe sabloane mari.
+
+Sablonul e facut din blocuri de 26 x 100 de locuri (generate_seat_block), apoi
+centrat (center_layout) si rotit ca grup (apply_rotation_to_group). La final se
+genereaza arenele/stadioanele din STADIUMS cu create_stadium_template.
+
+Rulare: python -m benchmarks.bench_layout_geometry [--sizes 10000,100000]
+"""
+import argparse
+import time
+
+from benchmarks._util import print_table
+from ui import layout_generator
+
+BLOCK_ROWS = 26
+BLOCK_COLS = 100
+
+# parametri pentru create_stadium_template: ~21k, ~45k si ~76k de locuri
+STADIUMS = {
+    "arena": dict(sectors=24, tiers=3, rows_per_tier=20, inner_radius=900),
+    "stadion": dict(sectors=32, tiers=4, rows_per_tier=22, inner_radius=1200),
+    "stadion mare": dict(sectors=40, tiers=5, rows_per_tier=22, inner_radius=1800),
+}
+
+
+def _template(seats: int):
+    items = []
+    b = 0
+    while len(items) < seats:
+        rows = min(BLOCK_ROWS, -(-(seats - len(items)) // BLOCK_COLS))
+        items.extend(layout_generator.generate_seat_block(
+            (b % 4) * (BLOCK_COLS * 35 + 60), (b // 4) * (BLOCK_ROWS * 35 + 60),
+            rows, BLOCK_COLS, 'A', b * BLOCK_COLS + 1,
+        ))
+        b += 1
+    del items[seats:]
+    return items
+
+
+def _timed(fn):
+    best = None
+    for _ in range(3):
+        t0 = time.perf_counter()
+        res = fn()
+        ms = (time.perf_counter() - t0) * 1000
+        best = ms if best is None else min(best, ms)
+    return res, best
+
+
+def _run(seats: int):
+    items, gen_ms = _timed(lambda: _template(seats))
+    _, center_ms = _timed(lambda: layout_generator.center_layout(items))
+    _, rot_ms = _timed(lambda: layout_generator.apply_rotation_to_group(items, 800, 450, 15))
+    return gen_ms, center_ms, rot_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    args = parser.parse_args()
+
+    rows = []
+    for seats in (int(s) for s in args.sizes.split(",")):
+        gen_ms, center_ms, rot_ms = _run(seats)
+        rows.append((seats, f"{gen_ms:.1f}", f"{center_ms:.1f}", f"{rot_ms:.1f}"))
+
+    stadium_rows = []
+    for venue, params in STADIUMS.items():
+        items, ms = _timed(lambda: layout_generator.create_stadium_template(**params))
+        seats = sum(1 for it in items if it["type"] == "seat")
+        stadium_rows.append((venue, seats, f"{ms:.1f}"))
+
+    print_table(["locuri", "generare ms", "centrare ms", "rotire grup ms"], rows)
+    print()
+    print_table(["sala", "locuri", "generare ms"], stadium_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Memoria unui layout de sala: dict-uri per item vs. CompactLayout, MapItem cu/fara __slots__.
+
+Se masoara cu tracemalloc doar structura pastrata (JSON-ul parsat temporar nu se numara).
+
+Rulare: python -m benchmarks.bench_layout_memory [--sizes 10000,50000]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from types import MappingProxyType
+
+from benchmarks._util import print_table
+from services.hall_service import CompactLayout, _parse_layout_json
+
+
+def _layout_json(seats: int) -> str:
+    # randuri de scaune plus mese rotunde cu scaune copil, ca o sala reala
+    items = [{"id": "S1", "type": "stage", "x": 100, "y": 20, "w": 600, "h": 80, "rotation": 0}]
+    cols = 40
+    rows = seats // 2 // cols
+    for r in range(rows):
+        for c in range(cols):
+            items.append({
+                "id": f"R{r + 1}-{c + 1}", "type": "seat", "x": 60 + c * 34, "y": 140 + r * 34,
+                "w": 30, "h": 30, "parent_id": None, "rotation": 0, "label": "",
+                "zone_id": "Z2" if r < 5 else "Z1",
+            })
+    t = 0
+    while len(items) - 1 - t < seats:
+        t += 1
+        tx, ty = 1500 + (t % 30) * 140, 140 + (t // 30) * 140
+        items.append({"id": f"T{t}", "type": "table_round", "x": tx, "y": ty, "w": 80, "h": 80, "rotation": 0})
+        for k in range(min(8, seats - (len(items) - 1 - t))):
+            items.append({
+                "id": f"T{t}-{k + 1}", "type": "seat", "x": tx + (k % 4) * 20, "y": ty + (k // 4) * 90,
+                "w": 30, "h": 30, "parent_id": f"T{t}", "rotation": k * 45, "label": "", "zone_id": "Z3",
+            })
+    zones = [{"id": z, "name": z, "color": "#A5D6A7", "price": 50} for z in ("Z1", "Z2", "Z3")]
+    return json.dumps({"items": items, "zones": zones})
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+class _PlainMapItem:
+    # MapItem asa cum era inainte de __slots__
+    def __init__(self, item_id, x, y, item_type, w=30, h=30, parent_id=None, rotation=0, label="", zone_id="Z1"):
+        self.id = item_id
+        self.x = x
+        self.y = y
+        self.type = item_type
+        self.w = w
+        self.h = h
+        self.parent_id = parent_id
+        self.rotation = rotation
+        self.label = label
+        self.zone_id = zone_id
+
+
+def _map_items(cls, items):
+    return [
+        cls(d["id"], d["x"], d["y"], d["type"], d.get("w", 30), d.get("h", 30),
+            d.get("parent_id"), d.get("rotation", 0), d.get("label", ""), d.get("zone_id", ""))
+        for d in items
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,50000")
+    args = parser.parse_args()
+
+    from ui.seatmap.seatmap_core import MapItem
+
+    rows = []
+    for seats in (int(s) for s in args.sizes.split(",")):
+        layout_json = _layout_json(seats)
+
+        def as_dicts():
+            # forma veche din cache: dict-uri parsate, invelite in MappingProxyType
+            return tuple(MappingProxyType(it) for it in _parse_layout_json(layout_json)["items"])
+
+        def as_compact():
+            return CompactLayout(_parse_layout_json(layout_json)["items"])
+
+        dicts, dict_bytes = _measure(as_dicts)
+        compact, compact_bytes = _measure(as_compact)
+        n = len(compact)
+        assert n == len(dicts)
+        del dicts
+
+        items = compact.to_dicts()
+        _, plain_bytes = _measure(lambda: _map_items(_PlainMapItem, items))
+        _, slot_bytes = _measure(lambda: _map_items(MapItem, items))
+        del items
+
+        rows.append((seats, "cache: dict-uri", f"{dict_bytes / 2**20:.2f}", f"{dict_bytes / n:.0f}", "1.0x"))
+        rows.append((
+            seats, "cache: CompactLayout", f"{compact_bytes / 2**20:.2f}",
+            f"{compact_bytes / n:.0f}", f"{dict_bytes / compact_bytes:.1f}x",
+        ))
+        rows.append((seats, "editor: MapItem", f"{plain_bytes / 2**20:.2f}", f"{plain_bytes / n:.0f}", "1.0x"))
+        rows.append((
+            seats, "editor: MapItem __slots__", f"{slot_bytes / 2**20:.2f}",
+            f"{slot_bytes / n:.0f}", f"{plain_bytes / slot_bytes:.1f}x",
+        ))
+
+    print_table(["locuri", "structura", "MB", "octeti/item", "reducere"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Timp de deschidere si RSS pentru SeatMapView: un item per loc vs. SeatLayer.
+
+Fiecare caz ruleaza intr-un proces separat, ca RSS-ul sa nu se amestece.
+Cu --layout stadium salile vin din create_stadium_template; in ambele cazuri se
+verifica si ca niciun loc nu iese din sceneRect() (coloana "in afara" trebuie sa fie 0).
+
+Rulare: python -m benchmarks.bench_seatmap_render [--sizes 1000,10000,50000] [--layout grid|stadium]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks._util import print_table, qt_app
+
+
+def _rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _layout(seats: int):
+    cols = max(1, int((seats * 16 / 9) ** 0.5))
+    items = []
+    for i in range(seats):
+        r, c = divmod(i, cols)
+        items.append({
+            "id": f"R{r + 1}-{c + 1}", "type": "seat", "x": c * 34, "y": r * 34,
+            "w": 30, "h": 30, "rotation": 0, "zone_id": "Z1" if r % 3 else "Z2",
+        })
+    return items
+
+
+def _stadium(seats: int):
+    from ui.layout_generator import create_stadium_template
+
+    # se adauga randuri pana se strang destule locuri, apoi se taie surplusul
+    rows_per_tier = 5
+    while True:
+        items = create_stadium_template(rows_per_tier=rows_per_tier, tier_zones=["Z2", "Z1"])
+        seat_items = [it for it in items if it["type"] == "seat"]
+        if len(seat_items) >= seats:
+            return [it for it in items if it["type"] != "seat"] + seat_items[:seats]
+        rows_per_tier += 5
+
+
+def _seats_outside(view) -> int:
+    rect = view.scene.sceneRect()
+    if view.seat_layer is not None:
+        layer = view.seat_layer
+        return sum(1 for i in range(len(layer)) if not rect.contains(layer._extent(i)))
+    return sum(
+        1 for gfx in view._graphics.values()
+        if gfx.data.type == "seat" and not rect.contains(gfx.sceneBoundingRect())
+    )
+
+
+def _run_case(seats: int, batched: bool, layout: str):
+    qt_app()
+    from ui.seatmap.seatmap_core import SeatMapView
+
+    items = _stadium(seats) if layout == "stadium" else _layout(seats)
+    reserved = {it["id"] for it in items[::7]}
+    zones = [
+        {"id": "Z1", "name": "Standard", "color": "#A5D6A7", "price": 50},
+        {"id": "Z2", "name": "VIP", "color": "#90CAF9", "price": 120},
+    ]
+    before = _rss_kb()
+
+    t0 = time.perf_counter()
+    view = SeatMapView(items, reserved_seats=reserved, editable=False, zones=zones, batched=batched)
+    view.resize(1200, 800)
+    t1 = time.perf_counter()
+    view.grab()
+    t2 = time.perf_counter()
+
+    return {
+        "load_ms": (t1 - t0) * 1000,
+        "paint_ms": (t2 - t1) * 1000,
+        "rss_mb": (_rss_kb() - before) / 1024,
+        "scene_items": len(view.scene.items()),
+        "outside": _seats_outside(view),
+    }
+
+
+def _spawn_case(seats: int, batched: bool, layout: str, timeout: float):
+    cmd = [sys.executable, "-m", "benchmarks.bench_seatmap_render", "--case", str(seats), "--layout", layout]
+    if batched:
+        cmd.append("--batched")
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None
+    if proc.returncode != 0:
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--layout", choices=("grid", "stadium"), default="grid")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--case", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--batched", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case is not None:
+        # proces copil: un singur caz, rezultatul ca JSON pe ultima linie
+        print(json.dumps(_run_case(args.case, args.batched, args.layout)))
+        return
+
+    rows = []
+    outside = 0
+    for seats in (int(s) for s in args.sizes.split(",")):
+        for batched in (False, True):
+            mode = "SeatLayer" if batched else "GraphicSeat"
+            res = _spawn_case(seats, batched, args.layout, args.timeout)
+            if res is None:
+                # procesul copil a murit sau a depasit timpul; restul cazurilor continua
+                rows.append((seats, mode, "esuat", "-", "-", "-", "-"))
+                continue
+            outside += res["outside"]
+            rows.append((
+                seats, mode,
+                f"{res['load_ms']:.0f}", f"{res['paint_ms']:.0f}",
+                f"{res['rss_mb']:.1f}", res["scene_items"], res["outside"],
+            ))
+
+    print_table(["locuri", "mod", "incarcare ms", "prima randare ms", "RSS +MB", "itemi scena", "in afara"], rows)
+    if outside:
+        sys.exit(f"{outside} locuri sunt in afara sceneRect()")
+
+
+if __name__ == "__main__":
+    main()
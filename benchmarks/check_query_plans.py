@@ -0,0 +1,189 @@
+"""Verifica EXPLAIN QUERY PLAN pentru toate interogarile facute de servicii.
+
+Ruleaza un scenariu care atinge fiecare functie din services/ si colecteaza
+instructiunile SQL executate. Apoi umple baza cu un volum reprezentativ
+(SEED_EVENTS evenimente, cate SEED_BOOKINGS_PER_EVENT rezervari fiecare), ruleaza
+ANALYZE si iese cu cod 1 daca vreo instructiune face SCAN fara index pe un
+tabel care creste in timp. Acelasi control ruleaza si in tests/test_query_plans.py.
+
+Rulare: python -m benchmarks.check_query_plans
+"""
+import sys
+
+from benchmarks._util import use_temp_database
+from core import db
+
+# tabele mici prin natura lor; o scanare completa e acceptabila
+SMALL_TABLES = {"halls", "h", "users"}
+
+SEED_EVENTS = 5000
+SEED_BOOKINGS_PER_EVENT = 4
+SEED_HOLD_EVERY = 10
+
+
+def _seed() -> None:
+    # pe o baza goala planificatorul nu are statistici si poate alege altfel decat in productie;
+    # ruleaza dupa scenariu (salile implicite exista deja), ca sa nu schimbe ce se colecteaza
+    with db.connection() as conn:
+        conn.execute(
+            """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?),
+                 h AS MATERIALIZED (SELECT id, ROW_NUMBER() OVER (ORDER BY id) - 1 AS k, COUNT(*) OVER () AS cnt FROM halls)
+            INSERT INTO events (title, description, date, time, hall_id)
+            SELECT 'Seed ' || i, '', date('2030-01-01', '+' || (i % 730) || ' days'),
+                   printf('%02d:%02d', 10 + i % 12, (i % 4) * 15), h.id
+            FROM n JOIN h ON h.k = i % h.cnt;
+            """,
+            (SEED_EVENTS,),
+        )
+        conn.execute(
+            """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+            INSERT INTO bookings (event_id, name, email, seats_json, created_at, total_price)
+            SELECT e.id, 'Seed', 'seed' || ((e.id * 7 + i) % 2000) || '@eventease.local', json_array('SEED' || i),
+                   datetime('2029-01-01', '+' || (e.id * 10 + i) || ' minutes'), 50
+            FROM events e, n WHERE e.title LIKE 'Seed %';
+            """,
+            (SEED_BOOKINGS_PER_EVENT,),
+        )
+        conn.execute(
+            """
+            INSERT INTO booking_seats (event_id, seat_id, booking_id)
+            SELECT event_id, json_extract(seats_json, '$[0]'), id FROM bookings WHERE name = 'Seed';
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO seat_holds (event_id, expires_at)
+            SELECT id, 4102444800 + id FROM events WHERE title LIKE 'Seed %' AND id % ? = 0;
+            """,
+            (SEED_HOLD_EVERY,),
+        )
+        conn.execute(
+            """
+            INSERT INTO held_seats (event_id, seat_id, hold_id)
+            SELECT event_id, 'HOLD' || id, id FROM seat_holds;
+            """
+        )
+        conn.commit()
+
+
+def _collect_statements():
+    statements = []
+    original = db.get_connection
+
+    def traced():
+        conn = original()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    db.get_connection = traced
+    db.close_pool()
+    try:
+        _workload()
+    finally:
+        db.get_connection = original
+        db.close_pool()
+    return statements
+
+
+def _workload() -> None:
+    from services import auth_service, availability_service, booking_service, event_service, hall_service
+
+    auth_service.init_default_admin()
+    auth_service.create_user("plan@eventease.local", "x")
+    auth_service.login("plan@eventease.local", "x")
+    hall_service.init_default_halls()
+    hall_service.create_hall("Plan", 5, 5)
+    halls = hall_service.get_all_halls()
+    hall = hall_service.get_hall(next(h["id"] for h in halls if h["name"] == "Plan"))
+    hall_service.count_seats([h["id"] for h in halls])
+    hall_service.get_pricing(hall["id"])
+    hall_service.get_seat_index(hall["id"])
+    hall_service.count_seats_by_zone(hall["id"])
+    hall_service.seats_in_rect(hall["id"], 0, 0, 800, 450)
+    hall_service.seats_near(hall["id"], 800, 450, 100)
+    hall_service.seats_near_stage(hall["id"], 200)
+
+    event_service.create_event("Plan", "", "2030-01-01", "20:00", hall["id"])
+    events = event_service.list_events()
+    page = event_service.list_events_page(limit=5)
+    event_service.list_events_page(after=event_service.page_cursor(page[-1]), limit=5, filters={"hall_id": hall["id"]})
+    event_id = next(e["id"] for e in events if e["title"] == "Plan")
+    event_service.get_event(event_id)
+    event_service.search_events("pla")
+    event_service.update_event(event_id, "Plan", "d", "2030-01-01", "20:00", hall["id"])
+
+    booking_service.preview_total(event_id, ["A1"])
+    booking_service.occupancy_for_events([e["id"] for e in events])
+    booking_id = booking_service.create_booking(event_id, "P", "plan@eventease.local", ["A1"])
+    hold_id = booking_service.hold_seats(event_id, ["A2"])
+    booking_service.confirm_hold(hold_id, "P", "plan@eventease.local")
+    booking_service.release_hold(booking_service.hold_seats(event_id, ["A3"]))
+    booking_service.list_unavailable_seats(event_id)
+    booking_service.find_best_seats(event_id, 2)
+    booking_service.list_bookings_for_event(event_id)
+    booking_service.list_bookings_for_email("plan@eventease.local")
+    booking_service.cancel_booking(booking_id)
+    availability_service.get_availability(event_id)
+
+    seat = next(it for it in hall["layout"] if it.get("type") == "seat")
+    hall_service.patch_hall(hall["id"], [
+        {"op": "move", "id": seat["id"], "x": 10, "y": 10},
+        {"op": "rezone", "id": seat["id"], "zone_id": "Z2"},
+    ])
+    hall_service.update_hall(hall["id"], "Plan", list(hall["layout"]), hall["zones"])
+    event_service.delete_event(event_id)
+    hall_service.delete_hall(hall["id"])
+
+
+def _bad_steps(conn, sql: str):
+    bad = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[-1]
+        if not detail.startswith("SCAN "):
+            continue
+        if "USING" in detail or "VIRTUAL TABLE" in detail or "CONSTANT ROW" in detail:
+            continue
+        table = detail.split()[1]
+        if table.startswith("main."):
+            # tabelele interne ale FTS5 (events_fts_config etc.)
+            continue
+        if table not in SMALL_TABLES:
+            bad.append(detail)
+    return bad
+
+
+def check_plans():
+    # pe baza curenta (db.DB_PATH): intoarce (numar de interogari, [(sql, pasi SCAN)])
+    statements = _collect_statements()
+    _seed()
+
+    seen = set()
+    failures = []
+    conn = db.get_connection()
+    conn.execute("ANALYZE;")
+    for sql in statements:
+        head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if head not in ("SELECT", "UPDATE", "DELETE", "INSERT") or sql in seen:
+            continue
+        seen.add(sql)
+        bad = _bad_steps(conn, sql)
+        if bad:
+            failures.append((" ".join(sql.split()), bad))
+    conn.close()
+    return len(seen), failures
+
+
+def main() -> int:
+    use_temp_database(copy_existing=False)
+    checked, failures = check_plans()
+
+    print(f"{checked} interogari verificate")
+    for sql, bad in failures:
+        print(f"\nSCAN fara index: {'; '.join(bad)}\n  {sql}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
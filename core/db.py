@@ -1,83 +1,282 @@
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from core import migrations
 
 DB_PATH = Path(__file__).resolve().parent.parent / "eventease.db"
 
+POOL_SIZE = 4
+POOL_TIMEOUT = 10.0
+
+DURABILITY_PROFILES: Dict[str, Dict[str, object]] = {
+    # fiecare commit e fsync-uit; potrivit pentru un singur kiosk
+    "safe": {
+        "synchronous": "FULL",
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "wal_autocheckpoint": 1000,
+    },
+    # WAL + NORMAL: un crash de sistem poate pierde ultimele commit-uri, dar nu corupe baza
+    "balanced": {
+        "synchronous": "NORMAL",
+        "cache_size": -32000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 1000,
+    },
+    # fara fsync; doar pentru demo / benchmark-uri
+    "fast": {
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 4000,
+    },
+}
+
+DURABILITY_PROFILE = os.environ.get("EVENTEASE_DURABILITY", "balanced")
+if DURABILITY_PROFILE not in DURABILITY_PROFILES:
+    DURABILITY_PROFILE = "balanced"
+
+_opened_connections = 0
+_opened_lock = threading.Lock()
+
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+    global _opened_connections
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     conn.execute("PRAGMA foreign_keys = ON;")
+    _apply_profile(conn, DURABILITY_PROFILES[DURABILITY_PROFILE])
+    with _opened_lock:
+        _opened_connections += 1
     return conn
 
-def _ensure_column(conn: sqlite3.Connection, table: str, column: str, ddl: str) -> None:
-    cur = conn.cursor()
-    cur.execute(f"PRAGMA table_info({table});")
-    cols = [r[1] for r in cur.fetchall()]
-    if column not in cols:
-        cur.execute(ddl)
-        conn.commit()
+
+def _apply_profile(conn: sqlite3.Connection, profile: Dict[str, object]) -> None:
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']};")
+    conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])};")
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])};")
+    conn.execute(f"PRAGMA temp_store = {profile['temp_store']};")
+    conn.execute(f"PRAGMA wal_autocheckpoint = {int(profile['wal_autocheckpoint'])};")
+
+
+def set_durability_profile(name: str) -> None:
+    global DURABILITY_PROFILE
+    if name not in DURABILITY_PROFILES:
+        raise ValueError(
+            f"Profil de durabilitate necunoscut: {name} "
+            f"(disponibile: {', '.join(DURABILITY_PROFILES)})"
+        )
+    DURABILITY_PROFILE = name
+    close_pool()
+
+
+def connections_opened() -> int:
+    return _opened_connections
+
+
+class ConnectionPool:
+    def __init__(self, db_path: Path, size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT) -> None:
+        self.db_path = db_path
+        self.size = max(0, int(size))
+        self.timeout = timeout
+        self._idle: List[sqlite3.Connection] = []
+        self._owner: Dict[int, int] = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+    def _healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        self._owner.pop(id(conn), None)
+        self._live -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _take_idle(self) -> Optional[sqlite3.Connection]:
+        # prefera conexiunea folosita ultima data de acelasi thread
+        me = threading.get_ident()
+        for i in range(len(self._idle) - 1, -1, -1):
+            if self._owner.get(id(self._idle[i])) == me:
+                return self._idle.pop(i)
+        return self._idle.pop() if self._idle else None
+
+    def acquire(self) -> sqlite3.Connection:
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            return held
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Pool-ul de conexiuni a fost inchis.")
+            conn = None
+            while conn is None:
+                candidate = self._take_idle()
+                if candidate is not None:
+                    if self._healthy(candidate):
+                        conn = candidate
+                    else:
+                        self._discard(candidate)
+                    continue
+                if self.size == 0 or self._live < self.size:
+                    break
+                if not self._cond.wait(self.timeout):
+                    raise RuntimeError("Nu exista nicio conexiune libera la baza de date.")
+            if conn is None:
+                self._live += 1
+
+        if conn is None:
+            try:
+                conn = get_connection()
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+
+        with self._cond:
+            self._owner[id(conn)] = threading.get_ident()
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if getattr(self._local, "conn", None) is not conn:
+            raise RuntimeError("Conexiunea nu apartine acestui thread.")
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._cond:
+            if self._closed or self.size == 0:
+                self._discard(conn)
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self.size, "live": self._live, "idle": len(self._idle)}
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.db_path != DB_PATH:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DB_PATH, POOL_SIZE, POOL_TIMEOUT)
+        return _pool
+
+
+def configure_pool(size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT) -> None:
+    global POOL_SIZE, POOL_TIMEOUT
+    POOL_SIZE = size
+    POOL_TIMEOUT = timeout
+    close_pool()
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    with get_pool().connection() as conn:
+        yield conn
+
+
+class CheckpointScheduler:
+    def __init__(self, interval: float = 30.0, max_wal_bytes: int = 16 * 1024 * 1024) -> None:
+        self.interval = interval
+        self.max_wal_bytes = max_wal_bytes
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _wal_size(self) -> int:
+        wal = Path(f"{DB_PATH}-wal")
+        try:
+            return wal.stat().st_size
+        except OSError:
+            return 0
+
+    def checkpoint(self) -> None:
+        # PASSIVE nu blocheaza cititorii; TRUNCATE doar cand fisierul WAL a crescut prea mult
+        mode = "TRUNCATE" if self._wal_size() > self.max_wal_bytes else "PASSIVE"
+        conn = get_connection()
+        try:
+            conn.execute(f"PRAGMA wal_checkpoint({mode});").fetchone()
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            conn.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.checkpoint()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="wal-checkpoint", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.checkpoint()
+
 
 def init_db() -> None:
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            role TEXT NOT NULL CHECK (role IN ('admin', 'user'))
-        );
-        """
-    )
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS halls (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            layout_json TEXT NOT NULL
-        );
-        """
-    )
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT,
-            date TEXT NOT NULL,
-            time TEXT NOT NULL,
-            hall_id INTEGER NOT NULL,
-            FOREIGN KEY (hall_id) REFERENCES halls(id) ON DELETE CASCADE
-        );
-        """
-    )
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS bookings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            event_id INTEGER NOT NULL,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL,
-            seats_json TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            total_price REAL NOT NULL DEFAULT 0,
-            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
-        );
-        """
-    )
-
-    _ensure_column(
-        conn,
-        "bookings",
-        "total_price",
-        "ALTER TABLE bookings ADD COLUMN total_price REAL NOT NULL DEFAULT 0;",
-    )
-
-
-    conn.commit()
-    conn.close()
+    try:
+        migrations.migrate(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,381 @@
+import sqlite3
+from typing import Callable, List
+
+
+def _has_column(cur: sqlite3.Cursor, table: str, column: str) -> bool:
+    cur.execute(f"PRAGMA table_info({table});")
+    return column in [r[1] for r in cur.fetchall()]
+
+
+def _base_schema(cur: sqlite3.Cursor) -> None:
+    # bazele de date dinainte de user_version pot avea deja tabelele, de aici IF NOT EXISTS
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL CHECK (role IN ('admin', 'user'))
+        );
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS halls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            layout_json TEXT NOT NULL
+        );
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            hall_id INTEGER NOT NULL,
+            FOREIGN KEY (hall_id) REFERENCES halls(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            seats_json TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            total_price REAL NOT NULL DEFAULT 0,
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    if not _has_column(cur, "bookings", "total_price"):
+        cur.execute("ALTER TABLE bookings ADD COLUMN total_price REAL NOT NULL DEFAULT 0;")
+
+
+def _booking_seats(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS booking_seats (
+            event_id INTEGER NOT NULL,
+            seat_id TEXT NOT NULL,
+            booking_id INTEGER NOT NULL,
+            UNIQUE (event_id, seat_id),
+            FOREIGN KEY (booking_id) REFERENCES bookings(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_booking_seats_booking ON booking_seats(booking_id);"
+    )
+
+    # rezervarile vechi au locurile doar in seats_json
+    cur.execute(
+        """
+        INSERT OR IGNORE INTO booking_seats (event_id, seat_id, booking_id)
+        SELECT b.event_id, UPPER(TRIM(j.value)), b.id
+        FROM bookings b, json_each(b.seats_json) j
+        WHERE json_valid(b.seats_json)
+          AND TRIM(j.value) <> ''
+          AND NOT EXISTS (
+              SELECT 1 FROM booking_seats bs WHERE bs.booking_id = b.id
+          );
+        """
+    )
+
+
+def _seat_holds(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS seat_holds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS held_seats (
+            event_id INTEGER NOT NULL,
+            seat_id TEXT NOT NULL,
+            hold_id INTEGER NOT NULL,
+            UNIQUE (event_id, seat_id),
+            FOREIGN KEY (hold_id) REFERENCES seat_holds(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_seat_holds_expiry ON seat_holds(event_id, expires_at);"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_held_seats_hold ON held_seats(hold_id);"
+    )
+
+
+def _event_availability(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS event_availability (
+            event_id INTEGER PRIMARY KEY,
+            layout_digest TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
+            bits BLOB NOT NULL,
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+
+def _hot_query_indexes(cur: sqlite3.Cursor) -> None:
+    # list_bookings_for_event / list_bookings_for_email filtreaza si sorteaza dupa created_at
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bookings_event_created ON bookings(event_id, created_at);"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bookings_email_created ON bookings(email, created_at);"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_events_hall ON events(hall_id);")
+    # ORDER BY e.date, e.time, e.title din list_events
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_date_time ON events(date, time, title);"
+    )
+
+
+def _events_keyset_index(cur: sqlite3.Cursor) -> None:
+    # rowid-ul e adaugat implicit, deci indexul serveste ORDER BY date, time, id
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_events_keyset ON events(date, time);")
+
+
+def _events_fts(cur: sqlite3.Cursor) -> None:
+    # rowid = events.id; numele salii e denormalizat aici si tinut la zi de triggere
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+            title, description, hall_name,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+            INSERT INTO events_fts (rowid, title, description, hall_name)
+            VALUES (
+                new.id, new.title, COALESCE(new.description, ''),
+                COALESCE((SELECT name FROM halls WHERE id = new.hall_id), '')
+            );
+        END;
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_update
+        AFTER UPDATE OF title, description, hall_id ON events BEGIN
+            DELETE FROM events_fts WHERE rowid = old.id;
+            INSERT INTO events_fts (rowid, title, description, hall_name)
+            VALUES (
+                new.id, new.title, COALESCE(new.description, ''),
+                COALESCE((SELECT name FROM halls WHERE id = new.hall_id), '')
+            );
+        END;
+        """
+    )
+    # se declanseaza si pentru stergerile in cascada de la halls
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+            DELETE FROM events_fts WHERE rowid = old.id;
+        END;
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_hall_rename AFTER UPDATE OF name ON halls
+        WHEN new.name IS NOT old.name BEGIN
+            UPDATE events_fts SET hall_name = new.name
+            WHERE rowid IN (SELECT id FROM events WHERE hall_id = new.id);
+        END;
+        """
+    )
+
+    cur.execute("DELETE FROM events_fts;")
+    cur.execute(
+        """
+        INSERT INTO events_fts (rowid, title, description, hall_name)
+        SELECT e.id, e.title, COALESCE(e.description, ''), COALESCE(h.name, '')
+        FROM events e
+        LEFT JOIN halls h ON h.id = e.hall_id;
+        """
+    )
+
+
+def _hall_layout_version(cur: sqlite3.Cursor) -> None:
+    # creste la fiecare scriere a layout-ului; cache-urile se cheie dupa (hall_id, versiune)
+    if not _has_column(cur, "halls", "layout_version"):
+        cur.execute("ALTER TABLE halls ADD COLUMN layout_version INTEGER NOT NULL DEFAULT 1;")
+
+
+def _hall_items(cur: sqlite3.Cursor) -> None:
+    # oglinda relationala a items din layout_json, pentru agregate si interogari spatiale;
+    # layout_json ramane sursa completa. items_version = layout_version cand oglinda e la zi
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS hall_items (
+            id INTEGER PRIMARY KEY,
+            hall_id INTEGER NOT NULL,
+            item_id TEXT NOT NULL,
+            type TEXT NOT NULL,
+            x REAL NOT NULL,
+            y REAL NOT NULL,
+            w REAL NOT NULL,
+            h REAL NOT NULL,
+            rotation REAL NOT NULL DEFAULT 0,
+            parent_id TEXT,
+            zone_id TEXT,
+            FOREIGN KEY (hall_id) REFERENCES halls(id) ON DELETE CASCADE
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_hall_items_hall_type_zone ON hall_items(hall_id, type, zone_id);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_hall_items_hall_item ON hall_items(hall_id, item_id);")
+
+    # hall_id e si el o dimensiune (degenerata), ca toate salile sa poata imparti acelasi arbore
+    # desi folosesc aceeasi panza 1600x900
+    cur.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS hall_items_rtree "
+        "USING rtree(id, min_hall, max_hall, min_x, max_x, min_y, max_y);"
+    )
+    # un item rotit se incadreaza conservator in patratul de latura w + h din jurul centrului
+    extent = """
+        new.id, new.hall_id, new.hall_id,
+        new.x + new.w / 2 - (CASE WHEN new.rotation % 360 = 0 THEN new.w ELSE new.w + new.h END) / 2,
+        new.x + new.w / 2 + (CASE WHEN new.rotation % 360 = 0 THEN new.w ELSE new.w + new.h END) / 2,
+        new.y + new.h / 2 - (CASE WHEN new.rotation % 360 = 0 THEN new.h ELSE new.w + new.h END) / 2,
+        new.y + new.h / 2 + (CASE WHEN new.rotation % 360 = 0 THEN new.h ELSE new.w + new.h END) / 2
+    """
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS hall_items_rtree_insert AFTER INSERT ON hall_items BEGIN
+            INSERT INTO hall_items_rtree VALUES ({extent});
+        END;
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS hall_items_rtree_update AFTER UPDATE OF x, y, w, h, rotation ON hall_items BEGIN
+            INSERT OR REPLACE INTO hall_items_rtree VALUES ({extent});
+        END;
+        """
+    )
+    # se declanseaza si pentru stergerile in cascada de la halls
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS hall_items_rtree_delete AFTER DELETE ON hall_items BEGIN
+            DELETE FROM hall_items_rtree WHERE id = old.id;
+        END;
+        """
+    )
+
+    if not _has_column(cur, "halls", "items_version"):
+        cur.execute("ALTER TABLE halls ADD COLUMN items_version INTEGER NOT NULL DEFAULT 0;")
+
+    # formatul cu items (si lista simpla) se copiaza direct din JSON; formatul rows/cols
+    # ramane nesincronizat si se citeste din layout_json pana la prima salvare
+    cur.execute("DELETE FROM hall_items;")
+    cur.execute(
+        """
+        INSERT INTO hall_items (hall_id, item_id, type, x, y, w, h, rotation, parent_id, zone_id)
+        SELECT h.id,
+               json_extract(it.value, '$.id'),
+               json_extract(it.value, '$.type'),
+               COALESCE(json_extract(it.value, '$.x'), 0),
+               COALESCE(json_extract(it.value, '$.y'), 0),
+               COALESCE(json_extract(it.value, '$.w'), 30),
+               COALESCE(json_extract(it.value, '$.h'), 30),
+               COALESCE(json_extract(it.value, '$.rotation'), 0),
+               json_extract(it.value, '$.parent_id'),
+               CASE WHEN json_extract(it.value, '$.type') = 'seat'
+                    THEN COALESCE(NULLIF(trim(json_extract(it.value, '$.zone_id')), ''), 'Z1') END
+        FROM halls h,
+             json_each(h.layout_json, CASE json_type(h.layout_json) WHEN 'array' THEN '$' ELSE '$.items' END) it
+        WHERE json_valid(h.layout_json)
+          AND json_type(h.layout_json, CASE json_type(h.layout_json) WHEN 'array' THEN '$' ELSE '$.items' END) = 'array'
+          AND json_type(it.value) = 'object'
+          AND json_extract(it.value, '$.id') IS NOT NULL
+          AND json_extract(it.value, '$.type') IS NOT NULL;
+        """
+    )
+    cur.execute(
+        """
+        UPDATE halls SET items_version = layout_version
+        WHERE json_valid(layout_json)
+          AND json_type(layout_json, CASE json_type(layout_json) WHEN 'array' THEN '$' ELSE '$.items' END) = 'array';
+        """
+    )
+
+
+def _drop_events_keyset_index(cur: sqlite3.Cursor) -> None:
+    # idx_events_keyset(date, time) era un prefix al idx_events_date_time(date, time, title);
+    # paginarea keyset ordoneaza acum dupa (date, time, title, id) si foloseste indexul acela
+    cur.execute("DROP INDEX IF EXISTS idx_events_keyset;")
+
+
+# ordinea conteaza: pasul i aduce schema la user_version = i + 1.
+# Pasii existenti nu se modifica; schimbarile noi se adauga la final.
+MIGRATIONS: List[Callable[[sqlite3.Cursor], None]] = [
+    _base_schema,
+    _booking_seats,
+    _seat_holds,
+    _event_availability,
+    _hot_query_indexes,
+    _events_keyset_index,
+    _events_fts,
+    _hall_layout_version,
+    _hall_items,
+    _drop_events_keyset_index,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    current = schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return current
+
+    cur = conn.cursor()
+    for version in range(current + 1, SCHEMA_VERSION + 1):
+        cur.execute("BEGIN IMMEDIATE;")
+        try:
+            # alt proces poate sa fi aplicat deja pasul cat am asteptat lock-ul
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            MIGRATIONS[version - 1](cur)
+            cur.execute(f"PRAGMA user_version = {version};")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return schema_version(conn)
@@ -0,0 +1,9 @@
+def row_label(index: int) -> str:
+    # 0 -> A, 25 -> Z, 26 -> AA, 27 -> AB ... ca la coloanele din Excel;
+    # folosit si de generatoarele de layout si de create_hall, ca id-urile sa fie aceleasi
+    label = ""
+    index += 1
+    while index > 0:
+        index, rem = divmod(index - 1, 26)
+        label = chr(ord("A") + rem) + label
+    return label
@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+from core.db import connection
+from services import hall_service
+
+
+class AvailabilityBitmap:
+    # bitul i = 1 daca locul cu ordinalul i din layout este ocupat
+    def __init__(self, ordinals: hall_service.SeatOrdinals, bits: Optional[bytes] = None, version: int = 0) -> None:
+        self.ordinals = ordinals
+        self.version = version
+        size = (len(ordinals) + 7) // 8
+        self.bits = bytearray(bits or b"")[:size]
+        if len(self.bits) < size:
+            self.bits.extend(b"\x00" * (size - len(self.bits)))
+
+    def copy(self) -> "AvailabilityBitmap":
+        return AvailabilityBitmap(self.ordinals, bytes(self.bits), self.version)
+
+    def _set(self, ordinal: int, taken: bool) -> None:
+        if taken:
+            self.bits[ordinal >> 3] |= 1 << (ordinal & 7)
+        else:
+            self.bits[ordinal >> 3] &= ~(1 << (ordinal & 7)) & 0xFF
+
+    def mark(self, seat_ids: Iterable[str], taken: bool = True) -> None:
+        for sid in seat_ids:
+            o = self.ordinals.ordinal(sid)
+            if o is not None:
+                self._set(o, taken)
+
+    def is_free(self, seat_id: str) -> bool:
+        o = self.ordinals.ordinal(seat_id)
+        if o is None:
+            return False
+        return not (self.bits[o >> 3] >> (o & 7)) & 1
+
+    def __contains__(self, seat_id: str) -> bool:
+        # "loc in bitmap" = locul nu poate fi vandut
+        return not self.is_free(seat_id)
+
+    def as_int(self) -> int:
+        return int.from_bytes(self.bits, "little")
+
+    def mask(self, seat_ids: Iterable[str]) -> int:
+        m = 0
+        for sid in seat_ids:
+            o = self.ordinals.ordinal(sid)
+            if o is not None:
+                m |= 1 << o
+        return m
+
+    def all_free(self, mask: int) -> bool:
+        return (self.as_int() & mask) == 0
+
+    def occupied(self) -> int:
+        return self.as_int().bit_count()
+
+    def total(self) -> int:
+        return len(self.ordinals)
+
+    def taken_ids(self) -> Set[str]:
+        value = self.as_int()
+        ids = self.ordinals.seat_ids
+        out = set()
+        while value:
+            low = value & -value
+            out.add(ids[low.bit_length() - 1])
+            value ^= low
+        return out
+
+
+_cache: Dict[int, AvailabilityBitmap] = {}
+_cache_lock = threading.Lock()
+
+
+def _build_bits(cur: sqlite3.Cursor, event_id: int, ordinals: hall_service.SeatOrdinals) -> AvailabilityBitmap:
+    bitmap = AvailabilityBitmap(ordinals)
+    cur.execute("SELECT seat_id FROM booking_seats WHERE event_id = ?;", (event_id,))
+    bitmap.mark(r[0] for r in cur.fetchall())
+    return bitmap
+
+
+def get_availability(event_id: int) -> Optional[AvailabilityBitmap]:
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT e.hall_id, a.layout_digest, a.version
+            FROM events e
+            LEFT JOIN event_availability a ON a.event_id = e.id
+            WHERE e.id = ?;
+            """,
+            (event_id,),
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        hall_id, digest, version = row
+
+        ordinals = hall_service.get_seat_ordinals(hall_id)
+        if ordinals is None:
+            return None
+
+        with _cache_lock:
+            cached = _cache.get(event_id)
+        if (
+            cached is not None
+            and digest == ordinals.digest
+            and cached.ordinals.digest == ordinals.digest
+            and cached.version == version
+        ):
+            return cached.copy()
+
+        if digest == ordinals.digest:
+            cur.execute("SELECT bits FROM event_availability WHERE event_id = ?;", (event_id,))
+            bitmap = AvailabilityBitmap(ordinals, cur.fetchone()[0], version)
+        else:
+            # lipseste sau layout-ul salii s-a schimbat: reconstruim din booking_seats.
+            # BEGIN IMMEDIATE ca o rezervare concurenta sa nu se piarda intre citire si scriere
+            cur.execute("BEGIN IMMEDIATE;")
+            try:
+                # randul se reciteste sub lock: alt proces poate sa-l fi reconstruit intre timp
+                cur.execute(
+                    "SELECT layout_digest, version, bits FROM event_availability WHERE event_id = ?;",
+                    (event_id,),
+                )
+                current = cur.fetchone()
+                if current is not None and current[0] == ordinals.digest:
+                    bitmap = AvailabilityBitmap(ordinals, current[2], current[1])
+                else:
+                    bitmap = _build_bits(cur, event_id, ordinals)
+                    # versiunea creste doar in SQL, niciodata dintr-o valoare citita in afara tranzactiei
+                    cur.execute(
+                        """
+                        INSERT INTO event_availability (event_id, layout_digest, version, bits)
+                        VALUES (?, ?, 1, ?)
+                        ON CONFLICT(event_id) DO UPDATE SET
+                            layout_digest = excluded.layout_digest,
+                            bits = excluded.bits,
+                            version = event_availability.version + 1
+                        RETURNING version;
+                        """,
+                        (event_id, ordinals.digest, bytes(bitmap.bits)),
+                    )
+                    bitmap.version = cur.fetchone()[0]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    with _cache_lock:
+        _cache[event_id] = bitmap
+    return bitmap.copy()
+
+
+def record_seats(cur: sqlite3.Cursor, event_id: int, seat_ids: Iterable[str], taken: bool) -> None:
+    # se apeleaza in tranzactia care modifica booking_seats
+    cur.execute(
+        """
+        SELECT e.hall_id, a.layout_digest, a.version, a.bits
+        FROM event_availability a
+        JOIN events e ON e.id = a.event_id
+        WHERE a.event_id = ?;
+        """,
+        (event_id,),
+    )
+    row = cur.fetchone()
+
+    with _cache_lock:
+        _cache.pop(event_id, None)
+
+    if row is None:
+        return
+    hall_id, digest, version, bits = row
+
+    ordinals = hall_service.get_seat_ordinals(hall_id)
+    if ordinals is None or ordinals.digest != digest:
+        # randul ramane, doar marcat ca vechi, ca versiunea sa nu o ia de la capat la reconstruire
+        cur.execute(
+            "UPDATE event_availability SET layout_digest = '', version = version + 1 WHERE event_id = ?;",
+            (event_id,),
+        )
+        return
+
+    bitmap = AvailabilityBitmap(ordinals, bits, version)
+    bitmap.mark(seat_ids, taken)
+    cur.execute(
+        "UPDATE event_availability SET bits = ?, version = version + 1 WHERE event_id = ?;",
+        (bytes(bitmap.bits), event_id),
+    )
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
@@ -1,8 +1,12 @@
 import json
+import sqlite3
+import time
 from datetime import datetime
-from typing import List, Dict
-from core.db import get_connection
-from services import event_service, hall_service
+from typing import List, Dict, Optional, Set, Tuple
+from core.db import connection
+from services import availability_service, event_service, hall_service
+
+HOLD_TTL_SECONDS = 600
 
 def _normalize_seats(seats: List[str]) -> List[str]:
     result = []
@@ -24,54 +28,57 @@ def preview_total(event_id: int, seats: List[str]) -> float:
     if not ev:
         return 0.0
 
-    hall = hall_service.get_hall(ev["hall_id"])
-    if not hall:
+    pricing = hall_service.get_pricing(ev["hall_id"])
+    if pricing is None:
         return 0.0
 
-    zones = hall.get("zones", [])
-    zprice = {}
-    for z in zones:
-        zid = str(z.get("id") or "").strip()
-        try:
-            price = float(z.get("price", 0))
-        except Exception:
-            price = 0.0
-        if zid:
-            zprice[zid] = price
-
-    seat_zone = {}
-    for it in hall.get("layout", []):
-        if it.get("type") == "seat":
-            sid = str(it.get("id") or "").strip().upper()
-            zid = str(it.get("zone_id") or "Z1").strip() or "Z1"
-            if sid:
-                seat_zone[sid] = zid
-
-    total = 0.0
-    for s in seats_n:
-        zid = seat_zone.get(s, "Z1")
-        total += float(zprice.get(zid, 0.0))
+    total, _ = pricing.price_many(seats_n)
+    return total
+
+
+def occupancy_for_events(event_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    ids = list(dict.fromkeys(int(e) for e in event_ids))
+    if not ids:
+        return {}
+
+    placeholders = ", ".join("?" for _ in ids)
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT e.id, e.hall_id,
+                   (SELECT COUNT(*) FROM booking_seats bs WHERE bs.event_id = e.id)
+            FROM events e
+            WHERE e.id IN ({placeholders});
+            """,
+            ids,
+        )
+        rows = cur.fetchall()
 
-    return float(total)
+    totals = hall_service.count_seats([hall_id for _, hall_id, _ in rows])
 
+    # (locuri ocupate, total locuri) pentru fiecare eveniment
+    return {
+        event_id: (int(booked or 0), totals.get(hall_id, 0))
+        for event_id, hall_id, booked in rows
+    }
 
 
 def list_bookings_for_event(event_id: int) -> List[Dict]:
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT id, name, email, seats_json, created_at, total_price
-        FROM bookings
-        WHERE event_id = ?
-        ORDER BY created_at;
-        """,
-        (event_id,),
-    )
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute(
+            """
+            SELECT id, name, email, seats_json, created_at, total_price
+            FROM bookings
+            WHERE event_id = ?
+            ORDER BY created_at;
+            """,
+            (event_id,),
+        )
 
-    rows = cur.fetchall()
-    conn.close()
+        rows = cur.fetchall()
 
     bookings: List[Dict] = []
     for booking_id, name, email, seats_json, created_at, total_price in rows:
@@ -95,33 +102,32 @@ def list_bookings_for_event(event_id: int) -> List[Dict]:
 
 
 def list_bookings_for_email(email: str) -> List[Dict]:
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT
-            b.id,
-            b.name,
-            b.email,
-            b.seats_json,
-            b.created_at,
-            b.total_price,
-            e.title,
-            e.date,
-            e.time,
-            h.name AS hall_name
-        FROM bookings b
-        JOIN events e ON b.event_id = e.id
-        JOIN halls h ON e.hall_id = h.id
-        WHERE b.email = ?
-        ORDER BY b.created_at DESC;
-        """,
-        (email,),
-    )
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute(
+            """
+            SELECT
+                b.id,
+                b.name,
+                b.email,
+                b.seats_json,
+                b.created_at,
+                b.total_price,
+                e.title,
+                e.date,
+                e.time,
+                h.name AS hall_name
+            FROM bookings b
+            JOIN events e ON b.event_id = e.id
+            JOIN halls h ON e.hall_id = h.id
+            WHERE b.email = ?
+            ORDER BY b.created_at DESC;
+            """,
+            (email,),
+        )
 
-    rows = cur.fetchall()
-    conn.close()
+        rows = cur.fetchall()
 
     bookings: List[Dict] = []
     for (
@@ -159,48 +165,225 @@ def list_bookings_for_email(email: str) -> List[Dict]:
     return bookings
 
 
-def create_booking(event_id: int, name: str, email: str, seats: List[str]) -> None:
-    normalized_seats = _normalize_seats(seats)
-    if not normalized_seats:
-        raise ValueError("Trebuie sa selectati cel putin un loc.")
+def _placeholders(values: List) -> str:
+    return ", ".join("?" for _ in values)
 
-    conn = get_connection()
-    cur = conn.cursor()
 
+def _purge_expired_holds(cur: sqlite3.Cursor, event_id: int) -> None:
     cur.execute(
-        "SELECT seats_json FROM bookings WHERE event_id = ?;",
-        (event_id,),
+        "DELETE FROM seat_holds WHERE event_id = ? AND expires_at <= ?;",
+        (event_id, time.time()),
     )
-    rows = cur.fetchall()
 
-    reserved_seats = set()
-    for (seats_json,) in rows:
-        try:
-            existing = json.loads(seats_json)
-        except json.JSONDecodeError:
-            existing = []
-        for s in existing:
-            seat = str(s).strip().upper()
-            if seat:
-                reserved_seats.add(seat)
-
-    conflict = reserved_seats.intersection(normalized_seats)
-    if conflict:
-        conn.close()
-        raise ValueError(
-            f"Urmatoarele locuri sunt deja rezervate: {', '.join(sorted(conflict))}"
-        )
 
-    created_at = datetime.now().isoformat(timespec="seconds")
-    total = preview_total(event_id, normalized_seats)
+def _unavailable_among(cur: sqlite3.Cursor, event_id: int, seats: List[str]) -> Set[str]:
+    ph = _placeholders(seats)
+    cur.execute(
+        f"""
+        SELECT seat_id FROM booking_seats WHERE event_id = ? AND seat_id IN ({ph})
+        UNION
+        SELECT seat_id FROM held_seats WHERE event_id = ? AND seat_id IN ({ph});
+        """,
+        (event_id, *seats, event_id, *seats),
+    )
+    return {r[0] for r in cur.fetchall()}
+
 
+def _insert_booking(
+    cur: sqlite3.Cursor, event_id: int, name: str, email: str, seats: List[str], total: float
+) -> int:
+    created_at = datetime.now().isoformat(timespec="seconds")
     cur.execute(
         """
         INSERT INTO bookings (event_id, name, email, seats_json, created_at, total_price)
         VALUES (?, ?, ?, ?, ?, ?);
         """,
-        (event_id, name, email, json.dumps(normalized_seats), created_at, float(total)),
+        (event_id, name, email, json.dumps(seats), created_at, float(total)),
+    )
+    booking_id = cur.lastrowid
+    cur.executemany(
+        "INSERT INTO booking_seats (event_id, seat_id, booking_id) VALUES (?, ?, ?);",
+        [(event_id, s, booking_id) for s in seats],
+    )
+    availability_service.record_seats(cur, event_id, seats, taken=True)
+    return booking_id
+
+
+def _live_held_seats(cur: sqlite3.Cursor, event_id: int) -> Set[str]:
+    cur.execute(
+        """
+        SELECT hs.seat_id
+        FROM held_seats hs
+        JOIN seat_holds h ON h.id = hs.hold_id
+        WHERE hs.event_id = ? AND h.expires_at > ?;
+        """,
+        (event_id, time.time()),
     )
+    return {r[0] for r in cur.fetchall()}
+
+
+def _blocked_seats(event_id: int) -> Optional[availability_service.AvailabilityBitmap]:
+    bitmap = availability_service.get_availability(event_id)
+    if bitmap is None:
+        return None
+    with connection() as conn:
+        held = _live_held_seats(conn.cursor(), event_id)
+    bitmap.mark(held, taken=True)
+    return bitmap
+
+
+def list_unavailable_seats(event_id: int) -> Set[str]:
+    bitmap = _blocked_seats(event_id)
+    return bitmap.taken_ids() if bitmap is not None else set()
 
-    conn.commit()
-    conn.close()
+
+def find_best_seats(event_id: int, count: int, zone_id: Optional[str] = None) -> List[str]:
+    if count <= 0:
+        return []
+
+    ev = event_service.get_event(event_id)
+    if not ev:
+        return []
+
+    index = hall_service.get_seat_index(ev["hall_id"])
+    blocked = _blocked_seats(event_id)
+    if index is None or blocked is None:
+        return []
+
+    zid = str(zone_id).strip() if zone_id else None
+    return index.best_block(int(count), blocked, zid)
+
+
+def hold_seats(event_id: int, seats: List[str], ttl: float = HOLD_TTL_SECONDS) -> int:
+    normalized_seats = list(dict.fromkeys(_normalize_seats(seats)))
+    if not normalized_seats:
+        raise ValueError("Trebuie sa selectati cel putin un loc.")
+
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE;")
+        try:
+            _purge_expired_holds(cur, event_id)
+
+            conflict = _unavailable_among(cur, event_id, normalized_seats)
+            if conflict:
+                raise ValueError(
+                    f"Urmatoarele locuri nu mai sunt disponibile: {', '.join(sorted(conflict))}"
+                )
+
+            cur.execute(
+                "INSERT INTO seat_holds (event_id, expires_at) VALUES (?, ?);",
+                (event_id, time.time() + float(ttl)),
+            )
+            hold_id = cur.lastrowid
+            cur.executemany(
+                "INSERT INTO held_seats (event_id, seat_id, hold_id) VALUES (?, ?, ?);",
+                [(event_id, s, hold_id) for s in normalized_seats],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return hold_id
+
+
+def release_hold(hold_id: int) -> None:
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM seat_holds WHERE id = ?;", (hold_id,))
+        conn.commit()
+
+
+def _hold_seat_list(cur: sqlite3.Cursor, hold_id: int) -> Optional[Tuple[int, float, List[str]]]:
+    cur.execute("SELECT event_id, expires_at FROM seat_holds WHERE id = ?;", (hold_id,))
+    row = cur.fetchone()
+    if row is None:
+        return None
+    cur.execute("SELECT seat_id FROM held_seats WHERE hold_id = ? ORDER BY rowid;", (hold_id,))
+    return row[0], row[1], [r[0] for r in cur.fetchall()]
+
+
+def confirm_hold(hold_id: int, name: str, email: str) -> int:
+    with connection() as conn:
+        cur = conn.cursor()
+        hold = _hold_seat_list(cur, hold_id)
+
+    if hold is None or hold[1] <= time.time():
+        raise ValueError("Locurile nu mai sunt retinute. Selectati din nou locurile.")
+
+    event_id, _, seats = hold
+    total = preview_total(event_id, seats)
+
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE;")
+        try:
+            # retinerea poate expira sau poate fi eliberata intre timp
+            cur.execute(
+                "DELETE FROM seat_holds WHERE id = ? AND expires_at > ?;",
+                (hold_id, time.time()),
+            )
+            if cur.rowcount == 0:
+                raise ValueError("Locurile nu mai sunt retinute. Selectati din nou locurile.")
+
+            booking_id = _insert_booking(cur, event_id, name, email, seats, total)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return booking_id
+
+
+def create_booking(event_id: int, name: str, email: str, seats: List[str]) -> int:
+    normalized_seats = list(dict.fromkeys(_normalize_seats(seats)))
+    if not normalized_seats:
+        raise ValueError("Trebuie sa selectati cel putin un loc.")
+
+    total = preview_total(event_id, normalized_seats)
+
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE;")
+        try:
+            _purge_expired_holds(cur, event_id)
+
+            conflict = _unavailable_among(cur, event_id, normalized_seats)
+            if conflict:
+                raise ValueError(
+                    f"Urmatoarele locuri sunt deja rezervate: {', '.join(sorted(conflict))}"
+                )
+
+            booking_id = _insert_booking(cur, event_id, name, email, normalized_seats, total)
+            conn.commit()
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            raise ValueError("Unele dintre locurile selectate sunt deja rezervate.")
+        except Exception:
+            conn.rollback()
+            raise
+
+    return booking_id
+
+
+def cancel_booking(booking_id: int) -> None:
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE;")
+        try:
+            cur.execute("SELECT event_id FROM bookings WHERE id = ?;", (booking_id,))
+            row = cur.fetchone()
+            if row is None:
+                raise ValueError("Rezervarea nu exista.")
+            event_id = row[0]
+
+            cur.execute("SELECT seat_id FROM booking_seats WHERE booking_id = ?;", (booking_id,))
+            seats = [r[0] for r in cur.fetchall()]
+
+            cur.execute("DELETE FROM bookings WHERE id = ?;", (booking_id,))
+            availability_service.record_seats(cur, event_id, seats, taken=False)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
@@ -1,63 +1,9 @@
-from typing import List, Dict, Optional
-from core.db import get_connection
+import re
+from typing import Any, List, Dict, Optional, Tuple
+from core.db import connection
 
 
-def list_events() -> List[Dict]:
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT e.id, e.title, e.description, e.date, e.time,
-               h.id AS hall_id, h.name AS hall_name
-        FROM events e
-        JOIN halls h ON e.hall_id = h.id
-        ORDER BY e.date, e.time, e.title;
-        """
-    )
-
-    rows = cur.fetchall()
-    conn.close()
-
-    events = []
-    for row in rows:
-        event_id, title, description, date, time, hall_id, hall_name = row
-        events.append(
-            {
-                "id": event_id,
-                "title": title,
-                "description": description or "",
-                "date": date,
-                "time": time,
-                "hall_id": hall_id,
-                "hall_name": hall_name,
-            }
-        )
-
-    return events
-
-
-def get_event(event_id: int) -> Optional[Dict]:
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT e.id, e.title, e.description, e.date, e.time,
-               e.hall_id, h.name AS hall_name
-        FROM events e
-        JOIN halls h ON e.hall_id = h.id
-        WHERE e.id = ?;
-        """,
-        (event_id,),
-    )
-
-    row = cur.fetchone()
-    conn.close()
-
-    if row is None:
-        return None
-
+def _event_row_to_dict(row) -> Dict:
     event_id, title, description, date, time, hall_id, hall_name = row
     return {
         "id": event_id,
@@ -70,6 +16,133 @@ def get_event(event_id: int) -> Optional[Dict]:
     }
 
 
+def list_events() -> List[Dict]:
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute(
+            """
+            SELECT e.id, e.title, e.description, e.date, e.time,
+                   h.id AS hall_id, h.name AS hall_name
+            FROM events e
+            JOIN halls h ON e.hall_id = h.id
+            ORDER BY e.date, e.time, e.title;
+            """
+        )
+
+        rows = cur.fetchall()
+
+    return [_event_row_to_dict(r) for r in rows]
+
+
+def page_cursor(event: Dict) -> Tuple[str, str, str, int]:
+    return event["date"], event["time"], event["title"], event["id"]
+
+
+def list_events_page(
+    after: Optional[Tuple[str, str, str, int]] = None,
+    limit: int = 200,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict]:
+    # paginare keyset dupa (date, time, title, id), ordinea din list_events; idx_events_date_time
+    # are rowid-ul implicit la final. Costul nu depinde de cate pagini au fost deja citite
+    filters = filters or {}
+    where = []
+    params: List[Any] = []
+
+    if after is not None:
+        where.append("(e.date, e.time, e.title, e.id) > (?, ?, ?, ?)")
+        params.extend(after)
+    if filters.get("hall_id") is not None:
+        where.append("e.hall_id = ?")
+        params.append(filters["hall_id"])
+    if filters.get("date_from"):
+        where.append("e.date >= ?")
+        params.append(filters["date_from"])
+    if filters.get("date_to"):
+        where.append("e.date <= ?")
+        params.append(filters["date_to"])
+
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+    params.append(int(limit))
+
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT e.id, e.title, e.description, e.date, e.time,
+                   h.id AS hall_id, h.name AS hall_name
+            FROM events e
+            JOIN halls h ON e.hall_id = h.id
+            {where_sql}
+            ORDER BY e.date, e.time, e.title, e.id
+            LIMIT ?;
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+
+    return [_event_row_to_dict(r) for r in rows]
+
+
+_SEARCH_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_query(query: str) -> str:
+    # fiecare cuvant devine un prefix intre ghilimele, deci operatorii FTS5 din input nu conteaza
+    tokens = _SEARCH_TOKEN_RE.findall(query or "")
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def search_events(query: str, limit: int = 200) -> List[Dict]:
+    match = _fts_query(query)
+    if not match:
+        return []
+
+    with connection() as conn:
+        cur = conn.cursor()
+        # bm25: potrivirile in titlu conteaza mai mult decat cele din sala sau descriere
+        cur.execute(
+            """
+            SELECT e.id, e.title, e.description, e.date, e.time,
+                   h.id AS hall_id, h.name AS hall_name
+            FROM events_fts f
+            JOIN events e ON e.id = f.rowid
+            JOIN halls h ON e.hall_id = h.id
+            WHERE events_fts MATCH ?
+            ORDER BY bm25(events_fts, 10.0, 1.0, 4.0), e.date, e.time, e.id
+            LIMIT ?;
+            """,
+            (match, int(limit)),
+        )
+        rows = cur.fetchall()
+
+    return [_event_row_to_dict(r) for r in rows]
+
+
+def get_event(event_id: int) -> Optional[Dict]:
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute(
+            """
+            SELECT e.id, e.title, e.description, e.date, e.time,
+                   e.hall_id, h.name AS hall_name
+            FROM events e
+            JOIN halls h ON e.hall_id = h.id
+            WHERE e.id = ?;
+            """,
+            (event_id,),
+        )
+
+        row = cur.fetchone()
+
+    if row is None:
+        return None
+
+    return _event_row_to_dict(row)
+
+
 def create_event(
     title: str,
     description: str,
@@ -77,19 +150,18 @@ def create_event(
     time: str,
     hall_id: int,
 ) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        INSERT INTO events (title, description, date, time, hall_id)
-        VALUES (?, ?, ?, ?, ?);
-        """,
-        (title, description, date, time, hall_id),
-    )
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute(
+            """
+            INSERT INTO events (title, description, date, time, hall_id)
+            VALUES (?, ?, ?, ?, ?);
+            """,
+            (title, description, date, time, hall_id),
+        )
 
-    conn.commit()
-    conn.close()
+        conn.commit()
 
 
 def update_event(
@@ -100,26 +172,24 @@ def update_event(
     time: str,
     hall_id: int,
 ) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        UPDATE events
-        SET title = ?, description = ?, date = ?, time = ?, hall_id = ?
-        WHERE id = ?;
-        """,
-        (title, description, date, time, hall_id, event_id),
-    )
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute(
+            """
+            UPDATE events
+            SET title = ?, description = ?, date = ?, time = ?, hall_id = ?
+            WHERE id = ?;
+            """,
+            (title, description, date, time, hall_id, event_id),
+        )
 
-    conn.commit()
-    conn.close()
+        conn.commit()
 
 
 def delete_event(event_id: int) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
+    with connection() as conn:
+        cur = conn.cursor()
 
-    cur.execute("DELETE FROM events WHERE id = ?;", (event_id,))
-    conn.commit()
-    conn.close()
\ No newline at end of file
+        cur.execute("DELETE FROM events WHERE id = ?;", (event_id,))
+        conn.commit()
\ No newline at end of file
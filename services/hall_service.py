@@ -1,10 +1,24 @@
+import hashlib
 import json
-from typing import List, Dict, Optional, Any
-from core.db import get_connection
+import math
+import re
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Dict, Optional, Any, Tuple
+from core.db import connection
+from core.seat_labels import row_label
 
 LOGICAL_WIDTH = 1600
 LOGICAL_HEIGHT = 900
 
+LAYOUT_CACHE_SIZE = 32
+
+_layout_cache: "OrderedDict[Tuple[int, str], Dict[str, Any]]" = OrderedDict()
+_layout_cache_lock = threading.Lock()
+_layout_cache_stats = {"hits": 0, "misses": 0}
+
 
 def _default_zones() -> List[Dict]:
     return [
@@ -68,7 +82,7 @@ def _grid_to_items(rows: int, cols: int, zone_id: str = "Z1") -> List[Dict]:
     gap = 5
     items: List[Dict] = []
     for r in range(rows):
-        row_char = chr(ord("A") + r)
+        row_char = row_label(r)
         for c in range(cols):
             items.append(
                 {
@@ -137,83 +151,755 @@ def _parse_layout_json(layout_json: str) -> Dict[str, Any]:
 
 
 
-def init_default_halls() -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("SELECT COUNT(*) FROM halls;")
-    count = cur.fetchone()[0]
-
-    if count == 0:
-        halls = [
-            {"name": "Sala Mare", "rows": 10, "cols": 12},
-            {"name": "Sala Mică", "rows": 5, "cols": 8},
-            {"name": "Amfiteatru", "rows": 8, "cols": 15},
-        ]
-
-        zones = _default_zones()
-        for h in halls:
-            items = _grid_to_items(int(h["rows"]), int(h["cols"]), "Z1")
-            payload = {"items": items, "zones": zones}
+class CompactLayout:
+    # layout-ul ca array-uri pe coloane: ~10x mai putina memorie decat un dict per item.
+    # Folosit in cache-ul de layout-uri si de get_hall(compact=True); e partajat, deci read-only.
+    # id-urile stau intr-un singur string, separate prin "\0", cu pozitiile de sfarsit in _id_end
+    __slots__ = (
+        "_id_blob", "_id_end", "types", "type_names", "x", "y", "w", "h", "rotation",
+        "zone", "zone_ids", "parent", "parent_ids", "_labels", "_extras", "seat_count",
+    )
+
+    _KNOWN_KEYS = frozenset(("id", "type", "x", "y", "w", "h", "rotation", "parent_id", "zone_id", "label"))
+
+    def __init__(self, items: List[Dict]) -> None:
+        ids: List[str] = []
+        self._id_end = array("I")
+        self.types = array("B")
+        self.type_names: List[str] = []
+        self.x = array("d")
+        self.y = array("d")
+        self.w = array("d")
+        self.h = array("d")
+        self.rotation = array("d")
+        # zone 0 = fara zona (elementele care nu sunt locuri); parent -1 = fara parinte
+        self.zone = array("H")
+        self.zone_ids: List[Optional[str]] = [None]
+        self.parent = array("i")
+        self.parent_ids: List[str] = []
+        self._labels: Dict[int, str] = {}
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self.seat_count = 0
+
+        type_pos: Dict[str, int] = {}
+        zone_pos: Dict[Optional[str], int] = {None: 0}
+        parent_pos: Dict[str, int] = {}
+        end = 0
+
+        def num(it: Dict, k: str, d: float) -> float:
+            try:
+                return float(it.get(k, d) or 0)
+            except Exception:
+                return d
+
+        for i, it in enumerate(items):
+            sid = str(it["id"])
+            ids.append(sid)
+            end += len(sid) + 1
+            self._id_end.append(end - 1)
+
+            t = str(it["type"])
+            if t not in type_pos:
+                type_pos[t] = len(self.type_names)
+                self.type_names.append(t)
+            self.types.append(type_pos[t])
+
+            self.x.append(num(it, "x", 0.0))
+            self.y.append(num(it, "y", 0.0))
+            self.w.append(num(it, "w", 30.0))
+            self.h.append(num(it, "h", 30.0))
+            self.rotation.append(num(it, "rotation", 0.0))
+
+            zid = str(it.get("zone_id") or "").strip() or None
+            if t == "seat":
+                self.seat_count += 1
+                zid = zid or HallPricing.DEFAULT_ZONE
+            if zid not in zone_pos:
+                zone_pos[zid] = len(self.zone_ids)
+                self.zone_ids.append(zid)
+            self.zone.append(zone_pos[zid])
+
+            pid = it.get("parent_id")
+            if pid is None or pid == "":
+                self.parent.append(-1)
+            else:
+                pid = str(pid)
+                if pid not in parent_pos:
+                    parent_pos[pid] = len(self.parent_ids)
+                    self.parent_ids.append(pid)
+                self.parent.append(parent_pos[pid])
+
+            label = it.get("label")
+            if label:
+                self._labels[i] = label
+            extra = {k: v for k, v in it.items() if k not in self._KNOWN_KEYS}
+            if extra:
+                self._extras[i] = extra
+
+        self._id_blob = "\0".join(ids)
+
+    def __len__(self) -> int:
+        return len(self._id_end)
+
+    def id_at(self, i: int) -> str:
+        start = self._id_end[i - 1] + 1 if i else 0
+        return self._id_blob[start:self._id_end[i]]
+
+    def type_at(self, i: int) -> str:
+        return self.type_names[self.types[i]]
+
+    def item(self, i: int) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            "id": self.id_at(i), "type": self.type_at(i),
+            "x": self.x[i], "y": self.y[i], "w": self.w[i], "h": self.h[i], "rotation": self.rotation[i],
+        }
+        p = self.parent[i]
+        if p >= 0:
+            d["parent_id"] = self.parent_ids[p]
+        zid = self.zone_ids[self.zone[i]]
+        if zid is not None:
+            d["zone_id"] = zid
+        label = self._labels.get(i)
+        if label:
+            d["label"] = label
+        extra = self._extras.get(i)
+        if extra:
+            d.update(extra)
+        return d
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # dict-uri noi la fiecare parcurgere; apelantii le pot modifica
+        return (self.item(i) for i in range(len(self)))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+
+class HallPricing:
+    DEFAULT_ZONE = "Z1"
+
+    def __init__(self, items, zones) -> None:
+        self.zones: Dict[str, Dict[str, Any]] = {}
+        for z in zones:
+            zid = str(z.get("id") or "").strip()
+            if not zid:
+                continue
+            try:
+                price = float(z.get("price", 0))
+            except Exception:
+                price = 0.0
+            self.zones[zid] = {
+                "name": str(z.get("name") or zid),
+                "price": price,
+                "color": str(z.get("color") or "#DDDDDD"),
+            }
+
+        self._seat_zone: Dict[str, str] = {}
+        for it in items:
+            if it.get("type") != "seat":
+                continue
+            sid = str(it.get("id") or "").strip().upper()
+            if sid:
+                self._seat_zone[sid] = str(it.get("zone_id") or "").strip() or self.DEFAULT_ZONE
+
+    def zone_of(self, seat_id: str) -> str:
+        return self._seat_zone.get(str(seat_id).strip().upper(), self.DEFAULT_ZONE)
+
+    def price_of(self, seat_id: str) -> float:
+        zone = self.zones.get(self.zone_of(seat_id))
+        return zone["price"] if zone else 0.0
+
+    def price_many(self, seat_ids: List[str]) -> Tuple[float, Dict[str, Dict[str, Any]]]:
+        counts: Dict[str, int] = {}
+        for sid in seat_ids:
+            zid = self.zone_of(sid)
+            counts[zid] = counts.get(zid, 0) + 1
+
+        total = 0.0
+        breakdown: Dict[str, Dict[str, Any]] = {}
+        for zid in sorted(counts):
+            meta = self.zones.get(zid, {"name": zid, "price": 0.0, "color": "#DDDDDD"})
+            subtotal = meta["price"] * counts[zid]
+            total += subtotal
+            breakdown[zid] = {
+                "name": meta["name"],
+                "color": meta["color"],
+                "price": meta["price"],
+                "count": counts[zid],
+                "subtotal": subtotal,
+            }
+        return float(total), breakdown
+
+
+_SEAT_NUMBER_RE = re.compile(r"^(.*?)(\d+)$")
+FOCAL_DECOR_TYPES = ("decor_stage", "decor_screen")
+
+
+def _split_seat_id(seat_id: str) -> Tuple[str, int]:
+    m = _SEAT_NUMBER_RE.match(seat_id)
+    if not m:
+        return seat_id, 0
+    return m.group(1), int(m.group(2))
+
+
+class SeatRun:
+    def __init__(self, seat_ids: List[str], zones: List[str], costs: List[float], circular: bool) -> None:
+        self.seat_ids = seat_ids
+        self.zones = zones
+        self.costs = costs
+        self.circular = circular
+        self.min_cost = min(costs) if costs else math.inf
+
+
+class SeatIndex:
+    def __init__(self, items) -> None:
+        seats = []
+        focal = []
+        min_x = min_y = math.inf
+        max_x = -math.inf
+        for it in items:
+            try:
+                x = float(it.get("x", 0)) + float(it.get("w", 30)) / 2
+                y = float(it.get("y", 0)) + float(it.get("h", 30)) / 2
+                size = max(float(it.get("w", 30)), float(it.get("h", 30)))
+            except Exception:
+                continue
+            t = it.get("type")
+            if t in FOCAL_DECOR_TYPES:
+                focal.append((x, y))
+            elif t == "seat":
+                sid = str(it.get("id") or "").strip().upper()
+                if not sid:
+                    continue
+                zone = str(it.get("zone_id") or "").strip() or HallPricing.DEFAULT_ZONE
+                seats.append((sid, x, y, size, zone, it.get("parent_id")))
+                min_x, max_x, min_y = min(min_x, x), max(max_x, x), min(min_y, y)
+
+        if not focal and seats:
+            # fara scena / ecran: consideram "fata" salii marginea de sus, pe centru
+            focal.append(((min_x + max_x) / 2, min_y - 100))
+
+        def cost(x: float, y: float) -> float:
+            return min(math.hypot(x - fx, y - fy) for fx, fy in focal)
+
+        # randurile se deduc din prefixul id-ului (A12 -> A), mesele din parent_id
+        groups: Dict[Tuple[bool, str], List[Tuple[int, str, float, float, float, str]]] = {}
+        for sid, x, y, size, zone, parent in seats:
+            if parent:
+                key = (True, str(parent).strip().upper())
+                _, num = _split_seat_id(sid)
+            else:
+                prefix, num = _split_seat_id(sid)
+                key = (False, prefix)
+            groups.setdefault(key, []).append((num, sid, x, y, size, zone))
+
+        self.runs: List[SeatRun] = []
+        for (is_table, _), members in groups.items():
+            members.sort(key=lambda m: (m[0], m[1]))
+            if is_table:
+                self.runs.append(SeatRun(
+                    [m[1] for m in members], [m[5] for m in members],
+                    [cost(m[2], m[3]) for m in members], circular=True,
+                ))
+                continue
+
+            # taiem randul acolo unde doua scaune consecutive nu sunt vecine fizic (culoar)
+            current: List[Tuple[int, str, float, float, float, str]] = []
+            for m in members:
+                if current:
+                    prev = current[-1]
+                    if math.hypot(m[2] - prev[2], m[3] - prev[3]) > 1.6 * max(m[4], prev[4]):
+                        self._add_run(current, cost)
+                        current = []
+                current.append(m)
+            if current:
+                self._add_run(current, cost)
+
+        # ordonate dupa cel mai bun loc posibil, ca sa putem opri cautarea devreme
+        self.runs.sort(key=lambda r: r.min_cost)
+        self.seat_count = len(seats)
+
+    def _add_run(self, members, cost) -> None:
+        self.runs.append(SeatRun(
+            [m[1] for m in members], [m[5] for m in members],
+            [cost(m[2], m[3]) for m in members], circular=False,
+        ))
+
+    def best_block(self, count: int, unavailable, zone_id: Optional[str] = None) -> List[str]:
+        if count <= 0:
+            return []
+        best: Optional[Tuple[float, List[str]]] = None
+        for run in self.runs:
+            if best is not None and run.min_cost >= best[0]:
+                break
+            n = len(run.seat_ids)
+            if n < count:
+                continue
+            ok = [
+                run.seat_ids[i] not in unavailable and (zone_id is None or run.zones[i] == zone_id)
+                for i in range(n)
+            ]
+            starts = range(n) if run.circular and n > count else range(n - count + 1)
+            window = 0.0
+            bad = 0
+            for k in range(count):
+                window += run.costs[k % n]
+                bad += not ok[k % n]
+            for start in starts:
+                if start > 0:
+                    out_i = start - 1
+                    in_i = (start + count - 1) % n
+                    window += run.costs[in_i] - run.costs[out_i]
+                    bad += (not ok[in_i]) - (not ok[out_i])
+                if bad:
+                    continue
+                score = window / count
+                if not run.circular:
+                    # nu lasa un singur loc liber izolat la capetele blocului
+                    for edge, beyond in ((start - 1, start - 2), (start + count, start + count + 1)):
+                        if 0 <= edge < n and ok[edge] and not (0 <= beyond < n and ok[beyond]):
+                            score += 1000.0
+                if best is None or score < best[0]:
+                    best = (score, [run.seat_ids[(start + k) % n] for k in range(count)])
+        return best[1] if best else []
+
+
+class SeatOrdinals:
+    def __init__(self, items, digest: str) -> None:
+        self.digest = digest
+        self.index: Dict[str, int] = {}
+        for it in items:
+            if it.get("type") != "seat":
+                continue
+            sid = str(it.get("id") or "").strip().upper()
+            if sid and sid not in self.index:
+                self.index[sid] = len(self.index)
+        self.seat_ids: Tuple[str, ...] = tuple(self.index)
+
+    def __len__(self) -> int:
+        return len(self.seat_ids)
+
+    def ordinal(self, seat_id: str) -> Optional[int]:
+        return self.index.get(str(seat_id).strip().upper())
+
+
+def _layout_digest(layout_json: str) -> str:
+    return hashlib.blake2b((layout_json or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _peek_layout(key: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+    with _layout_cache_lock:
+        cached = _layout_cache.get(key)
+        if cached is not None:
+            _layout_cache.move_to_end(key)
+            _layout_cache_stats["hits"] += 1
+        return cached
+
+
+def _cached_layout(hall_id: int, version: int, layout_json: str) -> Dict[str, Any]:
+    # elementele sunt partajate intre apelanti, deci le tinem read-only;
+    # fiecare scriere creste layout_version, deci o cheie veche nu mai e ceruta niciodata
+    key = (int(hall_id), int(version))
+    cached = _peek_layout(key)
+    if cached is not None:
+        return cached
+    with _layout_cache_lock:
+        _layout_cache_stats["misses"] += 1
+
+    parsed = _parse_layout_json(layout_json)
+    cached = {
+        "digest": _layout_digest(layout_json),
+        "items": CompactLayout(parsed["items"]),
+        "zones": tuple(parsed["zones"]),
+    }
+
+    with _layout_cache_lock:
+        _layout_cache[key] = cached
+        _layout_cache.move_to_end(key)
+        while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    return cached
+
+
+def _cached_layouts(hall_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    # intai doar versiunile; layout_json (textul mare) se citeste numai pentru ce lipseste din cache
+    ids = list(dict.fromkeys(int(h) for h in hall_ids))
+    if not ids:
+        return {}
+
+    placeholders = ", ".join("?" for _ in ids)
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"SELECT id, layout_version FROM halls WHERE id IN ({placeholders});", ids)
+        versions = cur.fetchall()
+
+        out: Dict[int, Dict[str, Any]] = {}
+        missing = []
+        for hid, version in versions:
+            cached = _peek_layout((hid, version))
+            if cached is None:
+                missing.append(hid)
+            else:
+                out[hid] = cached
+
+        if missing:
+            placeholders = ", ".join("?" for _ in missing)
             cur.execute(
-                "INSERT INTO halls (name, layout_json) VALUES (?, ?);",
-                (h["name"], json.dumps(payload)),
+                f"SELECT id, layout_version, layout_json FROM halls WHERE id IN ({placeholders});",
+                missing,
             )
-        conn.commit()
+            for hid, version, layout_json in cur.fetchall():
+                out[hid] = _cached_layout(hid, version, layout_json)
+    return out
 
-    conn.close()
 
+def _invalidate_layout(hall_id: int) -> None:
+    with _layout_cache_lock:
+        for key in [k for k in _layout_cache if k[0] == int(hall_id)]:
+            del _layout_cache[key]
 
-def get_all_halls() -> List[Dict]:
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("SELECT id, name, layout_json FROM halls ORDER BY name;")
-    rows = cur.fetchall()
-    conn.close()
-
-    halls: List[Dict] = []
-    for hall_id, name, layout_json in rows:
-        parsed = _parse_layout_json(layout_json)
-        halls.append(
-            {
-                "id": hall_id,
-                "name": name,
-                "layout": parsed["items"],
-                "zones": parsed["zones"],
-                "layout_json": layout_json,
-            }
-        )
 
-    return halls
+# hall_items e o oglinda a items din layout_json; e folosita doar cand items_version = layout_version,
+# altfel (baze vechi, formatul rows/cols) se citeste din JSON
+_SYNC_ITEMS_SQL = """
+INSERT INTO hall_items (hall_id, item_id, type, x, y, w, h, rotation, parent_id, zone_id)
+SELECT h.id,
+       json_extract(it.value, '$.id'),
+       json_extract(it.value, '$.type'),
+       COALESCE(json_extract(it.value, '$.x'), 0),
+       COALESCE(json_extract(it.value, '$.y'), 0),
+       COALESCE(json_extract(it.value, '$.w'), 30),
+       COALESCE(json_extract(it.value, '$.h'), 30),
+       COALESCE(json_extract(it.value, '$.rotation'), 0),
+       json_extract(it.value, '$.parent_id'),
+       CASE WHEN json_extract(it.value, '$.type') = 'seat'
+            THEN COALESCE(NULLIF(trim(json_extract(it.value, '$.zone_id')), ''), 'Z1') END
+FROM halls h, json_each(h.layout_json, '$.items') it
+WHERE h.id = ?
+  AND json_type(it.value) = 'object'
+  AND json_extract(it.value, '$.id') IS NOT NULL
+  AND json_extract(it.value, '$.type') IS NOT NULL;
+"""
+
+_INSERT_ITEM_SQL = """
+INSERT INTO hall_items (hall_id, item_id, type, x, y, w, h, rotation, parent_id, zone_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+"""
 
 
-def get_hall(hall_id: int) -> Optional[Dict]:
-    conn = get_connection()
-    cur = conn.cursor()
+def _item_row(hall_id: int, it: Dict) -> Tuple:
+    def num(k: str, d: float) -> float:
+        try:
+            return float(it.get(k, d) or 0)
+        except Exception:
+            return d
 
-    cur.execute(
-        "SELECT id, name, layout_json FROM halls WHERE id = ?;",
-        (hall_id,),
+    seat = it.get("type") == "seat"
+    return (
+        hall_id, str(it["id"]), str(it["type"]), num("x", 0.0), num("y", 0.0),
+        num("w", 30.0), num("h", 30.0), num("rotation", 0.0), it.get("parent_id"),
+        (str(it.get("zone_id") or "").strip() or HallPricing.DEFAULT_ZONE) if seat else None,
     )
-    row = cur.fetchone()
-    conn.close()
 
-    if row is None:
-        return None
 
-    hid, name, layout_json = row
-    parsed = _parse_layout_json(layout_json)
+def _sync_items(cur: sqlite3.Cursor, hall_id: int) -> None:
+    # reconstruieste oglinda din layout_json-ul curent (deja in formatul cu items)
+    cur.execute("DELETE FROM hall_items WHERE hall_id = ?;", (hall_id,))
+    cur.execute(_SYNC_ITEMS_SQL, (hall_id,))
+    cur.execute("UPDATE halls SET items_version = layout_version WHERE id = ?;", (hall_id,))
+
+
+def _patch_items(cur: sqlite3.Cursor, hall_id: int, ops: List[Dict]) -> None:
+    # aceeasi semantica precum patch-ul JSON: stergeri, apoi modificari, apoi adaugari
+    cur.executemany(
+        "DELETE FROM hall_items WHERE hall_id = ? AND item_id = ?;",
+        [(hall_id, str(o["id"])) for o in ops if o["op"] == "remove"],
+    )
+    cur.executemany(
+        "UPDATE hall_items SET x = ?, y = ?, rotation = ? WHERE hall_id = ? AND item_id = ?;",
+        [(o["x"], o["y"], o["rotation"], hall_id, str(o["id"])) for o in ops if o["op"] == "move"],
+    )
+    cur.executemany(
+        "UPDATE hall_items SET zone_id = ? WHERE hall_id = ? AND item_id = ?;",
+        [(o["zone_id"], hall_id, str(o["id"])) for o in ops if o["op"] == "rezone"],
+    )
+    cur.executemany(_INSERT_ITEM_SQL, [_item_row(hall_id, o["item"]) for o in ops if o["op"] == "add"])
+    cur.execute("UPDATE halls SET items_version = layout_version WHERE id = ?;", (hall_id,))
+
+
+# NULL cand hall_items nu e sincronizat cu layout-ul; atunci se numara din JSON
+_SEAT_COUNT_COLUMN = """
+    CASE WHEN h.items_version = h.layout_version
+         THEN (SELECT COUNT(*) FROM hall_items i WHERE i.hall_id = h.id AND i.type = 'seat') END
+"""
+
+_HALL_COLUMNS = f"h.id, h.name, h.layout_version, h.layout_json, {_SEAT_COUNT_COLUMN}"
+
 
+def _hall_dict(
+    hall_id: int, name: str, version: int, layout_json: str, seat_count: Optional[int], compact: bool = False
+) -> Dict:
+    parsed = _cached_layout(hall_id, version, layout_json)
+    items = parsed["items"]
+    if seat_count is None:
+        seat_count = items.seat_count
     return {
-        "id": hid,
+        "id": hall_id,
         "name": name,
-        "layout": parsed["items"],
-        "zones": parsed["zones"],
+        # compact: CompactLayout-ul din cache (partajat, doar citire); altfel dict-uri noi
+        "layout": items if compact else items.to_dicts(),
+        "zones": [dict(z) for z in parsed["zones"]],
         "layout_json": layout_json,
+        "layout_version": version,
+        "seat_count": seat_count,
     }
 
 
+def layout_cache_stats() -> Dict[str, int]:
+    with _layout_cache_lock:
+        return {
+            "hits": _layout_cache_stats["hits"],
+            "misses": _layout_cache_stats["misses"],
+            "size": len(_layout_cache),
+        }
+
+
+def clear_layout_cache() -> None:
+    with _layout_cache_lock:
+        _layout_cache.clear()
+        _layout_cache_stats["hits"] = 0
+        _layout_cache_stats["misses"] = 0
+
+
+def init_default_halls() -> None:
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute("SELECT COUNT(*) FROM halls;")
+        count = cur.fetchone()[0]
+
+        if count == 0:
+            halls = [
+                {"name": "Sala Mare", "rows": 10, "cols": 12},
+                {"name": "Sala Mică", "rows": 5, "cols": 8},
+                {"name": "Amfiteatru", "rows": 8, "cols": 15},
+            ]
+
+            zones = _default_zones()
+            for h in halls:
+                items = _grid_to_items(int(h["rows"]), int(h["cols"]), "Z1")
+                payload = {"items": items, "zones": zones}
+                cur.execute(
+                    "INSERT INTO halls (name, layout_json) VALUES (?, ?);",
+                    (h["name"], json.dumps(payload)),
+                )
+                _sync_items(cur, cur.lastrowid)
+            conn.commit()
+
+
+def get_all_halls() -> List[Dict]:
+    # doar rezumatul pentru liste si combo-uri; layout-ul complet vine din get_hall
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute(f"SELECT h.id, h.name, h.layout_version, {_SEAT_COUNT_COLUMN} FROM halls h ORDER BY h.name;")
+        rows = cur.fetchall()
+
+    stale = count_seats([hid for hid, _, _, n in rows if n is None])
+    return [
+        {"id": hid, "name": name, "layout_version": version, "seat_count": stale.get(hid, 0) if n is None else n}
+        for hid, name, version, n in rows
+    ]
+
+
+def get_hall(hall_id: int, compact: bool = False) -> Optional[Dict]:
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute(
+            f"SELECT {_HALL_COLUMNS} FROM halls h WHERE h.id = ?;",
+            (hall_id,),
+        )
+        row = cur.fetchone()
+
+    if row is None:
+        return None
+
+    return _hall_dict(*row, compact=compact)
+
+
+def _layout_artifact(hall_id: int, name: str, build: Callable[[Dict[str, Any]], Any]) -> Optional[Any]:
+    cached = _cached_layouts([hall_id]).get(int(hall_id))
+    if cached is None:
+        return None
+
+    artifact = cached.get(name)
+    if artifact is None:
+        # se construieste o singura data pentru fiecare versiune a layout-ului
+        artifact = build(cached)
+        cached[name] = artifact
+    return artifact
+
+
+def get_pricing(hall_id: int) -> Optional[HallPricing]:
+    return _layout_artifact(hall_id, "pricing", lambda c: HallPricing(c["items"], c["zones"]))
+
+
+def get_seat_index(hall_id: int) -> Optional[SeatIndex]:
+    return _layout_artifact(hall_id, "seat_index", lambda c: SeatIndex(c["items"]))
+
+
+def get_seat_ordinals(hall_id: int) -> Optional[SeatOrdinals]:
+    return _layout_artifact(hall_id, "seat_ordinals", lambda c: SeatOrdinals(c["items"], c["digest"]))
+
+
+def count_seats(hall_ids: List[int]) -> Dict[int, int]:
+    # agregat pe indexul (hall_id, type, zone_id); salile nesincronizate se numara din JSON
+    ids = list(dict.fromkeys(int(h) for h in hall_ids))
+    if not ids:
+        return {}
+
+    placeholders = ", ".join("?" for _ in ids)
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT h.id, h.items_version = h.layout_version,
+                   (SELECT COUNT(*) FROM hall_items i WHERE i.hall_id = h.id AND i.type = 'seat')
+            FROM halls h
+            WHERE h.id IN ({placeholders});
+            """,
+            ids,
+        )
+        rows = cur.fetchall()
+
+    counts = {hid: n for hid, synced, n in rows if synced}
+    stale = [hid for hid, synced, _ in rows if not synced]
+    for hid, cached in _cached_layouts(stale).items():
+        counts[hid] = cached["items"].seat_count
+    return counts
+
+
+def count_seats_by_zone(hall_id: int) -> Dict[str, int]:
+    with connection() as conn:
+        cur = conn.cursor()
+        if _items_synced(cur, hall_id):
+            cur.execute(
+                """
+                SELECT zone_id, COUNT(*) FROM hall_items
+                WHERE hall_id = ? AND type = 'seat'
+                GROUP BY zone_id;
+                """,
+                (hall_id,),
+            )
+            return dict(cur.fetchall())
+
+    counts: Dict[str, int] = {}
+    cached = _cached_layouts([hall_id]).get(int(hall_id))
+    for it in cached["items"] if cached else ():
+        if it.get("type") == "seat":
+            zid = str(it.get("zone_id") or "").strip() or HallPricing.DEFAULT_ZONE
+            counts[zid] = counts.get(zid, 0) + 1
+    return counts
+
+
+def _items_synced(cur: sqlite3.Cursor, hall_id: int) -> bool:
+    cur.execute("SELECT items_version = layout_version FROM halls WHERE id = ?;", (hall_id,))
+    row = cur.fetchone()
+    return bool(row and row[0])
+
+
+def _seats_in_box(hall_id: int, x0: float, y0: float, x1: float, y1: float) -> List[Tuple[str, float, float]]:
+    # (id, centru x, centru y) pentru locurile cu centrul in dreptunghi
+    with connection() as conn:
+        cur = conn.cursor()
+        if _items_synced(cur, hall_id):
+            cur.execute(
+                """
+                SELECT i.item_id, i.x + i.w / 2 AS cx, i.y + i.h / 2 AS cy
+                FROM hall_items_rtree r
+                JOIN hall_items i ON i.id = r.id
+                WHERE r.min_hall <= :hall AND r.max_hall >= :hall
+                  AND r.max_x >= :x0 AND r.min_x <= :x1 AND r.max_y >= :y0 AND r.min_y <= :y1
+                  AND i.type = 'seat'
+                  AND cx BETWEEN :x0 AND :x1 AND cy BETWEEN :y0 AND :y1;
+                """,
+                {"hall": hall_id, "x0": x0, "y0": y0, "x1": x1, "y1": y1},
+            )
+            return cur.fetchall()
+
+    out = []
+    cached = _cached_layouts([hall_id]).get(int(hall_id))
+    for it in cached["items"] if cached else ():
+        if it.get("type") != "seat":
+            continue
+        cx = float(it.get("x", 0)) + float(it.get("w", 30)) / 2
+        cy = float(it.get("y", 0)) + float(it.get("h", 30)) / 2
+        if x0 <= cx <= x1 and y0 <= cy <= y1:
+            out.append((str(it["id"]), cx, cy))
+    return out
+
+
+def seats_in_rect(hall_id: int, x0: float, y0: float, x1: float, y1: float) -> List[str]:
+    return [sid for sid, _, _ in _seats_in_box(hall_id, min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))]
+
+
+def seats_in_polygon(hall_id: int, points: List[Tuple[float, float]]) -> List[str]:
+    # selectie lasso: indexul spatial pe dreptunghiul incadrator, apoi ray casting pe centre
+    if len(points) < 3:
+        return []
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    out = []
+    for sid, cx, cy in _seats_in_box(hall_id, min(xs), min(ys), max(xs), max(ys)):
+        inside = False
+        j = len(points) - 1
+        for i in range(len(points)):
+            (xi, yi), (xj, yj) = points[i], points[j]
+            if (yi > cy) != (yj > cy) and cx < (xj - xi) * (cy - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+        if inside:
+            out.append(sid)
+    return out
+
+
+def seats_near(hall_id: int, x: float, y: float, radius: float) -> List[str]:
+    # cele mai apropiate intai
+    found = [
+        (math.hypot(cx - x, cy - y), sid)
+        for sid, cx, cy in _seats_in_box(hall_id, x - radius, y - radius, x + radius, y + radius)
+    ]
+    return [sid for d, sid in sorted(found) if d <= radius]
+
+
+def seats_near_stage(hall_id: int, radius: float) -> List[str]:
+    # locurile la cel mult `radius` de marginea unei scene / unui ecran
+    with connection() as conn:
+        cur = conn.cursor()
+        if _items_synced(cur, hall_id):
+            placeholders = ", ".join("?" for _ in FOCAL_DECOR_TYPES)
+            cur.execute(
+                f"SELECT x, y, w, h FROM hall_items WHERE hall_id = ? AND type IN ({placeholders});",
+                (hall_id, *FOCAL_DECOR_TYPES),
+            )
+            stages = cur.fetchall()
+        else:
+            cached = _cached_layouts([hall_id]).get(int(hall_id))
+            stages = [
+                (float(it.get("x", 0)), float(it.get("y", 0)), float(it.get("w", 30)), float(it.get("h", 30)))
+                for it in (cached["items"] if cached else ()) if it.get("type") in FOCAL_DECOR_TYPES
+            ]
+
+    best: Dict[str, float] = {}
+    for sx, sy, sw, sh in stages:
+        for sid, cx, cy in _seats_in_box(hall_id, sx - radius, sy - radius, sx + sw + radius, sy + sh + radius):
+            d = math.hypot(max(sx - cx, 0, cx - sx - sw), max(sy - cy, 0, cy - sy - sh))
+            if d <= radius and d < best.get(sid, math.inf):
+                best[sid] = d
+    return sorted(best, key=lambda sid: (best[sid], sid))
+
+
 def create_hall(name: str, layout_or_rows, cols: Optional[int] = None, zones: Optional[List[Dict]] = None) -> None:
     name = (name or "").strip()
     if not name:
@@ -245,14 +931,14 @@ def create_hall(name: str, layout_or_rows, cols: Optional[int] = None, zones: Op
 
     payload = {"items": items, "zones": z}
 
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO halls (name, layout_json) VALUES (?, ?);",
-        (name, json.dumps(payload)),
-    )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO halls (name, layout_json) VALUES (?, ?);",
+            (name, json.dumps(payload)),
+        )
+        _sync_items(cur, cur.lastrowid)
+        conn.commit()
 
 
 def update_hall(hall_id: int, name: str, layout_items: List[Dict], zones: Optional[List[Dict]] = None) -> None:
@@ -265,23 +951,235 @@ def update_hall(hall_id: int, name: str, layout_items: List[Dict], zones: Option
 
     payload = {"items": items, "zones": z}
 
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE halls
-        SET name = ?, layout_json = ?
-        WHERE id = ?;
-        """,
-        (name, json.dumps(payload), hall_id),
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            UPDATE halls
+            SET name = ?, layout_json = ?, layout_version = layout_version + 1
+            WHERE id = ?;
+            """,
+            (name, json.dumps(payload), hall_id),
+        )
+        _sync_items(cur, hall_id)
+        conn.commit()
+
+    _invalidate_layout(hall_id)
+
+PATCH_OPS = ("add", "move", "remove", "rezone")
+
+# SQLITE_MAX_FUNCTION_ARG implicit e 127; fiecare apel json_* in plus re-parseaza documentul,
+# asa ca peste PATCH_MAX_CALLS apeluri e mai ieftina rescrierea completa din Python
+JSON_FN_MAX_ARGS = 126
+PATCH_MAX_CALLS = 6
+
+_ITEM_PATH_RE = re.compile(r"\[(\d+)\]$")
+_APPEND_ITEM = "'$.items[#]', json(?)"
+
+
+def _normalize_ops(ops: List[Dict]) -> List[Dict]:
+    out: List[Dict] = []
+    for o in ops or []:
+        kind = o.get("op") if isinstance(o, dict) else None
+        if kind not in PATCH_OPS:
+            raise ValueError(f"Operatie de layout necunoscuta: {kind}")
+        if kind == "add":
+            items = _normalize_items([o.get("item")])
+            if not items:
+                raise ValueError("Operatia add necesita un element cu id si tip.")
+            out.append({"op": "add", "item": items[0]})
+            continue
+        if o.get("id") is None:
+            raise ValueError(f"Operatia {kind} necesita id-ul elementului.")
+        if kind == "move":
+            try:
+                out.append({
+                    "op": "move", "id": o["id"], "x": float(o["x"]), "y": float(o["y"]),
+                    "rotation": float(o.get("rotation", 0) or 0),
+                })
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Operatia move necesita coordonatele x si y.")
+        elif kind == "rezone":
+            zid = str(o.get("zone_id") or "").strip() or HallPricing.DEFAULT_ZONE
+            out.append({"op": "rezone", "id": o["id"], "zone_id": zid})
+        else:
+            out.append({"op": "remove", "id": o["id"]})
+    return out
+
+
+def _apply_ops(items: List[Dict], ops: List[Dict]) -> List[Dict]:
+    # varianta Python, pentru formatele vechi si pentru editari mari
+    removed = {o["id"] for o in ops if o["op"] == "remove"}
+    changes: Dict[Any, Dict[str, Any]] = {}
+    for o in ops:
+        if o["op"] == "move":
+            changes.setdefault(o["id"], {}).update(x=o["x"], y=o["y"], rotation=o["rotation"])
+        elif o["op"] == "rezone":
+            changes.setdefault(o["id"], {})["zone_id"] = o["zone_id"]
+
+    out = []
+    for it in items:
+        if it.get("id") in removed:
+            continue
+        ch = changes.get(it.get("id"))
+        if ch:
+            it = dict(it)
+            it.update(ch)
+        out.append(it)
+    out.extend(o["item"] for o in ops if o["op"] == "add")
+    return out
+
+
+def _chunks(values: List, size: int):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _patch_expression(cur: sqlite3.Cursor, hall_id: int, ops: List[Dict]) -> Optional[Tuple[str, List]]:
+    # json_set/json_remove/json_insert pe caile exacte ale elementelor atinse;
+    # None daca editarea e prea mare pentru asta. Se cauta doar pe nivelul de sus
+    # din items: un "id" din interiorul unui item nu e al unui element
+    targets = list({o["id"] for o in ops if o["op"] != "add"})
+    paths: Dict[Any, List[str]] = {}
+    if targets:
+        cur.execute(
+            """
+            SELECT '$.items[' || t.key || ']', json_extract(t.value, '$.id')
+            FROM halls h, json_each(h.layout_json, '$.items') t
+            WHERE h.id = ? AND json_extract(t.value, '$.id') IN (SELECT value FROM json_each(?));
+            """,
+            (hall_id, json.dumps(targets)),
+        )
+        for path, item_id in cur.fetchall():
+            paths.setdefault(item_id, []).append(path)
+
+    removed = {o["id"] for o in ops if o["op"] == "remove"}
+    sets: Dict[str, Any] = {}
+    for o in ops:
+        if o["op"] not in ("move", "rezone") or o["id"] in removed:
+            continue
+        for path in paths.get(o["id"], ()):
+            if o["op"] == "move":
+                sets[path + ".x"] = o["x"]
+                sets[path + ".y"] = o["y"]
+                sets[path + ".rotation"] = o["rotation"]
+            else:
+                sets[path + ".zone_id"] = o["zone_id"]
+    # indicii descrescatori: fiecare stergere lasa valabile caile urmatoare
+    drops = sorted(
+        {path for item_id in removed for path in paths.get(item_id, ())},
+        key=lambda p: int(_ITEM_PATH_RE.search(p).group(1)), reverse=True,
+    )
+    adds = [json.dumps(o["item"]) for o in ops if o["op"] == "add"]
+
+    set_args = [v for pair in sets.items() for v in pair]
+    calls = (
+        math.ceil(len(set_args) / JSON_FN_MAX_ARGS)
+        + math.ceil(len(drops) / JSON_FN_MAX_ARGS)
+        + math.ceil(len(adds) * 2 / JSON_FN_MAX_ARGS)
     )
-    conn.commit()
-    conn.close()
+    if calls > PATCH_MAX_CALLS:
+        return None
+
+    expr = "layout_json"
+    params: List[Any] = []
+    for chunk in _chunks(set_args, JSON_FN_MAX_ARGS):
+        expr = f"json_set({expr}, {', '.join('?' for _ in chunk)})"
+        params.extend(chunk)
+    for chunk in _chunks(drops, JSON_FN_MAX_ARGS):
+        expr = f"json_remove({expr}, {', '.join('?' for _ in chunk)})"
+        params.extend(chunk)
+    for chunk in _chunks(adds, JSON_FN_MAX_ARGS // 2):
+        expr = f"json_insert({expr}, {', '.join(_APPEND_ITEM for _ in chunk)})"
+        params.extend(chunk)
+    return expr, params
+
+
+def patch_hall(
+    hall_id: int,
+    ops: List[Dict],
+    name: Optional[str] = None,
+    zones: Optional[List[Dict]] = None,
+    expected_version: Optional[int] = None,
+) -> int:
+    # ops vin din LayoutModel.export_delta(); intoarce noua layout_version
+    ops = _normalize_ops(ops)
+    if name is not None:
+        name = name.strip()
+        if not name:
+            raise ValueError("Numele salii este obligatoriu.")
+
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE;")
+        try:
+            cur.execute(
+                """
+                SELECT layout_version, json_type(layout_json, '$.items'), items_version = layout_version
+                FROM halls WHERE id = ?;
+                """,
+                (hall_id,),
+            )
+            row = cur.fetchone()
+            if row is None:
+                raise ValueError("Sala nu exista.")
+            version, items_type, synced = row
+            if expected_version is not None and int(expected_version) != version:
+                raise ValueError("Sala a fost modificata intre timp. Redeschideti editorul.")
+
+            patch = _patch_expression(cur, hall_id, ops) if ops and items_type == "array" else None
+            if patch is not None:
+                expr, params = patch
+                cur.execute(
+                    f"UPDATE halls SET layout_json = {expr}, layout_version = layout_version + 1 WHERE id = ?;",
+                    params + [hall_id],
+                )
+                if synced:
+                    _patch_items(cur, hall_id, ops)
+                else:
+                    _sync_items(cur, hall_id)
+            elif ops or items_type != "array":
+                # format vechi (rows/cols, lista simpla) sau editare mare: rescriere completa
+                cur.execute("SELECT layout_json FROM halls WHERE id = ?;", (hall_id,))
+                parsed = _parse_layout_json(cur.fetchone()[0])
+                payload = {"items": _apply_ops(parsed["items"], ops), "zones": parsed["zones"]}
+                cur.execute(
+                    "UPDATE halls SET layout_json = ?, layout_version = layout_version + 1 WHERE id = ?;",
+                    (json.dumps(payload), hall_id),
+                )
+                _sync_items(cur, hall_id)
+            else:
+                cur.execute(
+                    """
+                    UPDATE halls
+                    SET layout_version = layout_version + 1,
+                        items_version = CASE WHEN items_version = layout_version THEN layout_version + 1 ELSE items_version END
+                    WHERE id = ?;
+                    """,
+                    (hall_id,),
+                )
+
+            if zones is not None:
+                cur.execute(
+                    "UPDATE halls SET layout_json = json_set(layout_json, '$.zones', json(?)) WHERE id = ?;",
+                    (json.dumps(_dedup_zones(zones)), hall_id),
+                )
+            if name is not None:
+                cur.execute("UPDATE halls SET name = ? WHERE id = ?;", (name, hall_id))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    _invalidate_layout(hall_id)
+    return version + 1
+
 
 def delete_hall(hall_id: int) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
+    with connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute("DELETE FROM halls WHERE id = ?;", (hall_id,))
+        conn.commit()
 
-    cur.execute("DELETE FROM halls WHERE id = ?;", (hall_id,))
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    _invalidate_layout(hall_id)
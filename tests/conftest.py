@@ -0,0 +1,12 @@
+import pytest
+
+from core import db
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    # fiecare test are baza lui; eventease.db din repo nu se atinge
+    path = tmp_path / "eventease.db"
+    monkeypatch.setattr(db, "DB_PATH", path)
+    db.init_db()
+    return path
@@ -0,0 +1,20 @@
+from services import event_service, hall_service
+
+
+def test_keyset_pages_follow_list_order(temp_db):
+    hall_service.create_hall("Sala", 2, 2)
+    hall_id = next(h["id"] for h in hall_service.get_all_halls() if h["name"] == "Sala")
+    # aceeasi data si ora: ordinea o dau titlul, apoi id-ul
+    for title in ("C", "A", "B", "A", "D"):
+        event_service.create_event(title, "", "2030-01-01", "20:00", hall_id)
+    event_service.create_event("Z", "", "2029-12-31", "21:00", hall_id)
+
+    pages, after = [], None
+    while True:
+        page = event_service.list_events_page(after=after, limit=2)
+        if not page:
+            break
+        pages.extend(page)
+        after = event_service.page_cursor(page[-1])
+
+    assert [e["id"] for e in pages] == [e["id"] for e in event_service.list_events()]
@@ -0,0 +1,21 @@
+from core.db import connection
+from services import hall_service
+
+
+def test_get_all_halls_is_a_summary(temp_db):
+    hall_service.create_hall("Sala mica", 3, 4)
+    summary = next(h for h in hall_service.get_all_halls() if h["name"] == "Sala mica")
+
+    assert set(summary) == {"id", "name", "layout_version", "seat_count"}
+    assert summary["seat_count"] == 12
+    assert len(hall_service.get_hall(summary["id"])["layout"]) >= 12
+
+
+def test_get_all_halls_counts_unsynced_layouts(temp_db):
+    hall_service.create_hall("Sala mica", 3, 4)
+    with connection() as conn:
+        conn.execute("UPDATE halls SET items_version = 0 WHERE name = 'Sala mica';")
+        conn.commit()
+
+    summary = next(h for h in hall_service.get_all_halls() if h["name"] == "Sala mica")
+    assert summary["seat_count"] == 12
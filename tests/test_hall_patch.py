@@ -0,0 +1,49 @@
+import json
+
+from core.db import connection
+from services import hall_service
+
+
+def _seat(item_id, x, y):
+    return {"id": item_id, "type": "seat", "x": x, "y": y, "w": 30, "h": 30, "zone_id": "Z1"}
+
+
+def _hall_with_nested_id(temp_db):
+    hall_service.create_hall("Sala test", [_seat("A1", 0, 0), _seat("A2", 40, 0), _seat("A3", 80, 0)])
+    with connection() as conn:
+        hall_id = conn.execute("SELECT id FROM halls WHERE name = 'Sala test';").fetchone()[0]
+        # A1 are in interior un obiect cu "id" egal cu al altui element
+        conn.execute(
+            "UPDATE halls SET layout_json = json_set(layout_json, '$.items[0].meta', json(?)) WHERE id = ?;",
+            (json.dumps({"id": "A2"}), hall_id),
+        )
+        conn.commit()
+    return hall_id
+
+
+def _items(hall_id):
+    with connection() as conn:
+        raw = conn.execute("SELECT layout_json FROM halls WHERE id = ?;", (hall_id,)).fetchone()[0]
+    return {it["id"]: it for it in json.loads(raw)["items"]}
+
+
+def test_move_ignores_nested_id(temp_db):
+    hall_id = _hall_with_nested_id(temp_db)
+
+    hall_service.patch_hall(hall_id, [{"op": "move", "id": "A2", "x": 400, "y": 50, "rotation": 0}])
+
+    items = _items(hall_id)
+    assert (items["A2"]["x"], items["A2"]["y"]) == (400, 50)
+    assert items["A1"]["meta"] == {"id": "A2"}
+    assert (items["A1"]["x"], items["A1"]["y"]) == (0, 0)
+
+
+def test_remove_ignores_nested_id(temp_db):
+    hall_id = _hall_with_nested_id(temp_db)
+
+    hall_service.patch_hall(hall_id, [{"op": "remove", "id": "A2"}, {"op": "rezone", "id": "A3", "zone_id": "Z2"}])
+
+    items = _items(hall_id)
+    assert set(items) == {"A1", "A3"}
+    assert items["A1"]["meta"] == {"id": "A2"}
+    assert items["A3"]["zone_id"] == "Z2"
@@ -0,0 +1,19 @@
+from benchmarks import check_query_plans
+from core.db import connection
+
+
+def test_service_queries_use_indexes(temp_db):
+    checked, failures = check_query_plans.check_plans()
+
+    assert checked > 0
+    assert failures == []
+
+
+def test_missing_index_is_reported(temp_db):
+    with connection() as conn:
+        conn.execute("DROP INDEX idx_bookings_email_created;")
+        conn.commit()
+
+    _, failures = check_query_plans.check_plans()
+
+    assert any("b.email = " in sql for sql, _ in failures)
@@ -8,6 +8,8 @@ from PySide6.QtCore import Qt, QDate, QTime
 from services import booking_service, hall_service
 from .models import BookingsTableModel, HallsTableModel
 from ..seatmap.seatmap_editor_widget import HallEditorWidget
+from ..common import BusyIndicator
+from ..tasks import TaskRunner
 
 class EventDialog(QDialog):
     def __init__(self, halls: List[Dict], event: Optional[Dict] = None, parent=None):
@@ -86,19 +88,59 @@ class BookingsDialog(QDialog):
         info_label = QLabel(f"Rezervari: <b>{event['title']}</b>")
         layout.addWidget(info_label)
 
+        self.runner = TaskRunner(self)
+        layout.addWidget(BusyIndicator(self.runner))
+
         self.table_view = QTableView()
         layout.addWidget(self.table_view)
 
-        bookings = booking_service.list_bookings_for_event(event["id"])
-        self._model = BookingsTableModel(bookings, self)
+        self._event = event
+        self._model = BookingsTableModel([], self)
         self.table_view.setModel(self._model)
         self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_view.setSelectionBehavior(QTableView.SelectRows)
+        self.table_view.setSelectionMode(QTableView.SingleSelection)
+
+        self.cancel_btn = QPushButton("Anuleaza rezervarea")
+        self.cancel_btn.clicked.connect(self.on_cancel_booking)
+        layout.addWidget(self.cancel_btn)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Close, parent=self)
         buttons.rejected.connect(self.close)
         buttons.button(QDialogButtonBox.Close).clicked.connect(self.close)
         layout.addWidget(buttons)
 
+        self.refresh_bookings()
+
+    def refresh_bookings(self) -> None:
+        self.runner.submit(
+            "bookings", booking_service.list_bookings_for_event, self._event["id"],
+            on_done=self._model.set_bookings, on_error=self._on_task_error,
+        )
+
+    def _on_task_error(self, error) -> None:
+        QMessageBox.warning(self, "Eroare", str(error))
+
+    def done(self, result):
+        self.runner.cancel("bookings")
+        super().done(result)
+
+    def on_cancel_booking(self) -> None:
+        idx = self.table_view.currentIndex()
+        booking = self._model.get_booking_at_row(idx.row()) if idx.isValid() else None
+        if not booking: return
+        if QMessageBox.question(self, "Confirmare", f"Anulati rezervarea pe numele {booking['name']}?") != QMessageBox.Yes:
+            return
+
+        def on_error(error) -> None:
+            self._on_task_error(error)
+            self.refresh_bookings()
+
+        self.runner.submit(
+            None, booking_service.cancel_booking, booking["id"],
+            on_done=lambda _: self.refresh_bookings(), on_error=on_error,
+        )
+
 class HallDialog(QDialog):
     def __init__(self, hall: Optional[Dict] = None, parent=None) -> None:
         super().__init__(parent)
@@ -133,6 +175,7 @@ class HallDialog(QDialog):
             "name": self.name_edit.text().strip(),
             "layout": data["items"],
             "zones": data["zones"],
+            "delta": data["delta"],
         }
 
 class HallsDialog(QDialog):
@@ -141,7 +184,10 @@ class HallsDialog(QDialog):
         self.setWindowTitle("Administrare sali")
         self.resize(900, 600)
         layout = QVBoxLayout(self)
-        
+
+        self.runner = TaskRunner(self)
+        layout.addWidget(BusyIndicator(self.runner))
+
         self.table_view = QTableView()
         layout.addWidget(self.table_view)
 
@@ -173,7 +219,22 @@ class HallsDialog(QDialog):
         layout.addWidget(bbox)
 
     def refresh_halls(self):
-        self._model.set_halls(hall_service.get_all_halls())
+        self.runner.submit("halls", hall_service.get_all_halls, on_done=self._model.set_halls, on_error=self._on_task_error)
+
+    def _run_write(self, fn, *args, **kwargs) -> None:
+        self.runner.submit(
+            None, fn, *args,
+            on_done=lambda _: self.refresh_halls(), on_error=self._on_task_error, **kwargs,
+        )
+
+    def _on_task_error(self, error) -> None:
+        QMessageBox.warning(self, "Eroare", str(error))
+
+    def done(self, result):
+        # dialogul se inchide: nu mai asteptam lista de sali
+        self.runner.cancel("halls")
+        self.runner.cancel("hall")
+        super().done(result)
 
     def get_selected(self) -> Optional[Dict]:
         idx = self.table_view.currentIndex()
@@ -184,26 +245,28 @@ class HallsDialog(QDialog):
         d = HallDialog(parent=self)
         if d.exec() == QDialog.Accepted:
             data = d.get_data()
-            try:
-                hall_service.create_hall(data["name"], data["layout"], zones=data["zones"])
-                self.refresh_halls()
-            except Exception as e:
-                QMessageBox.warning(self, "Eroare", str(e))
+            self._run_write(hall_service.create_hall, data["name"], data["layout"], zones=data["zones"])
 
     def on_edit(self):
         hall = self.get_selected()
         if not hall: return
+        # lista are doar rezumatul salilor; editorul are nevoie de layout-ul complet
+        self.runner.submit("hall", hall_service.get_hall, hall["id"], on_done=self._edit_hall, on_error=self._on_task_error)
+
+    def _edit_hall(self, hall: Optional[Dict]) -> None:
+        if hall is None:
+            self.refresh_halls()
+            return
         d = HallDialog(hall, parent=self)
         if d.exec() == QDialog.Accepted:
             data = d.get_data()
-            try:
-                hall_service.update_hall(hall["id"], data["name"], data["layout"], zones=data["zones"])
-                self.refresh_halls()
-            except Exception as e:
-                QMessageBox.warning(self, "Eroare", str(e))
+            # doar ce s-a schimbat in editor; versiunea opreste suprascrierea unei editari concurente
+            self._run_write(
+                hall_service.patch_hall, hall["id"], data["delta"],
+                name=data["name"], zones=data["zones"], expected_version=hall.get("layout_version"),
+            )
 
     def on_delete(self):
         hall = self.get_selected()
         if hall and QMessageBox.question(self, "Confirmare", "Sigur stergeti sala?") == QMessageBox.Yes:
-            hall_service.delete_hall(hall["id"])
-            self.refresh_halls()
\ No newline at end of file
+            self._run_write(hall_service.delete_hall, hall["id"])
@@ -1,11 +1,27 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
-from services import booking_service, hall_service
+from services import booking_service, event_service
+
+def load_events(query: str = "", after: Optional[Tuple[str, str, str, int]] = None, limit: int = 200):
+    # ruleaza in thread-ul de lucru: evenimentele si gradul de ocupare dintr-o data
+    if query:
+        events = event_service.search_events(query, limit)
+    else:
+        events = event_service.list_events_page(after=after, limit=limit)
+    return events, booking_service.occupancy_for_events([e["id"] for e in events])
+
 
 class EventsTableModel(QAbstractTableModel):
-    def __init__(self, events: List[Dict], parent=None) -> None:
+    PAGE_SIZE = 200
+
+    def __init__(self, events: List[Dict], parent=None, *, runner) -> None:
         super().__init__(parent)
         self._events = events
+        self._occupancy: Dict[int, Tuple[int, int]] = {}
+        self._has_more = False
+        self._fetching = False
+        # paginile (cu ocuparea lor) vin doar prin TaskRunner: prima prin set_page, restul prin fetchMore
+        self._runner = runner
 
     def rowCount(self, parent=QModelIndex()) -> int:
         return len(self._events)
@@ -13,6 +29,44 @@ class EventsTableModel(QAbstractTableModel):
     def columnCount(self, parent=QModelIndex()) -> int:
         return 5
 
+    def set_page(self, events: List[Dict], occupancy: Dict[int, Tuple[int, int]], has_more: bool) -> None:
+        self._runner.cancel("events.more")
+        self.beginResetModel()
+        self._events = events
+        self._occupancy = dict(occupancy)
+        self._has_more = has_more
+        self._fetching = False
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid(): return False
+        return self._has_more and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid() or not self._has_more or self._fetching or not self._events: return
+        after = event_service.page_cursor(self._events[-1])
+        self._fetching = True
+        self._runner.submit(
+            "events.more", load_events, after=after, limit=self.PAGE_SIZE,
+            on_done=self._append_page, on_error=self._fetch_failed,
+        )
+
+    def _fetch_failed(self, error) -> None:
+        self._fetching = False
+        self._has_more = False
+
+    def _append_page(self, result) -> None:
+        batch, occupancy = result
+        self._fetching = False
+        self._has_more = len(batch) == self.PAGE_SIZE
+        if not batch: return
+
+        first = len(self._events)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        self._events.extend(batch)
+        self._occupancy.update(occupancy)
+        self.endInsertRows()
+
     def data(self, index: QModelIndex, role=Qt.DisplayRole):
         if not index.isValid():
             return None
@@ -37,30 +91,9 @@ class EventsTableModel(QAbstractTableModel):
         return None
 
     def calculate_occupancy_ratio(self, event) -> float:
-        try:
-            bookings = booking_service.list_bookings_for_event(event["id"])
-            hall = hall_service.get_hall(event["hall_id"])
-            if not hall: return 0.0
-            
-            occupied_seats = 0
-            for b in bookings:
-                occupied_seats += len(b.get("seats", []))
-            
-            total_seats = 0
-            layout = hall.get("layout", [])
-            
-            items = []
-            if isinstance(layout, list):
-                items = layout
-            elif isinstance(layout, dict):
-                items = layout.get("items", [])
-            
-            total_seats = len([x for x in items if x.get("type") == "seat"])
-            
-            if total_seats == 0: return 0.0
-            return occupied_seats / total_seats
-        except Exception:
-            return 0.0
+        booked, total = self._occupancy.get(event["id"], (0, 0))
+        if total == 0: return 0.0
+        return booked / total
 
     def calculate_occupancy_text(self, event) -> str:
         ratio = self.calculate_occupancy_ratio(event)
@@ -73,11 +106,6 @@ class EventsTableModel(QAbstractTableModel):
             if section < len(headers): return headers[section]
         return None
 
-    def set_events(self, events: List[Dict]) -> None:
-        self.beginResetModel()
-        self._events = events
-        self.endResetModel()
-
     def get_event_at_row(self, row: int) -> Optional[Dict]:
         if 0 <= row < len(self._events): return self._events[row]
         return None
@@ -111,6 +139,15 @@ class BookingsTableModel(QAbstractTableModel):
             if section < len(headers): return headers[section]
         return None
 
+    def set_bookings(self, bookings: List[Dict]) -> None:
+        self.beginResetModel()
+        self._bookings = bookings
+        self.endResetModel()
+
+    def get_booking_at_row(self, row: int) -> Optional[Dict]:
+        if 0 <= row < len(self._bookings): return self._bookings[row]
+        return None
+
 class HallsTableModel(QAbstractTableModel):
     def __init__(self, halls: List[Dict], parent=None) -> None:
         super().__init__(parent)
@@ -125,16 +162,9 @@ class HallsTableModel(QAbstractTableModel):
     def data(self, index: QModelIndex, role=Qt.DisplayRole):
         if not index.isValid() or role != Qt.DisplayRole: return None
         hall = self._halls[index.row()]
-        layout_data = hall.get("layout", [])
-        seat_count = 0
-        if isinstance(layout_data, list):
-            seat_count = len([c for c in layout_data if c.get("type") == "seat"])
-        elif isinstance(layout_data, dict):
-            items = layout_data.get("items", [])
-            seat_count = len([c for c in items if c.get("type") == "seat"])
-
+        # seat_count vine agregat din hall_items, nu se mai numara la fiecare repaint
         if index.column() == 0: return hall["name"]
-        if index.column() == 1: return f"{seat_count} locuri"
+        if index.column() == 1: return f"{hall.get('seat_count', 0)} locuri"
         return None
 
     def headerData(self, section: int, orientation, role=Qt.DisplayRole):
@@ -10,6 +10,8 @@ from PySide6.QtCore import Qt, Signal, QSortFilterProxyModel
 from services import event_service, hall_service
 from .models import EventsTableModel
 from .dialogs import EventDialog, BookingsDialog, HallsDialog
+from ..common import BusyIndicator, EventListMixin
+from ..tasks import TaskRunner
 
 class OccupancyDelegate(QStyledItemDelegate):
     def paint(self, painter: QPainter, option: QStyleOptionViewItem, index):
@@ -50,29 +52,7 @@ class OccupancyDelegate(QStyledItemDelegate):
 
         painter.restore()
 
-class EventFilterProxyModel(QSortFilterProxyModel):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.filter_text = ""
-
-    def set_filter_text(self, text: str):
-        self.filter_text = text.lower()
-        self.invalidateFilter() 
-
-    def filterAcceptsRow(self, source_row, source_parent):
-        if not self.filter_text:
-            return True 
-
-        model = self.sourceModel()
-        idx_title = model.index(source_row, 0, source_parent)
-        idx_hall = model.index(source_row, 3, source_parent)
-        
-        title = str(model.data(idx_title, Qt.DisplayRole) or "").lower()
-        hall_name = str(model.data(idx_hall, Qt.DisplayRole) or "").lower()
-
-        return (self.filter_text in title) or (self.filter_text in hall_name)
-
-class AdminEventsView(QWidget):
+class AdminEventsView(EventListMixin, QWidget):
     back_to_login = Signal()
 
     def __init__(self, parent=None) -> None:
@@ -88,10 +68,14 @@ class AdminEventsView(QWidget):
         search_layout = QHBoxLayout()
         search_layout.addWidget(QLabel("Cauta:"))
         self.search_edit = QLineEdit()
-        self.search_edit.setPlaceholderText("Cauta dupa titlu sau sala...")
+        self.search_edit.setPlaceholderText("Cauta dupa titlu, sala sau descriere...")
         search_layout.addWidget(self.search_edit)
         layout.addLayout(search_layout)
 
+        self.runner = TaskRunner(self)
+        self.busy_indicator = BusyIndicator(self.runner)
+        layout.addWidget(self.busy_indicator)
+
         self.table_view = QTableView()
         layout.addWidget(self.table_view)
 
@@ -113,8 +97,8 @@ class AdminEventsView(QWidget):
         layout.addLayout(button_layout)
 
         self._events: List[Dict] = []
-        self._source_model = EventsTableModel(self._events, self) 
-        self._proxy_model = EventFilterProxyModel(self)           
+        self._source_model = EventsTableModel(self._events, self, runner=self.runner) 
+        self._proxy_model = QSortFilterProxyModel(self)
         self._proxy_model.setSourceModel(self._source_model)      
 
         self.table_view.setModel(self._proxy_model)               
@@ -124,9 +108,7 @@ class AdminEventsView(QWidget):
         self.table_view.setSelectionMode(QTableView.SingleSelection)
         self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-        self.search_edit.textChanged.connect(self.on_search_changed)
-
-        self.refresh_events()
+        self._init_event_list()
 
         self.add_button.clicked.connect(self.on_add_clicked)
         self.edit_button.clicked.connect(self.on_edit_clicked)
@@ -135,12 +117,6 @@ class AdminEventsView(QWidget):
         self.manage_halls_button.clicked.connect(self.on_manage_halls_clicked)
         self.back_button.clicked.connect(self.back_to_login.emit)
 
-    def refresh_events(self) -> None:
-        self._source_model.set_events(event_service.list_events())
-
-    def on_search_changed(self, text):
-        self._proxy_model.set_filter_text(text)
-
     def get_selected_event(self) -> Optional[Dict]:
         proxy_idx = self.table_view.currentIndex()
         if not proxy_idx.isValid(): 
@@ -150,31 +126,46 @@ class AdminEventsView(QWidget):
         return self._source_model.get_event_at_row(source_idx.row())
 
     def on_add_clicked(self) -> None:
-        halls = hall_service.get_all_halls()
+        self.runner.submit("halls", hall_service.get_all_halls, on_done=self._add_event, on_error=self._on_task_error)
+
+    def _add_event(self, halls: List[Dict]) -> None:
         if not halls:
             QMessageBox.warning(self, "Eroare", "Nu exista nicio sala definita.")
             return
         dialog = EventDialog(halls, parent=self)
         if dialog.exec() == QDialog.Accepted:
             data = dialog.get_data()
-            event_service.create_event(data["title"], data["description"], data["date"], data["time"], data["hall_id"])
-            self.refresh_events()
+            self.runner.submit(
+                None, event_service.create_event,
+                data["title"], data["description"], data["date"], data["time"], data["hall_id"],
+                on_done=lambda _: self.refresh_events(), on_error=self._on_task_error,
+            )
 
     def on_edit_clicked(self) -> None:
         event = self.get_selected_event()
         if not event: return
-        halls = hall_service.get_all_halls()
+        self.runner.submit(
+            "halls", hall_service.get_all_halls,
+            on_done=lambda halls: self._edit_event(event, halls), on_error=self._on_task_error,
+        )
+
+    def _edit_event(self, event: Dict, halls: List[Dict]) -> None:
         dialog = EventDialog(halls, event=event, parent=self)
         if dialog.exec() == QDialog.Accepted:
             data = dialog.get_data()
-            event_service.update_event(event["id"], data["title"], data["description"], data["date"], data["time"], data["hall_id"])
-            self.refresh_events()
+            self.runner.submit(
+                None, event_service.update_event,
+                event["id"], data["title"], data["description"], data["date"], data["time"], data["hall_id"],
+                on_done=lambda _: self.refresh_events(), on_error=self._on_task_error,
+            )
 
     def on_delete_clicked(self) -> None:
         event = self.get_selected_event()
         if event and QMessageBox.question(self, "Stergere", f"Stergi evenimentul '{event['title']}'?") == QMessageBox.Yes:
-            event_service.delete_event(event["id"])
-            self.refresh_events()
+            self.runner.submit(
+                None, event_service.delete_event, event["id"],
+                on_done=lambda _: self.refresh_events(), on_error=self._on_task_error,
+            )
 
     def on_view_bookings_clicked(self) -> None:
         event = self.get_selected_event()
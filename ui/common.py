@@ -1,6 +1,8 @@
-from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QProgressBar, QMessageBox
 from PySide6.QtGui import QPainter, QColor, QBrush
-from PySide6.QtCore import Qt, QSortFilterProxyModel
+from PySide6.QtCore import Qt, QTimer
+
+from .admin.models import EventsTableModel, load_events
 
 class OccupancyDelegate(QStyledItemDelegate):
     def paint(self, painter: QPainter, option: QStyleOptionViewItem, index):
@@ -40,21 +42,61 @@ class OccupancyDelegate(QStyledItemDelegate):
         painter.drawText(option.rect, Qt.AlignCenter, text_str)
         painter.restore()
 
-class EventFilterProxyModel(QSortFilterProxyModel):
-    def __init__(self, parent=None):
+# cat asteapta cautarea dupa ultima tasta inainte sa interogheze events_fts
+SEARCH_DEBOUNCE_MS = 250
+
+class BusyIndicator(QProgressBar):
+    # bara fara procent, vizibila cat timp TaskRunner-ul are cereri in curs
+    def __init__(self, runner=None, parent=None):
         super().__init__(parent)
-        self.filter_text = ""
-
-    def set_filter_text(self, text: str):
-        self.filter_text = text.lower()
-        self.invalidateFilter()
-
-    def filterAcceptsRow(self, source_row, source_parent):
-        if not self.filter_text:
-            return True
-        model = self.sourceModel()
-        idx_title = model.index(source_row, 0, source_parent)
-        idx_hall = model.index(source_row, 3, source_parent)
-        title = str(model.data(idx_title, Qt.DisplayRole) or "").lower()
-        hall_name = str(model.data(idx_hall, Qt.DisplayRole) or "").lower()
-        return (self.filter_text in title) or (self.filter_text in hall_name)
\ No newline at end of file
+        self.setRange(0, 0)
+        self.setTextVisible(False)
+        self.setMaximumHeight(6)
+        self.hide()
+        if runner is not None:
+            self.attach(runner)
+
+    def attach(self, runner):
+        runner.busy_changed.connect(self.setVisible)
+
+
+class EventListMixin:
+    # partea comuna a listelor de evenimente (admin si utilizator); clasa care o foloseste
+    # are search_edit, runner si _source_model si apeleaza _init_event_list() in __init__
+    def _init_event_list(self) -> None:
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.refresh_events)
+        self.search_edit.textChanged.connect(self.on_search_changed)
+
+    def refresh_events(self) -> None:
+        # o cerere noua (tastare, refresh) o anuleaza pe cea ramasa in urma
+        self._search_timer.stop()
+        query = self.search_edit.text().strip()
+        limit = EventsTableModel.PAGE_SIZE
+        self.runner.submit(
+            "events", load_events, query, limit=limit,
+            on_done=lambda res: self._source_model.set_page(res[0], res[1], not query and len(res[0]) == limit),
+            on_error=self._on_task_error,
+        )
+
+    def _on_task_error(self, error) -> None:
+        QMessageBox.warning(self, "Eroare", str(error))
+
+    def on_search_changed(self, text):
+        self._search_timer.start()
+
+    def showEvent(self, event):
+        # singurul loc care incarca lista: la prima afisare si la revenirea in pagina
+        super().showEvent(event)
+        if not event.spontaneous():
+            self.refresh_events()
+
+    def hideEvent(self, event):
+        # la navigare (logout) rezultatul unei incarcari in curs nu mai e util
+        if not event.spontaneous():
+            self._search_timer.stop()
+            self.runner.cancel("events")
+            self.runner.cancel("events.more")
+        super().hideEvent(event)
@@ -1,36 +1,59 @@
 import math
+from functools import lru_cache
+from operator import itemgetter
+
+import numpy as np
+
+from core.seat_labels import row_label
 
 LOGICAL_WIDTH = 1600
 LOGICAL_HEIGHT = 900
 
 
-def rotate_point(cx, cy, x, y, angle_deg):
+def rotate_points(xs, ys, cx, cy, angle_deg):
+    # aceeasi rotatie pentru multe puncte, intr-o singura operatie pe array-uri
     rad = math.radians(angle_deg)
-    tx = x - cx
-    ty = y - cy
-    rx = tx * math.cos(rad) - ty * math.sin(rad)
-    ry = tx * math.sin(rad) + ty * math.cos(rad)
-    return rx + cx, ry + cy
+    c, s = math.cos(rad), math.sin(rad)
+    tx = np.asarray(xs, dtype=float) - cx
+    ty = np.asarray(ys, dtype=float) - cy
+    return tx * c - ty * s + cx, tx * s + ty * c + cy
+
+
+def _column(items, key):
+    return np.fromiter(map(itemgetter(key), items), float, len(items))
+
+
+def bounding_box(items):
+    # (min_x, min_y, max_x, max_y) pentru dreptunghiurile nerotite ale itemilor
+    return (
+        min(map(itemgetter('x'), items)),
+        min(map(itemgetter('y'), items)),
+        max(i['x'] + i['w'] for i in items),
+        max(i['y'] + i['h'] for i in items),
+    )
+
+
+def translate_items(items, dx, dy):
+    for i in items:
+        i['x'] += dx
+        i['y'] += dy
+    return items
 
 
 def apply_rotation_to_group(items, center_x, center_y, angle):
     if angle == 0: return items
-    for item in items:
-        ix = item['x'] + item['w'] / 2
-        iy = item['y'] + item['h'] / 2
-        nx, ny = rotate_point(center_x, center_y, ix, iy, angle)
-        item['x'] = nx - item['w'] / 2
-        item['y'] = ny - item['h'] / 2
+    half_w, half_h = _column(items, 'w') / 2, _column(items, 'h') / 2
+    xs, ys = rotate_points(_column(items, 'x') + half_w, _column(items, 'y') + half_h, center_x, center_y, angle)
+    for item, nx, ny in zip(items, (xs - half_w).tolist(), (ys - half_h).tolist()):
+        item['x'] = nx
+        item['y'] = ny
         item['rotation'] = (item.get('rotation', 0) + angle) % 360
     return items
 
 
 def center_layout(items, scene_w=LOGICAL_WIDTH, scene_h=LOGICAL_HEIGHT):
     if not items: return items
-    min_x = min(i['x'] for i in items)
-    max_x = max(i['x'] + i['w'] for i in items)
-    min_y = min(i['y'] for i in items)
-    max_y = max(i['y'] + i['h'] for i in items)
+    min_x, min_y, max_x, max_y = bounding_box(items)
 
     group_w = max_x - min_x
     group_h = max_y - min_y
@@ -38,10 +61,25 @@ def center_layout(items, scene_w=LOGICAL_WIDTH, scene_h=LOGICAL_HEIGHT):
     off_x = (scene_w - group_w) / 2 - min_x
     off_y = (scene_h - group_h) / 2 - min_y
 
-    for i in items:
-        i['x'] += off_x
-        i['y'] += off_y
-    return items
+    return translate_items(items, off_x, off_y)
+
+
+def grid_positions(start_x, start_y, rows, cols, pitch_x, pitch_y):
+    # coltul stanga-sus al fiecarei celule, rand cu rand
+    xs = [start_x + c * pitch_x for c in range(cols)] * rows
+    ys = [start_y + r * pitch_y for r in range(rows) for _ in range(cols)]
+    return xs, ys
+
+
+def arc_positions(cx, cy, radius, start_deg, step_deg, n):
+    # centrele a n puncte pe un arc de cerc, la pas unghiular constant;
+    # un arc are zeci de locuri, prea putine ca array-urile numpy sa castige
+    xs, ys = [], []
+    for k in range(n):
+        a = math.radians(start_deg + k * step_deg)
+        xs.append(cx + radius * math.cos(a))
+        ys.append(cy + radius * math.sin(a))
+    return xs, ys
 
 
 def generate_decor(x, y, type_decor, w=100, h=50, label="Decor", rotation=0):
@@ -52,6 +90,16 @@ def generate_decor(x, y, type_decor, w=100, h=50, label="Decor", rotation=0):
     }]
 
 
+@lru_cache(maxsize=64)
+def _ring_offsets(num_seats):
+    # (cos, sin, rotatie) pentru scaunele unei mese rotunde; aceleasi pentru toate mesele de acelasi fel
+    out = []
+    for i in range(num_seats):
+        angle = (2 * math.pi / num_seats) * i
+        out.append((math.cos(angle), math.sin(angle), math.degrees(angle) + 90))
+    return tuple(out)
+
+
 def generate_round_table_set(center_x, center_y, table_id, num_seats=8):
     items = []
     table_radius = max(25, 5 + (num_seats * 4))
@@ -63,11 +111,9 @@ def generate_round_table_set(center_x, center_y, table_id, num_seats=8):
         "w": table_radius * 2, "h": table_radius * 2, "rotation": 0
     })
 
-    for i in range(num_seats):
-        angle = (2 * math.pi / num_seats) * i
-        sx = center_x + math.cos(angle) * seat_distance
-        sy = center_y + math.sin(angle) * seat_distance
-        seat_rot = math.degrees(angle) + 90
+    for i, (dx, dy, seat_rot) in enumerate(_ring_offsets(num_seats)):
+        sx = center_x + dx * seat_distance
+        sy = center_y + dy * seat_distance
         items.append({
             "id": f"{table_id}-{i + 1}", "type": "seat",
             "x": sx - 15, "y": sy - 15, "w": 30, "h": 30,
@@ -116,21 +162,42 @@ def generate_rect_table_set(center_x, center_y, table_id, num_seats=6, is_square
 
 
 def generate_seat_block(start_x, start_y, rows, cols, start_row_char='A', start_col_num=1):
-    items = []
     seat_size = 30
     gap = 5
-    for r in range(rows):
-        row_char = chr(ord(start_row_char) + r)
-        for c in range(cols):
-            items.append({
-                "id": f"{row_char}{start_col_num + c}", "type": "seat",
-                "x": start_x + c * (seat_size + gap),
-                "y": start_y + r * (seat_size + gap),
-                "w": seat_size, "h": seat_size, "rotation": 0
-            })
-    return items
+    xs, ys = grid_positions(start_x, start_y, rows, cols, seat_size + gap, seat_size + gap)
+    first_row = ord(start_row_char.upper()) - ord('A')
+    ids = [f"{row_label(first_row + r)}{start_col_num + c}" for r in range(rows) for c in range(cols)]
+    return [
+        {"id": sid, "type": "seat", "x": x, "y": y, "w": seat_size, "h": seat_size, "rotation": 0}
+        for sid, x, y in zip(ids, xs, ys)
+    ]
+
+
+def round_table_pitch(num_seats):
+    # distanta dintre centrele a doua mese rotunde vecine, cu scaune cu tot
+    table_radius = max(25, 5 + (num_seats * 4))
+    return (table_radius + 20 + 15) * 2 + 20
+
+
+def generate_seat_grid(start_x, start_y, rows, cols, next_id):
+    # ca generate_seat_block, dar id-urile vin din alocatorul editorului
+    seat_size = 30
+    gap = 5
+    xs, ys = grid_positions(start_x, start_y, rows, cols, seat_size + gap, seat_size + gap)
+    return [
+        {"id": next_id(), "type": "seat", "x": x, "y": y, "w": seat_size, "h": seat_size, "rotation": 0}
+        for x, y in zip(xs, ys)
+    ]
 
 
+def generate_round_table_grid(start_x, start_y, rows, cols, num_seats, next_id):
+    items = []
+    pitch = round_table_pitch(num_seats)
+    xs, ys = grid_positions(start_x + pitch / 2, start_y + pitch / 2, rows, cols, pitch, pitch)
+    for cx, cy in zip(xs, ys):
+        items.extend(generate_round_table_set(cx, cy, next_id(), num_seats))
+    return items
+
 
 def create_cinema_template(rows=8, cols_per_side=6):
     items = []
@@ -243,4 +310,57 @@ def create_club_layout():
 
     items.extend(generate_decor(800, 900, "decor_generic", 120, 40, "INTRARE"))
 
-    return center_layout(items)
\ No newline at end of file
+    return center_layout(items)
+
+
+def create_stadium_template(sectors=24, tiers=3, rows_per_tier=20, inner_radius=900, arc_deg=360,
+                            aisle_width=70, tier_gap=80, seat_pitch=35, row_depth=45, tier_zones=None,
+                            field_label="TEREN"):
+    # tribune curbe in jurul unui teren central: `sectors` sectoare despartite de culoare de latime
+    # constanta, fiecare cu `tiers` inele de cate `rows_per_tier` randuri, cu o alee intre inele.
+    # Randurile sunt numerotate continuu din interior spre exterior (A..Z, AA, AB...), locurile
+    # de la 1 in fiecare rand; id-ul e "S<sector>-<rand><loc>", ex. "S3-AB12".
+    # arc_deg < 360 da o arena deschisa (amfiteatru), cu scena pe latura libera
+    items = []
+    seat_size = 30
+    half = seat_size / 2
+    cx = cy = 0.0
+
+    field = inner_radius * 1.2
+    items.extend(generate_decor(cx, cy, "decor_stage", field, field * 0.6, field_label))
+
+    # arcul incepe sus (-90 grade) pentru amfiteatru, ca scena sa ramana deschisa spre sud
+    start = -90 - arc_deg / 2 if arc_deg < 360 else -90
+    sector_deg = arc_deg / sectors
+
+    for tier in range(tiers):
+        zone = None
+        if tier_zones:
+            zone = tier_zones[min(tier, len(tier_zones) - 1)]
+        for r in range(rows_per_tier):
+            row = tier * rows_per_tier + r
+            radius = inner_radius + row * row_depth + tier * tier_gap
+            label = row_label(row)
+            # culoarul are latime fixa, deci ocupa un unghi tot mai mic spre exterior
+            aisle_deg = math.degrees(aisle_width / radius)
+            usable_deg = sector_deg - aisle_deg
+            step_deg = math.degrees(seat_pitch / radius)
+            n = int(usable_deg // step_deg)
+            if n <= 0:
+                continue
+            for sector in range(sectors):
+                sector_start = start + sector * sector_deg + aisle_deg / 2
+                first = sector_start + (usable_deg - (n - 1) * step_deg) / 2
+                xs, ys = arc_positions(cx, cy, radius, first, step_deg, n)
+                prefix = f"S{sector + 1}-{label}"
+                for k, (x, y) in enumerate(zip(xs, ys)):
+                    seat = {
+                        "id": f"{prefix}{k + 1}", "type": "seat",
+                        "x": x - half, "y": y - half, "w": seat_size, "h": seat_size,
+                        "rotation": (first + k * step_deg + 90) % 360,
+                    }
+                    if zone:
+                        seat["zone_id"] = zone
+                    items.append(seat)
+
+    return center_layout(items)
@@ -1,4 +1,5 @@
-from .seatmap_core import SeatMapView, GraphicSeat, GraphicShape, MapItem
+from .seatmap_core import SeatMapView, GraphicSeat, GraphicShape, MapItem, LayoutModel
+from .seat_layer import SeatLayer
 from .seatmap_editor_widget import HallEditorWidget
 from .seatmap_dialogs import SeatSelectionDialog
 
@@ -7,6 +8,8 @@ __all__ = [
     "GraphicSeat",
     "GraphicShape",
     "MapItem",
+    "LayoutModel",
+    "SeatLayer",
     "HallEditorWidget",
     "SeatSelectionDialog",
 ]
\ No newline at end of file
@@ -0,0 +1,75 @@
+import math
+from collections import OrderedDict
+from typing import Tuple
+
+from PySide6.QtGui import QColor, QFont, QFontMetricsF, QPainter, QPixmap
+from PySide6.QtCore import QPointF, QRectF, Qt
+
+# praguri in pixeli de ecran pentru latura unui loc (30 unitati logice)
+OUTLINE_MIN_PX = 6.0
+LABEL_MIN_PX = 16.0
+
+GLYPH_CACHE_SIZE = 4096
+
+
+def seat_pixels(painter: QPainter, option, size: float) -> float:
+    # cati pixeli de ecran ocupa `size` unitati logice la zoom-ul curent
+    return size * option.levelOfDetailFromTransform(painter.worldTransform())
+
+
+def label_font(text: str) -> QFont:
+    font = QFont()
+    font.setPixelSize(8 if len(text) > 4 else 10)
+    return font
+
+
+class GlyphCache:
+    # pixmap-uri pre-randate pentru etichetele locurilor, per text, font si treapta de zoom;
+    # drawPixmap e mult mai ieftin decat layout-ul de text facut la fiecare repaint
+    def __init__(self, capacity: int = GLYPH_CACHE_SIZE) -> None:
+        self.capacity = capacity
+        self._items: "OrderedDict[Tuple[str, int, float], QPixmap]" = OrderedDict()
+
+    @staticmethod
+    def _bucket(scale: float) -> float:
+        # treptele de 2^k tin cache-ul mic; textul ramane clar pana la 2x marire
+        return float(2 ** max(0, min(5, math.ceil(math.log2(max(scale, 1e-3))))))
+
+    def get(self, text: str, scale: float) -> QPixmap:
+        font = label_font(text)
+        bucket = self._bucket(scale)
+        key = (text, font.pixelSize(), bucket)
+        pm = self._items.get(key)
+        if pm is not None:
+            self._items.move_to_end(key)
+            return pm
+
+        metrics = QFontMetricsF(font)
+        w = max(1.0, metrics.horizontalAdvance(text))
+        h = max(1.0, metrics.height())
+        pm = QPixmap(int(math.ceil(w * bucket)), int(math.ceil(h * bucket)))
+        pm.setDevicePixelRatio(bucket)
+        pm.fill(Qt.transparent)
+        p = QPainter(pm)
+        p.setFont(font)
+        p.setPen(QColor(Qt.black))
+        p.drawText(QRectF(0, 0, w, h), Qt.AlignCenter, text)
+        p.end()
+
+        self._items[key] = pm
+        if len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+        return pm
+
+    def draw(self, painter: QPainter, rect: QRectF, text: str, scale: float) -> None:
+        pm = self.get(text, scale)
+        dpr = pm.devicePixelRatio()
+        w = pm.width() / dpr
+        h = pm.height() / dpr
+        painter.drawPixmap(QPointF(rect.center().x() - w / 2, rect.center().y() - h / 2), pm)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+glyph_cache = GlyphCache()
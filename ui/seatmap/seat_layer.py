@@ -0,0 +1,259 @@
+import math
+from array import array
+from typing import Dict, Iterable, List, Set
+
+from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from PySide6.QtGui import QBrush, QPen, QColor
+from PySide6.QtCore import QRectF, QPointF, Qt
+
+from .lod import LABEL_MIN_PX, OUTLINE_MIN_PX, glyph_cache
+
+FREE = 0
+RESERVED = 1
+SELECTED = 2
+
+# latura unei celule din indexul spatial, in unitati logice (un loc are ~30)
+GRID_CELL = 64
+
+
+class SeatLayer(QGraphicsItem):
+    # un singur item de scena care deseneaza toate locurile din array-uri compacte;
+    # folosit de SeatMapView in modul doar-citire, unde locurile nu se muta
+    def __init__(self, reserved_color: str, selected_color: str, free_color: str) -> None:
+        super().__init__()
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setAcceptHoverEvents(True)
+
+        self.ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.xs = array("d")
+        self.ys = array("d")
+        self.ws = array("d")
+        self.hs = array("d")
+        self.rot = array("d")
+        self.zone = array("H")
+        self.state = bytearray()
+
+        self._zone_ids: List[str] = []
+        self._zone_pos: Dict[str, int] = {}
+        self._zone_brushes: List[QBrush] = []
+        self._zone_meta: Dict[str, tuple] = {}
+        self._free_color = free_color
+        self._state_brushes = {
+            RESERVED: QBrush(QColor(reserved_color)),
+            SELECTED: QBrush(QColor(selected_color)),
+        }
+
+        self._grid: Dict[tuple, array] = {}
+        self._bounds = QRectF()
+        self._hover = -1
+
+        self._pen = QPen(Qt.black)
+
+    def set_zones(self, zone_colors: Dict[str, str], zone_meta: Dict[str, tuple]) -> None:
+        self._zone_meta = dict(zone_meta)
+        for zid, color in zone_colors.items():
+            pos = self._zone(zid)
+            self._zone_brushes[pos] = QBrush(QColor(color))
+        self.update()
+
+    def _zone(self, zone_id: str) -> int:
+        pos = self._zone_pos.get(zone_id)
+        if pos is None:
+            pos = len(self._zone_ids)
+            self._zone_pos[zone_id] = pos
+            self._zone_ids.append(zone_id)
+            self._zone_brushes.append(QBrush(QColor(self._free_color)))
+        return pos
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add_seats(self, seats: Iterable[dict], reserved: Set[str]) -> None:
+        self.prepareGeometryChange()
+        for d in seats:
+            i = len(self.ids)
+            sid = str(d["id"])
+            w = float(d.get("w", 30))
+            h = float(d.get("h", 30))
+            self.ids.append(sid)
+            self._index[sid.strip().upper()] = i
+            self.xs.append(float(d["x"]))
+            self.ys.append(float(d["y"]))
+            self.ws.append(w)
+            self.hs.append(h)
+            self.rot.append(float(d.get("rotation", 0) or 0))
+            self.zone.append(self._zone(d.get("zone_id", "Z1") or "Z1"))
+            self.state.append(RESERVED if sid.strip().upper() in reserved else FREE)
+            self._insert(i)
+
+    def _extent(self, i: int) -> QRectF:
+        # dreptunghiul aliniat la axe care contine locul rotit in jurul centrului sau
+        x, y, w, h, r = self.xs[i], self.ys[i], self.ws[i], self.hs[i], self.rot[i]
+        if not r % 360:
+            return QRectF(x, y, w, h)
+        rad = math.radians(r)
+        c, s = abs(math.cos(rad)), abs(math.sin(rad))
+        ew = w * c + h * s
+        eh = w * s + h * c
+        return QRectF(x + (w - ew) / 2, y + (h - eh) / 2, ew, eh)
+
+    def _cells(self, rect: QRectF):
+        x0 = int(math.floor(rect.left() / GRID_CELL))
+        x1 = int(math.floor(rect.right() / GRID_CELL))
+        y0 = int(math.floor(rect.top() / GRID_CELL))
+        y1 = int(math.floor(rect.bottom() / GRID_CELL))
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    def _insert(self, i: int) -> None:
+        ext = self._extent(i)
+        for cell in self._cells(ext):
+            bucket = self._grid.get(cell)
+            if bucket is None:
+                bucket = self._grid[cell] = array("I")
+            bucket.append(i)
+        self._bounds = self._bounds.united(ext) if not self._bounds.isNull() else ext
+
+    def seats_in(self, rect: QRectF) -> List[int]:
+        found = set()
+        for cell in self._cells(rect):
+            bucket = self._grid.get(cell)
+            if bucket is not None:
+                found.update(bucket)
+        return sorted(i for i in found if self._extent(i).intersects(rect))
+
+    def seat_at(self, pos: QPointF) -> int:
+        bucket = self._grid.get((int(math.floor(pos.x() / GRID_CELL)), int(math.floor(pos.y() / GRID_CELL))))
+        if bucket is None:
+            return -1
+        for i in reversed(bucket):
+            # punctul se aduce in sistemul locului (nerotit) si se testeaza dreptunghiul
+            w, h = self.ws[i], self.hs[i]
+            cx, cy = self.xs[i] + w / 2, self.ys[i] + h / 2
+            dx, dy = pos.x() - cx, pos.y() - cy
+            r = self.rot[i]
+            if r % 360:
+                rad = math.radians(-r)
+                dx, dy = dx * math.cos(rad) - dy * math.sin(rad), dx * math.sin(rad) + dy * math.cos(rad)
+            if abs(dx) <= w / 2 and abs(dy) <= h / 2:
+                return i
+        return -1
+
+    def index_of(self, seat_id: str) -> int:
+        return self._index.get(str(seat_id).strip().upper(), -1)
+
+    def tooltip(self, i: int) -> str:
+        sid = self.ids[i]
+        zid = self._zone_ids[self.zone[i]]
+        meta = self._zone_meta.get(zid)
+        if meta:
+            name, price = meta
+            return f"{sid}\nZona: {name} ({zid})\nPret: {price:.2f} lei"
+        return sid
+
+    def seat_dicts(self) -> List[dict]:
+        return [
+            {
+                "id": self.ids[i], "x": self.xs[i], "y": self.ys[i], "type": "seat",
+                "w": self.ws[i], "h": self.hs[i], "parent_id": None, "rotation": self.rot[i],
+                "label": "", "zone_id": self._zone_ids[self.zone[i]],
+            }
+            for i in range(len(self.ids))
+        ]
+
+    def selected_ids(self) -> List[str]:
+        return [self.ids[i] for i, s in enumerate(self.state) if s == SELECTED]
+
+    def set_selected(self, seat_ids: Iterable[str]) -> None:
+        wanted = {str(s).strip().upper() for s in seat_ids}
+        for i, sid in enumerate(self.ids):
+            if self.state[i] == RESERVED:
+                continue
+            self.state[i] = SELECTED if sid.strip().upper() in wanted else FREE
+        self.update()
+
+    def _brush_key(self, i: int) -> int:
+        # >0: starea (rezervat/selectat); <0: culoarea zonei pentru locurile libere
+        st = self.state[i]
+        return st if st != FREE else -1 - self.zone[i]
+
+    def _brush(self, i: int) -> QBrush:
+        st = self.state[i]
+        if st != FREE:
+            return self._state_brushes[st]
+        return self._zone_brushes[self.zone[i]]
+
+    def boundingRect(self) -> QRectF:
+        return self._bounds
+
+    def paint(self, painter, option: QStyleOptionGraphicsItem, widget=None) -> None:
+        visible = self.seats_in(option.exposedRect)
+        if not visible:
+            return
+
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        # sub OUTLINE_MIN_PX locurile sunt blocuri plate de culoare, fara contur si etichete
+        seat_px = lod * max(self.hs[i] for i in visible[:64])
+        flat = seat_px < OUTLINE_MIN_PX
+        painter.setPen(Qt.NoPen if flat else self._pen)
+
+        # locurile nerotite se deseneaza grupate pe culoare, cu un singur drawRects per grup;
+        # la blocuri plate rotatia nu se vede, asa ca intra in grupuri si cele rotite
+        groups: Dict[int, List[QRectF]] = {}
+        rotated = []
+        for i in visible:
+            if not flat and self.rot[i] % 360:
+                rotated.append(i)
+                continue
+            groups.setdefault(self._brush_key(i), []).append(
+                QRectF(self.xs[i], self.ys[i], self.ws[i], self.hs[i])
+            )
+        for key, rects in groups.items():
+            painter.setBrush(self._state_brushes[key] if key > 0 else self._zone_brushes[-1 - key])
+            painter.drawRects(rects)
+
+        for i in rotated:
+            w, h = self.ws[i], self.hs[i]
+            painter.save()
+            painter.translate(self.xs[i] + w / 2, self.ys[i] + h / 2)
+            painter.rotate(self.rot[i])
+            painter.setBrush(self._brush(i))
+            painter.drawRect(QRectF(-w / 2, -h / 2, w, h))
+            painter.restore()
+
+        if seat_px < LABEL_MIN_PX:
+            return
+        for i in visible:
+            w, h = self.ws[i], self.hs[i]
+            if self.rot[i] % 360:
+                painter.save()
+                painter.translate(self.xs[i] + w / 2, self.ys[i] + h / 2)
+                painter.rotate(self.rot[i])
+                glyph_cache.draw(painter, QRectF(-w / 2, -h / 2, w, h), self.ids[i], lod)
+                painter.restore()
+            else:
+                glyph_cache.draw(painter, QRectF(self.xs[i], self.ys[i], w, h), self.ids[i], lod)
+
+    def hoverMoveEvent(self, event) -> None:
+        # tooltip-ul se construieste doar pentru locul de sub cursor
+        i = self.seat_at(event.pos())
+        if i != self._hover:
+            self._hover = i
+            self.setToolTip(self.tooltip(i) if i >= 0 else "")
+        super().hoverMoveEvent(event)
+
+    def hoverLeaveEvent(self, event) -> None:
+        self._hover = -1
+        self.setToolTip("")
+        super().hoverLeaveEvent(event)
+
+    def mousePressEvent(self, event) -> None:
+        i = self.seat_at(event.pos())
+        if i < 0 or event.button() != Qt.LeftButton:
+            event.ignore()
+            return
+        if self.state[i] != RESERVED:
+            self.state[i] = FREE if self.state[i] == SELECTED else SELECTED
+            self.update(self._extent(i))
@@ -12,13 +12,19 @@ from PySide6.QtGui import QBrush, QPen, QColor, QPainter, QFont, QIcon, QPixmap
 from PySide6.QtCore import QRectF, Qt
 
 
+from .seat_layer import SeatLayer
+from .lod import LABEL_MIN_PX, OUTLINE_MIN_PX, glyph_cache, seat_pixels
 from ..layout_generator import (
     generate_round_table_set, generate_rect_table_set, generate_decor,
+    generate_seat_grid, generate_round_table_grid, round_table_pitch,
     apply_rotation_to_group,
     LOGICAL_WIDTH, LOGICAL_HEIGHT
 )
 
 
+ZOOM_STEP = 1.15
+MAX_ZOOM = 25.0
+
 COLORS = {
     "free": "#A5D6A7",
     "reserved": "#EF9A9A",
@@ -31,25 +37,60 @@ COLORS = {
 }
 
 
-def get_next_id(prefix: str, existing_items: List) -> str:
-    max_val = 0
-    pattern = re.compile(rf"^{re.escape(prefix)}(\d+)")
-    for item in existing_items:
-        match = pattern.match(item.id)
+class IdAllocator:
+    # urmatorul id liber per prefix (S, M, D-...) fara scanarea tuturor itemilor la fiecare click:
+    # un prefix nou se calculeaza o singura data, apoi doar se actualizeaza la add
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._high: Dict[str, int] = {}
+        self._patterns: Dict[str, "re.Pattern"] = {}
+
+    def reset(self) -> None:
+        self._ids.clear()
+        self._high.clear()
+        self._patterns.clear()
+
+    def observe(self, item) -> None:
+        for value in (item.id, item.parent_id):
+            if not value:
+                continue
+            self._ids[value] = self._ids.get(value, 0) + 1
+            for prefix, pattern in self._patterns.items():
+                self._bump(prefix, pattern, value)
+
+    def forget(self, item) -> None:
+        # maximul nu scade: un id sters nu se refoloseste in aceeasi sesiune de editare
+        for value in (item.id, item.parent_id):
+            if not value:
+                continue
+            n = self._ids.get(value, 0) - 1
+            if n > 0:
+                self._ids[value] = n
+            else:
+                self._ids.pop(value, None)
+
+    def _bump(self, prefix: str, pattern, value: str) -> None:
+        match = pattern.match(value)
         if match:
             v = int(match.group(1))
-            if v > max_val:
-                max_val = v
-        if item.parent_id:
-            match_p = pattern.match(item.parent_id)
-            if match_p:
-                vp = int(match_p.group(1))
-                if vp > max_val:
-                    max_val = vp
-    return f"{prefix}{max_val + 1}"
+            if v > self._high[prefix]:
+                self._high[prefix] = v
+
+    def allocate(self, prefix: str) -> str:
+        if prefix not in self._patterns:
+            pattern = re.compile(rf"^{re.escape(prefix)}(\d+)")
+            self._patterns[prefix] = pattern
+            self._high[prefix] = 0
+            for value in self._ids:
+                self._bump(prefix, pattern, value)
+        self._high[prefix] += 1
+        return f"{prefix}{self._high[prefix]}"
 
 
 class MapItem:
+    # fara __dict__ per instanta: editorul tine zeci de mii de astfel de obiecte
+    __slots__ = ("id", "x", "y", "type", "w", "h", "parent_id", "rotation", "label", "zone_id")
+
     def __init__(self, item_id, x, y, item_type, w=30, h=30, parent_id=None, rotation=0, label="", zone_id="Z1"):
         self.id = item_id
         self.x = x
@@ -63,16 +104,129 @@ class MapItem:
         self.zone_id = zone_id
 
     def to_dict(self):
-        return self.__dict__
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class LayoutModel:
+    # itemii editorului in ordinea adaugarii, plus ce s-a schimbat fata de layout-ul incarcat;
+    # export_delta() da doar operatiile pentru itemii atinsi
+    def __init__(self) -> None:
+        self._items: Dict[int, MapItem] = {}
+        self._children: Dict[str, List[MapItem]] = {}
+        self.ids = IdAllocator()
+        self._added: Dict[int, MapItem] = {}
+        self._moved: Dict[int, MapItem] = {}
+        self._rezoned: Dict[int, MapItem] = {}
+        self._removed: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def reset(self) -> None:
+        self._items.clear()
+        self._children.clear()
+        self.ids.reset()
+        self.mark_clean()
+
+    def replace(self) -> None:
+        # golire din editor (sablon, "goleste tot"): itemii incarcati devin stergeri
+        for key, mi in self._items.items():
+            if key not in self._added:
+                self._removed.append(mi.id)
+        self._items.clear()
+        self._children.clear()
+        self._added.clear()
+        self._moved.clear()
+        self._rezoned.clear()
+
+    def add(self, item: MapItem, new: bool = True) -> None:
+        self._items[id(item)] = item
+        if item.parent_id:
+            self._children.setdefault(item.parent_id, []).append(item)
+        self.ids.observe(item)
+        if new:
+            self._added[id(item)] = item
+
+    def remove(self, item: MapItem) -> List[MapItem]:
+        # itemul, plus copiii lui (scaunele unei mese) si copiii acestora
+        removed = []
+        stack = [item]
+        while stack:
+            mi = stack.pop()
+            key = id(mi)
+            if self._items.pop(key, None) is None:
+                continue
+            removed.append(mi)
+            self.ids.forget(mi)
+            stack.extend(self._children.pop(mi.id, ()))
+            if mi.parent_id:
+                siblings = self._children.get(mi.parent_id)
+                if siblings is not None:
+                    siblings[:] = [x for x in siblings if x is not mi]
+            self._moved.pop(key, None)
+            self._rezoned.pop(key, None)
+            if self._added.pop(key, None) is None:
+                self._removed.append(mi.id)
+        return removed
+
+    def mark_moved(self, item: MapItem) -> None:
+        key = id(item)
+        if key in self._items and key not in self._added:
+            self._moved[key] = item
+
+    def mark_rezoned(self, item: MapItem) -> None:
+        key = id(item)
+        if key in self._items and key not in self._added:
+            self._rezoned[key] = item
+
+    def is_dirty(self) -> bool:
+        return bool(self._added or self._moved or self._rezoned or self._removed)
+
+    def mark_clean(self) -> None:
+        self._added.clear()
+        self._moved.clear()
+        self._rezoned.clear()
+        self._removed.clear()
+
+    def to_dicts(self) -> List[Dict]:
+        return [mi.to_dict() for mi in self._items.values()]
+
+    def export_delta(self) -> List[Dict]:
+        # ordinea conteaza: stergerile inaintea adaugarilor, ca un id refolosit sa nu fie sters
+        ops: List[Dict] = [{"op": "remove", "id": item_id} for item_id in self._removed]
+        ops.extend({"op": "add", "item": mi.to_dict()} for mi in self._added.values())
+        ops.extend(
+            {"op": "move", "id": mi.id, "x": mi.x, "y": mi.y, "rotation": mi.rotation}
+            for mi in self._moved.values()
+        )
+        ops.extend({"op": "rezone", "id": mi.id, "zone_id": mi.zone_id} for mi in self._rezoned.values())
+        return ops
 
 class GraphicItemBase(QGraphicsItem):
     def __init__(self, data: MapItem):
         super().__init__()
         self.data = data
+        self.on_moved = None
         self.setPos(data.x, data.y)
         self.setRotation(data.rotation)
         self.setTransformOriginPoint(data.w / 2, data.h / 2)
 
+    def itemChange(self, change, value):
+        # doar cu ItemSendsGeometryChanges (editor); MapItem ramane sincron cu scena
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            self.data.x = value.x()
+            self.data.y = value.y()
+            if self.on_moved is not None:
+                self.on_moved(self.data)
+        elif change == QGraphicsItem.ItemRotationHasChanged:
+            self.data.rotation = value
+            if self.on_moved is not None:
+                self.on_moved(self.data)
+        return super().itemChange(change, value)
+
     def boundingRect(self):
         return QRectF(0, 0, self.data.w, self.data.h)
 
@@ -87,23 +241,11 @@ class GraphicSeat(GraphicItemBase):
         self.is_selected = False
         self.base_color = base_color
 
-        self.visual_rect = QGraphicsRectItem(0, 0, data.w, data.h, self)
-        self.visual_rect.setPen(QPen(Qt.black))
+        self._brush = QBrush()
+        self._label = str(data.id)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
         self.update_color()
 
-        font = QFont()
-        font.setPixelSize(10)
-        if len(str(data.id)) > 4:
-            font.setPixelSize(8)
-
-        self.text = QGraphicsTextItem(str(data.id), self)
-        self.text.setFont(font)
-        br = self.text.boundingRect()
-        self.text.setPos((data.w - br.width()) / 2, (data.h - br.height()) / 2)
-
-        self.visual_rect.setAcceptedMouseButtons(Qt.NoButton)
-        self.text.setAcceptedMouseButtons(Qt.NoButton)
-
     def update_color(self):
         if self.is_reserved:
             c = COLORS["reserved"]
@@ -114,7 +256,18 @@ class GraphicSeat(GraphicItemBase):
                  c = COLORS["selected"]
             else:
                  c = self.base_color
-        self.visual_rect.setBrush(QBrush(QColor(c)))
+        self._brush = QBrush(QColor(c))
+        self.update()
+
+    def paint(self, p, o, w):
+        # eticheta (si conturul) doar cand zoom-ul le face lizibile
+        px = seat_pixels(p, o, self.data.h)
+        p.setPen(QPen(Qt.black) if px >= OUTLINE_MIN_PX else Qt.NoPen)
+        p.setBrush(self._brush)
+        rect = QRectF(0, 0, self.data.w, self.data.h)
+        p.drawRect(rect)
+        if px >= LABEL_MIN_PX:
+            glyph_cache.draw(p, rect, self._label, px / self.data.h)
 
     def mousePressEvent(self, event):
         if self.is_reserved:
@@ -224,6 +377,18 @@ class GhostItem(QGraphicsItem):
             side_seats = math.ceil(self.seats / 2)
             self.w = max(50, side_seats * 35 + 10) if self.is_square else max(70, side_seats * 35 + 20)
             self.h = self.w if self.is_square else 60
+        elif mode == "add_seat_grid":
+            # plasare in bloc: doar conturul zonei ocupate, fara scaune desenate
+            self.tool_type = "rect"
+            self.seats = 0
+            self.w = cfg.get("cols", 1) * 35 - 5
+            self.h = cfg.get("rows", 1) * 35 - 5
+        elif mode == "add_table_grid":
+            self.tool_type = "rect"
+            self.seats = 0
+            pitch = round_table_pitch(cfg.get("seats", 0))
+            self.w = cfg.get("cols", 1) * pitch
+            self.h = cfg.get("rows", 1) * pitch
         elif mode == "add_decor":
             self.tool_type = "rect"
             self.w = cfg.get("w", 100)
@@ -292,29 +457,37 @@ class InteractiveMapScene(QGraphicsScene):
         tl_x = pos.x() - self.ghost.w / 2
         tl_y = pos.y() - self.ghost.h / 2
         new_items = []
-        current_model = self.parent().model
+        ids = self.parent().ids
         zid = str(self.config.get("zone_id") or "Z1").strip() or "Z1"
 
         if self.mode == "add_seat":
-            next_id = get_next_id("S", current_model)
+            next_id = ids.allocate("S")
             new_items.append({"id": next_id, "type": "seat", "x": tl_x, "y": tl_y, "w": 30, "h": 30, "rotation": 0, "zone_id": zid})
         elif self.mode == "add_decor":
             t = self.config.get("decor_type", "decor_generic")
             l = self.config.get("label", "Decor")
             w = self.config.get("w", 100)
             h = self.config.get("h", 50)
-            next_id_label = get_next_id(l, current_model)
             new_items = generate_decor(cx, cy, t, w, h, l)
-            new_items[0]["id"] = f"D-{next_id_label}"
+            new_items[0]["id"] = ids.allocate(f"D-{l}")
         elif self.mode == "add_table_round":
             s = self.config.get("seats", 4)
-            next_id = get_next_id("M", current_model)
+            next_id = ids.allocate("M")
             new_items = generate_round_table_set(cx, cy, next_id, s)
         elif self.mode == "add_table_rect":
             s = self.config.get("seats", 6)
             is_sq = self.config.get("is_square", False)
-            next_id = get_next_id("M", current_model)
+            next_id = ids.allocate("M")
             new_items = generate_rect_table_set(cx, cy, next_id, s, is_sq)
+        elif self.mode == "add_seat_grid":
+            rows = self.config.get("rows", 1)
+            cols = self.config.get("cols", 1)
+            new_items = generate_seat_grid(tl_x, tl_y, rows, cols, lambda: ids.allocate("S"))
+        elif self.mode == "add_table_grid":
+            rows = self.config.get("rows", 1)
+            cols = self.config.get("cols", 1)
+            s = self.config.get("seats", 8)
+            new_items = generate_round_table_grid(tl_x, tl_y, rows, cols, s, lambda: ids.allocate("M"))
         elif self.mode == "delete":
             item = self.itemAt(pos, self.views()[0].transform())
             target = None
@@ -345,7 +518,7 @@ class InteractiveMapScene(QGraphicsScene):
         super().mousePressEvent(event)
 
 class SeatMapView(QGraphicsView):
-    def __init__(self, layout_data=None, reserved_seats=None, parent=None, editable=False, zones=None):
+    def __init__(self, layout_data=None, reserved_seats=None, parent=None, editable=False, zones=None, batched=False):
         super().__init__(parent)
         self.scene = InteractiveMapScene(self)
         self.setScene(self.scene)
@@ -358,23 +531,48 @@ class SeatMapView(QGraphicsView):
         if editable:
             self.setDragMode(QGraphicsView.RubberBandDrag)
             self.setRubberBandSelectionMode(Qt.IntersectsItemShape)
+        else:
+            # tragerea pe zona goala muta harta; click-ul pe loc il selecteaza in continuare
+            self.setDragMode(QGraphicsView.ScrollHandDrag)
+
+        # zoom relativ la fitInView; 1.0 = toata sala vizibila
+        self._zoom = 1.0
+        self._pan_origin = None
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
 
         self.editable = editable
-        self.model = []
+        # batched: toate locurile intr-un singur SeatLayer (doar pentru vizualizare)
+        self.batched = batched and not editable
+        self.seat_layer = None
+        # editare incrementala: add/remove/recolorare ating doar itemii afectati
+        self.layout_model = LayoutModel()
+        self.ids = self.layout_model.ids
+        self._graphics: Dict[int, QGraphicsItem] = {}
+        self._zone_colors: Dict[str, str] = {}
+        self._zone_meta: Dict[str, tuple] = {}
         self.setFocusPolicy(Qt.StrongFocus)
 
+        self.set_layout(layout_data, reserved_seats, zones)
+
+    def set_layout(self, layout_data=None, reserved_seats=None, zones=None):
         raw_res = reserved_seats or set()
         self._reserved_seats = {str(s).strip().upper() for s in raw_res}
+        self.set_zones(zones)
+
+        if layout_data:
+            self.load_data(layout_data)
+
+    def set_zones(self, zones):
         self._zones = zones or []
 
-        self._zone_colors = {}
+        colors = {}
         for z in self._zones:
             zid = str(z.get("id") or "").strip()
             col = str(z.get("color") or "").strip()
             if zid and col:
-                self._zone_colors[zid] = col
+                colors[zid] = col
 
-        self._zone_meta = {}
+        meta = {}
         for z in self._zones:
             zid = str(z.get("id") or "").strip()
             name = str(z.get("name") or zid).strip()
@@ -383,10 +581,37 @@ class SeatMapView(QGraphicsView):
             except Exception:
                 price = 0.0
             if zid:
-                self._zone_meta[zid] = (name, price)
-
-        if layout_data:
-            self.load_data(layout_data)
+                meta[zid] = (name, price)
+
+        # se restilizeaza doar locurile din zonele care si-au schimbat culoarea sau datele
+        changed = {
+            zid for zid in set(colors) | set(self._zone_colors) | set(meta) | set(self._zone_meta)
+            if colors.get(zid) != self._zone_colors.get(zid) or meta.get(zid) != self._zone_meta.get(zid)
+        }
+        self._zone_colors = colors
+        self._zone_meta = meta
+
+        if self.seat_layer is not None:
+            self.seat_layer.set_zones(colors, meta)
+        if changed:
+            self.refresh_seats(mi for mi in self.layout_model if mi.type == "seat" and mi.zone_id in changed)
+
+    def refresh_seats(self, items):
+        # dupa o schimbare de zona pe MapItem-uri: culoare + tooltip, fara redesenarea scenei
+        for mi in items:
+            gfx = self._graphics.get(id(mi))
+            if isinstance(gfx, GraphicSeat):
+                self._style_seat(gfx)
+
+    def rezone(self, items, zone_id: str) -> None:
+        for mi in items:
+            mi.zone_id = zone_id
+            self.layout_model.mark_rezoned(mi)
+        self.refresh_seats(items)
+
+    @property
+    def model(self) -> List[MapItem]:
+        return list(self.layout_model)
 
     def enterEvent(self, event):
         self.setFocus()
@@ -395,8 +620,61 @@ class SeatMapView(QGraphicsView):
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+        if self._zoom != 1.0:
+            self.scale(self._zoom, self._zoom)
+
+    def reset_zoom(self):
+        self._zoom = 1.0
+        self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+
+    def zoom_by(self, factor):
+        target = min(MAX_ZOOM, max(1.0, self._zoom * factor))
+        if target == self._zoom:
+            return
+        step = target / self._zoom
+        self._zoom = target
+        if target == 1.0:
+            self.reset_zoom()
+        else:
+            self.scale(step, step)
 
-    def load_data(self, data_list):
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120.0
+        if not steps:
+            super().wheelEvent(event)
+            return
+        self.zoom_by(ZOOM_STEP ** steps)
+        event.accept()
+
+    def mousePressEvent(self, event):
+        # butonul din mijloc muta harta si in editor, unde stanga face selectie dreptunghiulara
+        if event.button() == Qt.MiddleButton:
+            self._pan_origin = event.position()
+            self.viewport().setCursor(Qt.ClosedHandCursor)
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._pan_origin is not None:
+            delta = event.position() - self._pan_origin
+            self._pan_origin = event.position()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - int(delta.x()))
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - int(delta.y()))
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MiddleButton and self._pan_origin is not None:
+            self._pan_origin = None
+            self.viewport().unsetCursor()
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    def load_data(self, data_list, baseline=True):
+        # baseline=False: continutul nou inlocuieste layout-ul salvat si intra integral in delta
         self.scene.clear()
 
         self.scene.border = QGraphicsRectItem(0, 0, LOGICAL_WIDTH, LOGICAL_HEIGHT)
@@ -408,82 +686,105 @@ class SeatMapView(QGraphicsView):
         self.scene.addItem(self.scene.ghost)
         self.scene.ghost.hide()
 
-        self.model = []
-        self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+        if baseline:
+            self.layout_model.reset()
+        else:
+            self.layout_model.replace()
+        self._graphics.clear()
+        self.seat_layer = None
+        self.scene.setSceneRect(0, 0, LOGICAL_WIDTH, LOGICAL_HEIGHT)
+        self.reset_zoom()
 
         if not data_list:
             return
 
+        if self.batched:
+            self.seat_layer = SeatLayer(COLORS["reserved"], COLORS["selected"], COLORS["free"])
+            self.seat_layer.set_zones(self._zone_colors, self._zone_meta)
+            self.seat_layer.add_seats((d for d in data_list if d.get("type") == "seat"), self._reserved_seats)
+            self.seat_layer.setZValue(1)
+            self.scene.addItem(self.seat_layer)
+            data_list = [d for d in data_list if d.get("type") != "seat"]
+
         for d in data_list:
             zid = d.get("zone_id", "Z1") if d.get("type") == "seat" else ""
             mi = MapItem(d["id"], d["x"], d["y"], d["type"], d.get("w", 30), d.get("h", 30),
                          d.get("parent_id"), d.get("rotation", 0), d.get("label", ""), zid)
-            self.model.append(mi)
-            self._draw(mi)
+            self.add_item(mi, new=not baseline)
+
+        self._fit_scene_to_items()
+
+    def _fit_scene_to_items(self) -> None:
+        # salile mari (stadioane) ies din suprafata logica; scena le cuprinde pe toate,
+        # ca zoom-ul 1.0 sa arate toata sala si orice loc sa poata fi atins
+        rect = self.scene.itemsBoundingRect().united(QRectF(0, 0, LOGICAL_WIDTH, LOGICAL_HEIGHT))
+        self.scene.setSceneRect(rect)
+        self.reset_zoom()
+
+    def _style_seat(self, gfx: "GraphicSeat") -> None:
+        item = gfx.data
+        gfx.base_color = self._zone_colors.get(item.zone_id, COLORS["free"])
+        meta = self._zone_meta.get(item.zone_id)
+        if meta:
+            n, p = meta
+            gfx.setToolTip(f"{item.id}\nZona: {n} ({item.zone_id})\nPret: {p:.2f} lei")
+        else:
+            gfx.setToolTip(str(item.id))
+        gfx.update_color()
 
     def _draw(self, item: MapItem):
-        gfx = None
-
         if item.type == "seat":
             cid = str(item.id).strip().upper()
             res = cid in self._reserved_seats
-            base = self._zone_colors.get(item.zone_id, COLORS["free"])
-            gfx = GraphicSeat(item, res, base)
-
-            meta = self._zone_meta.get(item.zone_id)
-            if meta:
-                n, p = meta
-                gfx.setToolTip(f"{item.id}\nZona: {n} ({item.zone_id})\nPret: {p:.2f} lei")
-            else:
-                gfx.setToolTip(str(item.id))
-
-            if self.editable:
-                gfx.setFlag(QGraphicsItem.ItemIsMovable, True)
-                gfx.setFlag(QGraphicsItem.ItemIsSelectable, True)
-            else:
-                pass 
+            gfx = GraphicSeat(item, res)
+            self._style_seat(gfx)
         else:
             gfx = GraphicShape(item)
-            if self.editable:
-                gfx.setFlag(QGraphicsItem.ItemIsMovable, True)
-                gfx.setFlag(QGraphicsItem.ItemIsSelectable, True)
 
-        if gfx:
-            self.scene.addItem(gfx)
+        if self.editable:
+            gfx.setFlag(QGraphicsItem.ItemIsMovable, True)
+            gfx.setFlag(QGraphicsItem.ItemIsSelectable, True)
+            gfx.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+            gfx.on_moved = self.layout_model.mark_moved
 
+        self.scene.addItem(gfx)
+        return gfx
 
-    def add_item(self, item):
-        self.model.append(item)
-        self._draw(item)
+
+    def add_item(self, item, new=True):
+        self.layout_model.add(item, new)
+        self._graphics[id(item)] = self._draw(item)
 
     def remove_item(self, item_data):
-        ids = {item_data.id}
-        for x in self.model:
-            if x.parent_id == item_data.id:
-                ids.add(x.id)
-        self.model = [x for x in self.model if x.id not in ids and x.parent_id not in ids]
-        self.load_data([x.to_dict() for x in self.model])
+        for mi in self.layout_model.remove(item_data):
+            gfx = self._graphics.pop(id(mi), None)
+            if gfx is not None:
+                self.scene.removeItem(gfx)
 
     def get_layout_data(self):
-        layout = []
-
-        for item in self.scene.items():
-            if isinstance(item, (GraphicSeat, GraphicShape)):
-                data = item.data 
-
-                pos = item.pos()
-                data.x = pos.x()
-                data.y = pos.y()
-
-                data.rotation = item.rotation()
-
-                layout.append(data.to_dict())
-
+        # pozitiile sunt deja in MapItem (itemChange), deci nu mai parcurgem scena
+        layout = self.seat_layer.seat_dicts() if self.seat_layer is not None else []
+        layout.extend(self.layout_model.to_dicts())
         return layout
 
+    def export_delta(self) -> List[Dict]:
+        return self.layout_model.export_delta()
+
 
     def get_selected_seats(self):
+        if self.seat_layer is not None:
+            return self.seat_layer.selected_ids()
         return [i.data.id for i in self.scene.items() if isinstance(i, GraphicSeat) and i.is_selected]
 
+    def set_selected_seats(self, seat_ids):
+        if self.seat_layer is not None:
+            self.seat_layer.set_selected(seat_ids)
+            return
+        wanted = {str(s).strip().upper() for s in seat_ids}
+        for i in self.scene.items():
+            if isinstance(i, GraphicSeat) and not i.is_reserved:
+                i.is_selected = str(i.data.id).strip().upper() in wanted
+                i.update_color()
+
     def set_mode(self, mode, config=None):
         self.scene.set_tool(mode, config)
\ No newline at end of file
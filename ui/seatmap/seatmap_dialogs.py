@@ -1,8 +1,22 @@
 from typing import Dict
 
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QDialogButtonBox
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QDialogButtonBox, QLabel,
+    QPushButton, QSpinBox, QMessageBox
+)
 
 from .seatmap_core import SeatMapView
+from ..common import BusyIndicator
+from ..tasks import TaskRunner
+
+
+def _load_seat_map(event: Dict):
+    from services import hall_service, booking_service
+    hall = hall_service.get_hall(event['hall_id'], compact=True)
+    # ocupate = rezervate definitiv + retinute temporar de alte kiosk-uri
+    res = booking_service.list_unavailable_seats(event['id'])
+    return hall, res
+
 
 class SeatSelectionDialog(QDialog):
     def __init__(self, event: Dict, parent=None):
@@ -11,15 +25,37 @@ class SeatSelectionDialog(QDialog):
         self.resize(1200, 800)
         layout = QVBoxLayout(self)
 
-        from services import hall_service, booking_service
-        hall = hall_service.get_hall(event['hall_id'])
-        bookings = booking_service.list_bookings_for_event(event['id'])
+        self.runner = TaskRunner(self)
+        layout.addWidget(BusyIndicator(self.runner))
+
+        self.mv = SeatMapView(None, parent=self, editable=False, batched=True)
+        layout.addWidget(self.mv)
+
+        self._event = event
+        pick_layout = QHBoxLayout()
+        pick_layout.addWidget(QLabel("Numar locuri:"))
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, 50)
+        self.count_spin.setValue(2)
+        pick_layout.addWidget(self.count_spin)
+        self.pick_button = QPushButton("Alege locurile pentru mine")
+        self.pick_button.clicked.connect(self.on_pick_clicked)
+        pick_layout.addWidget(self.pick_button)
+        pick_layout.addStretch()
+        layout.addLayout(pick_layout)
+
+        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
 
-        res = set()
-        for b in bookings:
-            for s in b.get("seats", []):
-                res.add(str(s))
+        self.pick_button.setEnabled(False)
+        self.runner.submit("seatmap", _load_seat_map, event, on_done=self._on_loaded, on_error=self._on_task_error)
 
+    def _on_loaded(self, result) -> None:
+        hall, res = result
+        if hall is None:
+            return
         layout_blob = hall.get("layout", [])
 
         if isinstance(layout_blob, dict):
@@ -28,14 +64,31 @@ class SeatSelectionDialog(QDialog):
         else:
             l_data = layout_blob
             zones = hall.get("zones", [])
-            
-        self.mv = SeatMapView(l_data, reserved_seats=res, parent=self, editable=False, zones=zones)
-        layout.addWidget(self.mv)
 
-        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        btns.accepted.connect(self.accept)
-        btns.rejected.connect(self.reject)
-        layout.addWidget(btns)
+        self.mv.set_layout(l_data, reserved_seats=res, zones=zones)
+        self.pick_button.setEnabled(True)
+
+    def _on_task_error(self, error) -> None:
+        QMessageBox.warning(self, "Eroare", str(error))
+
+    def done(self, result):
+        self.runner.cancel()
+        super().done(result)
+
+    def on_pick_clicked(self) -> None:
+        from services import booking_service
+        self.runner.submit(
+            "pick", booking_service.find_best_seats, self._event['id'], self.count_spin.value(),
+            on_done=self._on_picked, on_error=self._on_task_error,
+        )
+
+    def _on_picked(self, seats) -> None:
+        if not seats:
+            QMessageBox.information(
+                self, "Info", f"Nu exista {self.count_spin.value()} locuri libere alaturate."
+            )
+            return
+        self.mv.set_selected_seats(seats)
 
     def get_selected_seats(self):
         return self.mv.get_selected_seats()
@@ -10,7 +10,7 @@ from .seatmap_core import SeatMapView, GraphicSeat
 
 from ..layout_generator import (
     create_cinema_template, create_wedding_template,
-    create_conference_template, create_club_layout
+    create_conference_template, create_club_layout, create_stadium_template
 )
 
 class HallEditorWidget(QWidget):
@@ -59,9 +59,12 @@ class HallEditorWidget(QWidget):
         self.rb_view = QRadioButton("Selectie / Muta")
         self.rb_del = QRadioButton("Sterge Element")
         self.rb_seat = QRadioButton("Scaun Simplu (S1...)")
+        self.rb_seat_grid = QRadioButton("Bloc de Scaune (randuri x coloane)")
+        self.rb_seat_grid.setProperty("tool_cfg", {"mode": "add_seat_grid", "rows": 5, "cols": 10})
         l_basic.addWidget(self.rb_view)
         l_basic.addWidget(self.rb_del)
         l_basic.addWidget(self.rb_seat)
+        l_basic.addWidget(self.rb_seat_grid)
         l_basic.addStretch()
         self.toolbox.addItem(page_basic, "Unelte De Baza")
 
@@ -104,7 +107,11 @@ class HallEditorWidget(QWidget):
         l_tables.addWidget(self.rb_sq2)
         l_tables.addWidget(self.rb_sq4)
         l_tables.addWidget(self.rb_rec6)
+        self.rb_table_grid = QRadioButton("Grila de Mese Rotunde")
+        self.rb_table_grid.setProperty("tool_cfg", {"mode": "add_table_grid", "rows": 2, "cols": 3, "seats": 8})
+
         l_tables.addWidget(self.rb_rec8)
+        l_tables.addWidget(self.rb_table_grid)
         l_tables.addStretch()
         self.toolbox.addItem(page_tables, "Mese & Nunti")
 
@@ -165,7 +172,7 @@ class HallEditorWidget(QWidget):
         layout.addWidget(sidebar)
 
         self.bg = QButtonGroup(self)
-        all_rbs = [self.rb_view, self.rb_del, self.rb_seat, self.rb_tr2, self.rb_tr4, self.rb_tr6, self.rb_tr8,
+        all_rbs = [self.rb_view, self.rb_del, self.rb_seat, self.rb_seat_grid, self.rb_table_grid, self.rb_tr2, self.rb_tr4, self.rb_tr6, self.rb_tr8,
                    self.rb_tr10, self.rb_sq2, self.rb_sq4, self.rb_rec6, self.rb_rec8, self.rb_scr, self.rb_stg,
                    self.rb_stg_lg, self.rb_bar, self.rb_danc, self.rb_ent]
 
@@ -191,15 +198,36 @@ class HallEditorWidget(QWidget):
         elif cfg:
             cfg2 = dict(cfg)
             cfg2["zone_id"] = zid
+            if cfg2["mode"] in ("add_seat_grid", "add_table_grid") and not self._ask_grid(cfg2):
+                self.rb_view.setChecked(True)
+                self.map_view.set_mode("view")
+                return
             self.map_view.set_mode(cfg2["mode"], cfg2)
 
+    def _ask_grid(self, cfg) -> bool:
+        # dimensiunile blocului se cer la alegerea uneltei; un click plaseaza tot blocul
+        rows, ok = QInputDialog.getInt(self, "Plasare in bloc", "Randuri:", cfg["rows"], 1, 100)
+        if not ok:
+            return False
+        cols, ok = QInputDialog.getInt(self, "Plasare in bloc", "Coloane:", cfg["cols"], 1, 100)
+        if not ok:
+            return False
+        if cfg["mode"] == "add_table_grid":
+            seats, ok = QInputDialog.getInt(self, "Plasare in bloc", "Scaune per masa:", cfg["seats"], 2, 12)
+            if not ok:
+                return False
+            cfg["seats"] = seats
+        cfg["rows"] = rows
+        cfg["cols"] = cols
+        return True
+
     def on_clear(self):
         if QMessageBox.question(self, "Atentie", "Sigur stergeti tot?") == QMessageBox.Yes:
-            self.map_view.load_data([])
+            self.map_view.load_data([], baseline=False)
 
     def on_template(self):
         opts = ("Cinema Mic (5x8)", "Cinema Mare (10x12)", "Sala Conferinta", "Sala Nunta (Mica)", "Sala Nunta (Mare)",
-                "Club / Lounge")
+                "Club / Lounge", "Arena (deschisa)", "Stadion", "Stadion Mare")
         sel, ok = QInputDialog.getItem(self, "Sablon", "Alege:", opts, 0, False)
         if ok and sel:
             items = []
@@ -215,9 +243,15 @@ class HallEditorWidget(QWidget):
                 items = create_wedding_template("large")
             elif "Club" in sel:
                 items = create_club_layout()
+            elif "Arena" in sel:
+                items = create_stadium_template(sectors=8, tiers=2, rows_per_tier=6, inner_radius=300, arc_deg=240)
+            elif "Stadion Mare" in sel:
+                items = create_stadium_template()
+            elif "Stadion" in sel:
+                items = create_stadium_template(sectors=16, tiers=2, rows_per_tier=10, inner_radius=500)
 
             if QMessageBox.question(self, "Confirm", "Inlocuiesti harta curenta?") == QMessageBox.Yes:
-                self.map_view.load_data(items)
+                self.map_view.load_data(items, baseline=False)
 
     def refresh_zone_combo(self):
         self.zone_combo.clear()
@@ -247,28 +281,8 @@ class HallEditorWidget(QWidget):
         return str(zid or "Z1").strip() or "Z1"
 
     def _push_zones_to_map(self):
-        # rebuild colors + meta in map view and redraw
-        self.map_view._zones = self.zones
-
-        self.map_view._zone_colors = {}
-        for z in self.zones:
-            zid = str(z.get("id") or "").strip()
-            col = str(z.get("color") or "").strip()
-            if zid and col:
-                self.map_view._zone_colors[zid] = col
-
-        self.map_view._zone_meta = {}
-        for z in self.zones:
-            zid = str(z.get("id") or "").strip()
-            name = str(z.get("name") or zid).strip()
-            try:
-                price = float(z.get("price", 0))
-            except Exception:
-                price = 0.0
-            if zid:
-                self.map_view._zone_meta[zid] = (name, price)
-
-        self.map_view.load_data(self.map_view.get_layout_data())
+        # culorile si tooltip-urile se actualizeaza doar pentru zonele modificate
+        self.map_view.set_zones(self.zones)
 
     def on_apply_zone(self):
         zid = self.current_zone_id()
@@ -278,18 +292,17 @@ class HallEditorWidget(QWidget):
             return
 
         # aplica zona doar la scaune
-        changed = 0
+        changed = []
         for it in selected:
             seat = it if isinstance(it, GraphicSeat) else (it.parentItem() if it and isinstance(it.parentItem(), GraphicSeat) else None)
             if seat:
-                seat.data.zone_id = zid
-                changed += 1
+                changed.append(seat.data)
 
-        if changed == 0:
+        if not changed:
             QMessageBox.information(self, "Info", "Nu ati selectat scaune.")
             return
 
-        self._push_zones_to_map()
+        self.map_view.rezone(changed, zid)
 
     def on_add_zone(self):
         # id automat: Z{max+1}
@@ -370,16 +383,13 @@ class HallEditorWidget(QWidget):
             return
 
         # muta scaunele din zid -> Z1
-        layout = self.map_view.get_layout_data()
-        for it in layout:
-            if it.get("type") == "seat" and it.get("zone_id") == zid:
-                it["zone_id"] = "Z1"
+        moved = [mi for mi in self.map_view.model if mi.type == "seat" and mi.zone_id == zid]
 
         self.zones = [z for z in self.zones if str(z.get("id")).strip() != zid]
         self.refresh_zone_combo()
 
-        self.map_view.load_data(layout)
         self._push_zones_to_map()
+        self.map_view.rezone(moved, "Z1")
 
     def get_data(self):
-        return {"items": self.map_view.get_layout_data(), "zones": self.zones}
+        return {"items": self.map_view.get_layout_data(), "zones": self.zones, "delta": self.map_view.export_delta()}
@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from PySide6.QtCore import QEventLoop, QObject, QRunnable, QThreadPool, QTimer, Signal
+
+log = logging.getLogger("eventease")
+
+class _TaskSignals(QObject):
+    # emise din thread-ul de lucru; ajung in thread-ul GUI prin conexiuni queued
+    finished = Signal(int, object)
+    failed = Signal(int, object)
+
+
+class _Task(QRunnable):
+    # QThreadPool sterge task-ul dupa run(); runner-ul pastreaza doar `token`
+    def __init__(self, task_id: int, fn: Callable, args, kwargs, token: threading.Event, signals: _TaskSignals) -> None:
+        super().__init__()
+        self.task_id = task_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.token = token
+        self.signals = signals
+
+    def run(self) -> None:
+        if self.token.is_set():
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as ex:
+            self.signals.failed.emit(self.task_id, ex)
+        else:
+            self.signals.finished.emit(self.task_id, result)
+
+
+class TaskRunner(QObject):
+    # un singur task activ per cheie: unul nou il face "vechi" pe cel anterior,
+    # iar rezultatul celui vechi nu mai ajunge la callback.
+    # key=None pentru scrieri, care nu trebuie niciodata inlocuite.
+    # erorile fara on_error se logheaza si se emit prin `failed` (cheie, exceptie)
+    busy_changed = Signal(bool)
+    failed = Signal(str, object)
+
+    def __init__(self, parent=None, pool: Optional[QThreadPool] = None) -> None:
+        super().__init__(parent)
+        self._pool = pool or QThreadPool.globalInstance()
+        self._signals = _TaskSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._next_id = 0
+        self._tokens: Dict[int, threading.Event] = {}
+        self._callbacks: Dict[int, tuple] = {}
+        self._latest: Dict[str, int] = {}
+
+    def submit(
+        self,
+        key: Optional[str],
+        fn: Callable,
+        *args,
+        on_done: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        **kwargs,
+    ) -> int:
+        self._next_id += 1
+        if key is None:
+            key = f"#{self._next_id}"
+        previous = self._latest.get(key)
+
+        task_id = self._next_id
+        token = threading.Event()
+
+        was_busy = self.is_busy()
+        self._tokens[task_id] = token
+        self._callbacks[task_id] = (key, on_done, on_error)
+        self._latest[key] = task_id
+        if previous is not None:
+            self._drop(previous)
+        if not was_busy:
+            self.busy_changed.emit(True)
+
+        self._pool.start(_Task(task_id, fn, args, kwargs, token, self._signals))
+        return task_id
+
+    def cancel(self, key: Optional[str] = None) -> None:
+        keys = list(self._latest) if key is None else [key]
+        for k in keys:
+            task_id = self._latest.pop(k, None)
+            if task_id is None:
+                continue
+            self._drop(task_id)
+
+    def is_busy(self) -> bool:
+        return bool(self._callbacks)
+
+    def wait(self, timeout_ms: int = 10000) -> bool:
+        # pentru scripturi si inchiderea aplicatiei; in UI se folosesc callback-urile
+        if not self.is_busy():
+            return True
+        loop = QEventLoop()
+        self.busy_changed.connect(loop.quit)
+        QTimer.singleShot(timeout_ms, loop.quit)
+        loop.exec()
+        self.busy_changed.disconnect(loop.quit)
+        return not self.is_busy()
+
+    def _drop(self, task_id: int) -> None:
+        token = self._tokens.get(task_id)
+        if token is not None:
+            # daca nu a pornit inca nu mai ruleaza; daca ruleaza, rezultatul e ignorat
+            token.set()
+        self._forget(task_id)
+
+    def _forget(self, task_id: int) -> None:
+        self._tokens.pop(task_id, None)
+        if self._callbacks.pop(task_id, None) is not None and not self._callbacks:
+            self.busy_changed.emit(False)
+
+    def _take(self, task_id: int):
+        entry = self._callbacks.get(task_id)
+        if entry is None:
+            return None
+        key = entry[0]
+        if self._latest.get(key) == task_id:
+            del self._latest[key]
+        self._forget(task_id)
+        return entry
+
+    def _on_finished(self, task_id: int, result) -> None:
+        entry = self._take(task_id)
+        if entry is not None and entry[1] is not None:
+            entry[1](result)
+
+    def _on_failed(self, task_id: int, error) -> None:
+        entry = self._take(task_id)
+        if entry is None:
+            return
+        if entry[2] is not None:
+            entry[2](error)
+            return
+        # o exceptie ridicata dintr-un slot ar opri aplicatia
+        log.error("task %s esuat: %s", entry[0], error, exc_info=error)
+        self.failed.emit(entry[0], error)
+
+
+class EventLoopMonitor(QObject):
+    # un timer care ar trebui sa bata la fiecare `interval_ms`;
+    # intarzierea fata de asteptat = cat timp a fost blocat event loop-ul
+    def __init__(self, interval_ms: int = 50, threshold_ms: float = 100.0, parent=None) -> None:
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+        self._last = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        self.ticks = 0
+        self.stalls = 0
+        self.max_block_ms = 0.0
+        self.total_block_ms = 0.0
+
+    def start(self) -> None:
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        blocked = (now - self._last) * 1000 - self.interval_ms
+        self._last = now
+        self.ticks += 1
+        if blocked > self.threshold_ms:
+            self.stalls += 1
+            self.total_block_ms += blocked
+            self.max_block_ms = max(self.max_block_ms, blocked)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "ticks": self.ticks,
+            "stalls": self.stalls,
+            "max_block_ms": round(self.max_block_ms, 1),
+            "total_block_ms": round(self.total_block_ms, 1),
+        }
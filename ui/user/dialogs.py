@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from PySide6.QtWidgets import (
     QDialog, QFormLayout, QLabel, QLineEdit, QPushButton, 
     QDialogButtonBox, QMessageBox, QVBoxLayout, QTableView, QHeaderView, QApplication
@@ -9,6 +9,8 @@ from core import session
 from core.validators import validate_email
 from services import hall_service, booking_service
 from ui.seatmap import SeatSelectionDialog
+from ..common import BusyIndicator
+from ..tasks import TaskRunner
 from .models import MyBookingsTableModel
 
 class BookingDialog(QDialog):
@@ -23,9 +25,15 @@ class BookingDialog(QDialog):
 
         self._event = event
         self.selected_seats: List[str] = []
+        self.hold_id: Optional[int] = None
+        self._pricing = None
+        self._closed = False
 
         layout = QFormLayout(self)
 
+        self.runner = TaskRunner(self)
+        layout.addRow(BusyIndicator(self.runner))
+
         event_label = QLabel(
             f"Eveniment: <b>{event['title']}</b> "
             f"({event['date']} {event['time']}, {event['hall_name']})"
@@ -65,38 +73,81 @@ class BookingDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addRow(buttons)
 
+        # cat timp se retin/elibereaza locuri, OK ar trimite o selectie inca nesigura
+        ok_button = buttons.button(QDialogButtonBox.Ok)
+        self.runner.busy_changed.connect(lambda busy: ok_button.setEnabled(not busy))
+
         self.select_seats_button.clicked.connect(self.on_select_seats_clicked)
+        self.runner.submit("pricing", hall_service.get_pricing, event["hall_id"], on_done=self._on_pricing)
 
-    def on_select_seats_clicked(self) -> None:
-        dialog = SeatSelectionDialog(self._event, parent=self)
-        if dialog.exec() != QDialog.Accepted:
+    def _release_hold(self, on_done=None) -> None:
+        hold_id, self.hold_id = self.hold_id, None
+        if hold_id is None:
+            if on_done is not None:
+                on_done(None)
             return
+        # fara on_error: un hold neeliberat expira singur, eroarea doar se logheaza
+        self.runner.submit(None, booking_service.release_hold, hold_id, on_done=on_done)
 
-        seats = dialog.get_selected_seats()
+    def _on_pricing(self, pricing) -> None:
+        self._pricing = pricing
+        self._calculate_price(self.selected_seats)
+
+    def _set_selected_seats(self, seats: List[str]) -> None:
         self.selected_seats = seats
         self.seats_display.setText(", ".join(seats))
         self._calculate_price(seats)
 
-    def _calculate_price(self, seats):
-        hall = hall_service.get_hall(self._event["hall_id"]) or {}
-        layout_items = hall.get("layout", []) or []
-        zones = hall.get("zones", []) or []
+    def on_select_seats_clicked(self) -> None:
+        # locurile retinute deja de acest dialog trebuie sa apara libere pe harta,
+        # deci harta se deschide abia dupa ce hold-ul vechi a fost eliberat
+        previous = list(self.selected_seats)
+        self.select_seats_button.setEnabled(False)
+        self._release_hold(on_done=lambda _: self._choose_seats(previous))
+
+    def _choose_seats(self, previous: List[str]) -> None:
+        dialog = SeatSelectionDialog(self._event, parent=self)
+        if dialog.exec() != QDialog.Accepted:
+            seats = previous
+        else:
+            seats = dialog.get_selected_seats()
+
+        if not seats:
+            self._set_selected_seats([])
+            self.select_seats_button.setEnabled(True)
+            return
+        self.runner.submit(
+            None, booking_service.hold_seats, self._event["id"], seats,
+            on_done=lambda hold_id: self._on_held(seats, hold_id), on_error=self._on_hold_failed,
+        )
+
+    def _on_held(self, seats: List[str], hold_id: int) -> None:
+        self.select_seats_button.setEnabled(True)
+        self.hold_id = hold_id
+        if self._closed:
+            # dialogul a fost anulat cat timp se retineau locurile
+            self._release_hold()
+            return
+        self._set_selected_seats(seats)
 
-        zone_meta = {str(z.get("id")): {"price": float(z.get("price", 0)), "name": z.get("name"), "color": z.get("color")} for z in zones if z.get("id")}
-        seat_to_zone = {str(it.get("id")): str(it.get("zone_id") or "Z1") for it in layout_items if it.get("type") == "seat"}
+    def _on_hold_failed(self, error) -> None:
+        self.select_seats_button.setEnabled(True)
+        self._set_selected_seats([])
+        if not self._closed:
+            QMessageBox.warning(self, "Eroare", str(error))
 
-        counts = {}
-        for sid in seats:
-            zid = seat_to_zone.get(str(sid), "Z1")
-            counts[zid] = counts.get(zid, 0) + 1
+    def _calculate_price(self, seats):
+        pricing = self._pricing
+        if pricing is None:
+            self.breakdown_label.setText("-")
+            self.total_label.setText("0.00 lei")
+            return
+
+        total_calc, breakdown = pricing.price_many(seats)
 
         lines = []
-        total_calc = 0.0
-        for zid, cnt in sorted(counts.items()):
-            meta = zone_meta.get(zid, {"price": 0.0, "name": zid, "color": "#DDDDDD"})
-            subtotal = meta["price"] * cnt
-            total_calc += subtotal
-            lines.append(f"<span style='background:{meta['color']};'>&nbsp;&nbsp;</span> <b>{zid}</b>: {cnt} x {meta['price']:.2f} = <b>{subtotal:.2f} lei</b>")
+        for zid, z in breakdown.items():
+            lines.append(f"<span style='background:{z['color']};'>&nbsp;&nbsp;</span> <b>{zid}</b>: {z['count']} x {z['price']:.2f} = <b>{z['subtotal']:.2f} lei</b>")
 
         self.breakdown_label.setText("<br>".join(lines) if lines else "-")
         self.total_label.setText(f"{total_calc:.2f} lei")
@@ -118,15 +169,23 @@ class BookingDialog(QDialog):
         self.email_edit.setText(email)
         self.accept()
 
+    def reject(self) -> None:
+        self._closed = True
+        self.runner.cancel("pricing")
+        self._release_hold()
+        super().reject()
+
     def get_data(self) -> Dict:
         return {
             "name": self.name_edit.text().strip(),
             "email": self.email_edit.text().strip(),
             "seats": list(self.selected_seats),
+            "hold_id": self.hold_id,
         }
 
 class UserBookingsDialog(QDialog):
-    def __init__(self, email: str, parent=None) -> None:
+    # rezervarile vin gata incarcate: cine deschide dialogul a facut deja cererea
+    def __init__(self, email: str, bookings: List[Dict], parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Rezervarile mele")
         
@@ -143,7 +202,6 @@ class UserBookingsDialog(QDialog):
         self.table_view = QTableView()
         layout.addWidget(self.table_view)
 
-        bookings = booking_service.list_bookings_for_email(email)
         self._model = MyBookingsTableModel(bookings, self)
         self.table_view.setModel(self._model)
         self.table_view.setSelectionBehavior(QTableView.SelectRows)
@@ -3,14 +3,15 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QLineEdit, 
     QTableView, QPushButton, QMessageBox, QHeaderView, QDialog
 )
-from PySide6.QtCore import Qt, Signal
-from services import event_service, booking_service
+from PySide6.QtCore import Qt, Signal, QSortFilterProxyModel
+from services import booking_service
 from core import session
 from ..admin.models import EventsTableModel
-from ..common import OccupancyDelegate, EventFilterProxyModel
+from ..common import OccupancyDelegate, BusyIndicator, EventListMixin
+from ..tasks import TaskRunner
 from .dialogs import BookingDialog, UserBookingsDialog
 
-class UserEventsView(QWidget):
+class UserEventsView(EventListMixin, QWidget):
     back_to_login = Signal()
 
     def __init__(self, parent=None) -> None:
@@ -36,10 +37,14 @@ class UserEventsView(QWidget):
         search_layout = QHBoxLayout()
         search_layout.addWidget(QLabel("Cauta:"))
         self.search_edit = QLineEdit()
-        self.search_edit.setPlaceholderText("Cauta dupa titlu sau sala...")
+        self.search_edit.setPlaceholderText("Cauta dupa titlu, sala sau descriere...")
         search_layout.addWidget(self.search_edit)
         main_layout.addLayout(search_layout)
 
+        self.runner = TaskRunner(self)
+        self.busy_indicator = BusyIndicator(self.runner)
+        main_layout.addWidget(self.busy_indicator)
+
         self.table_view = QTableView()
         main_layout.addWidget(self.table_view)
 
@@ -57,8 +62,8 @@ class UserEventsView(QWidget):
         main_layout.addLayout(button_layout)
 
         self._events: List[Dict] = []
-        self._source_model = EventsTableModel(self._events, self)
-        self._proxy_model = EventFilterProxyModel(self)
+        self._source_model = EventsTableModel(self._events, self, runner=self.runner)
+        self._proxy_model = QSortFilterProxyModel(self)
         self._proxy_model.setSourceModel(self._source_model)
 
         self.table_view.setModel(self._proxy_model)
@@ -69,21 +74,12 @@ class UserEventsView(QWidget):
         self.table_view.setEditTriggers(QTableView.NoEditTriggers)
         self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-        self.search_edit.textChanged.connect(self.on_search_changed)
+        self._init_event_list()
         self.book_button.clicked.connect(self.on_book_clicked)
         self.refresh_button.clicked.connect(self.refresh_events)
         self.my_bookings_button.clicked.connect(self.on_my_bookings_clicked)
         self.back_button.clicked.connect(self.back_to_login.emit)
 
-        self.refresh_events()
-
-    def refresh_events(self) -> None:
-        events = event_service.list_events()
-        self._source_model.set_events(events)
-
-    def on_search_changed(self, text):
-        self._proxy_model.set_filter_text(text)
-
     def get_selected_event(self) -> Optional[Dict]:
         proxy_idx = self.table_view.currentIndex()
         if not proxy_idx.isValid(): return None
@@ -99,20 +95,42 @@ class UserEventsView(QWidget):
         dialog = BookingDialog(event, parent=self)
         if dialog.exec() == QDialog.Accepted:
             data = dialog.get_data()
-            try:
-                booking_service.create_booking(event["id"], data["name"], data["email"], data["seats"])
-                QMessageBox.information(self, "Succes", "Rezervare reusita!")
-            except ValueError as ex:
-                QMessageBox.warning(self, "Eroare", str(ex))
+            if data["hold_id"] is not None:
+                fn, args = booking_service.confirm_hold, (data["hold_id"], data["name"], data["email"])
+            else:
+                fn, args = booking_service.create_booking, (event["id"], data["name"], data["email"], data["seats"])
+            self.book_button.setEnabled(False)
+            self.runner.submit(None, fn, *args, on_done=self._on_booked, on_error=self._on_book_failed)
+
+    def _on_booked(self, booking_id) -> None:
+        self.book_button.setEnabled(True)
+        QMessageBox.information(self, "Succes", "Rezervare reusita!")
+        self.refresh_events()
+
+    def _on_book_failed(self, error) -> None:
+        self.book_button.setEnabled(True)
+        self._on_task_error(error)
 
     def on_my_bookings_clicked(self) -> None:
         email, _ = session.get_current_user()
         if not email:
             QMessageBox.information(self, "Info", "Trebuie sa fiti autentificat cu email.")
             return
-        
-        if not booking_service.list_bookings_for_email(email):
-             QMessageBox.information(self, "Info", "Nu aveti rezervari.")
-             return
 
-        UserBookingsDialog(email, parent=self).exec()
\ No newline at end of file
+        self.my_bookings_button.setEnabled(False)
+        self.runner.submit(
+            "my_bookings", booking_service.list_bookings_for_email, email,
+            on_done=lambda bookings: self._show_my_bookings(email, bookings),
+            on_error=self._on_my_bookings_failed,
+        )
+
+    def _show_my_bookings(self, email: str, bookings: List[Dict]) -> None:
+        self.my_bookings_button.setEnabled(True)
+        if not bookings:
+            QMessageBox.information(self, "Info", "Nu aveti rezervari.")
+            return
+        UserBookingsDialog(email, bookings, parent=self).exec()
+
+    def _on_my_bookings_failed(self, error) -> None:
+        self.my_bookings_button.setEnabled(True)
+        self._on_task_error(error)
\ No newline at end of file